@@ -0,0 +1,88 @@
+"""Benchmark JSON handling of a large board_items page.
+
+Compares the CPU time of the previous pipeline (stdlib decode of every
+response twice, simplejson encoding of every Singer record) with the
+``tap_monday.codec`` pipeline (single decode, codec-encoded records).
+
+    python benchmarks/bench_json_codec.py [--items 500] [--columns 30] [--rounds 20]
+"""
+import argparse
+import json
+import random
+import sys
+import time
+
+import singer
+from singer.messages import RecordMessage
+
+from tap_monday import codec, output
+
+
+def make_items_page(items: int, columns: int, seed: int = 0) -> bytes:
+    """Return the raw body of an ``items_page`` response."""
+    rng = random.Random(seed)
+    page = []
+    for item_id in range(items):
+        page.append({
+            "id": str(1000000 + item_id),
+            "name": "Item {}".format(item_id),
+            "created_at": "2024-01-01T00:00:00Z",
+            "updated_at": "2024-06-{:02d}T12:00:00Z".format(rng.randint(1, 28)),
+            "state": "active",
+            "creator": {"id": str(rng.randint(1, 50))},
+            "group": {"id": "topics"},
+            "parent_item": None,
+            "subscribers": [{"id": "1", "name": "Jane Doe"}],
+            "column_values": [
+                {
+                    "id": "column_{}".format(column),
+                    "type": "text",
+                    "text": "value {}".format(rng.random()),
+                    "value": json.dumps({"text": "value", "changed_at": "2024-06-01T12:00:00Z"}),
+                    "column": {"id": "column_{}".format(column)},
+                }
+                for column in range(columns)
+            ],
+        })
+    body = {"data": {"boards": [{"items_page": {"cursor": "MSw5NzI4MDA5MDAsaV9YcmxJb0p1VEdYc1VWeGlxeF9kLDg4MiwzNXw0MTQ1NzY0MzA5", "items": page}}]}}
+    return json.dumps(body).encode()
+
+
+def run_baseline(body: bytes) -> None:
+    json.loads(body)  # raise_for_error
+    items = json.loads(body)["data"]["boards"][0]["items_page"]["items"]
+    for item in items:
+        singer.format_message(RecordMessage(stream="board_items", record=item))
+
+
+def run_codec(body: bytes) -> None:
+    items = codec.loads(body)["data"]["boards"][0]["items_page"]["items"]
+    for item in items:
+        output.format_message(RecordMessage(stream="board_items", record=item))
+
+
+def measure(func, body: bytes, rounds: int) -> float:
+    start = time.process_time()
+    for _ in range(rounds):
+        func(body)
+    return (time.process_time() - start) / rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--columns", type=int, default=30)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    body = make_items_page(args.items, args.columns)
+    baseline = measure(run_baseline, body, args.rounds)
+    candidate = measure(run_codec, body, args.rounds)
+    sys.stdout.write("page: {} items x {} columns, {:.1f} MB\n".format(args.items, args.columns, len(body) / 1e6))
+    sys.stdout.write("{:<34}{:8.2f} ms/page\n".format("baseline (json x2 + simplejson):", baseline * 1000))
+    sys.stdout.write("{:<34}{:8.2f} ms/page\n".format("codec ({}):".format(codec.BACKEND), candidate * 1000))
+    sys.stdout.write("CPU reduction: {:.0%}\n".format(1 - candidate / baseline))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Benchmark the startup of the tap: the time from a cold interpreter to the
+first HTTP request, in discovery and in a sync selecting a single stream.
+
+Each run starts a new interpreter, so imports are cold. ``requests`` is
+patched to stop the process at its first request. The ``eager`` variant
+reproduces the previous startup by importing every stream class and the
+Parquet output and by compiling the schema files before running the tap;
+``lazy`` is the tap as it is (precompiled schema bundle, stream classes and
+pyarrow imported on first use).
+
+    python benchmarks/bench_startup.py [--runs 10] [--stream tags]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from singer import metadata
+
+from tap_monday.schema import get_schemas
+
+CHILD = """
+import os, sys, time
+start = time.perf_counter()
+import requests
+
+def first_request(*args, **kwargs):
+    with open({result_path!r}, "w") as result:
+        result.write(str(time.perf_counter() - start))
+    os._exit(0)
+
+requests.Session.request = first_request
+sys.argv = ["tap-monday"] + {args!r}
+import tap_monday
+if {eager!r}:
+    import tap_monday.parquet
+    from tap_monday.schema import compile_schemas
+    from tap_monday.streams import STREAMS
+    list(STREAMS.values())
+    compile_schemas()
+tap_monday.main()
+"""
+
+
+def write_files(directory: str, stream_name: str):
+    """Write a config and a catalog selecting *stream_name*; return their paths."""
+    config_path = os.path.join(directory, "config.json")
+    with open(config_path, "w") as config_file:
+        json.dump({"api_token": "token", "start_date": "2024-01-01T00:00:00Z", "user_agent": "bench"}, config_file)
+
+    schemas, field_metadata = get_schemas()
+    mdata = metadata.to_map(field_metadata[stream_name])
+    mdata = metadata.write(mdata, (), "selected", True)
+    catalog = {"streams": [{
+        "stream": stream_name,
+        "tap_stream_id": stream_name,
+        "schema": schemas[stream_name],
+        "metadata": metadata.to_list(mdata),
+    }]}
+    catalog_path = os.path.join(directory, "catalog.json")
+    with open(catalog_path, "w") as catalog_file:
+        json.dump(catalog, catalog_file)
+    return config_path, catalog_path
+
+
+def time_to_first_request(args, eager: bool, result_path: str) -> float:
+    """Run the tap in a new interpreter; return the seconds from its start to its first request."""
+    if os.path.exists(result_path):
+        os.remove(result_path)
+    subprocess.run([sys.executable, "-c", CHILD.format(args=args, eager=eager, result_path=result_path)],
+                   check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    with open(result_path) as result:
+        return float(result.read())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--stream", default="tags", help="Stream selected in the sync.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        config_path, catalog_path = write_files(directory, args.stream)
+        result_path = os.path.join(directory, "result")
+        modes = {
+            "discover": ["--config", config_path, "--discover"],
+            "sync": ["--config", config_path, "--catalog", catalog_path],
+        }
+        print("{:10} {:8} {:>12} {:>12}".format("mode", "variant", "median (ms)", "min (ms)"))
+        for mode, tap_args in modes.items():
+            timings = {"eager": [], "lazy": []}
+            # Alternate the variants so that both see the same system load.
+            for _ in range(args.runs):
+                for variant, variant_timings in timings.items():
+                    variant_timings.append(time_to_first_request(tap_args, variant == "eager", result_path))
+            for variant, variant_timings in timings.items():
+                print("{:10} {:8} {:12.1f} {:12.1f}".format(
+                    mode, variant, statistics.median(variant_timings) * 1000, min(variant_timings) * 1000))
+
+
+if __name__ == "__main__":
+    main()
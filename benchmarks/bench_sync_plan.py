@@ -0,0 +1,79 @@
+"""Benchmark the per-record overhead of a child stream's sync.
+
+``column_values`` is synced once per ``board_items`` record. Before every
+request it used to generate its GraphQL selection from the schema twice,
+look its selection up in the catalog metadata and create a singer record
+counter, which re-reads singer's logging configuration. The ``before``
+variant reproduces this by discarding the stream's ``StreamPlan`` before each
+parent record and by counting records with ``singer.metrics.record_counter``;
+``after`` is the sync as it is.
+
+Requests are not sent: the child's records are stubbed out, so the timings
+are the overhead of the sync itself per parent record.
+
+    python benchmarks/bench_sync_plan.py [--records 2000] [--rounds 5]
+"""
+import argparse
+import logging
+import time
+from unittest.mock import MagicMock, patch
+
+import singer
+import singer.metrics
+from singer import metadata
+from singer.catalog import CatalogEntry, Schema
+
+import tap_monday.metrics
+from tap_monday.schema import get_schemas
+from tap_monday.streams import STREAMS
+from tap_monday.transform import CompiledTransformer
+
+
+def make_stream(stream_name: str):
+    schemas, field_metadata = get_schemas()
+    mdata = metadata.write(metadata.to_map(field_metadata[stream_name]), (), "selected", True)
+    entry = CatalogEntry(stream=stream_name, tap_stream_id=stream_name, schema=Schema.from_dict(schemas[stream_name]),
+                         metadata=metadata.to_list(mdata))
+    client = MagicMock()
+    client.config = {"start_date": "2024-01-01T00:00:00Z"}
+    return STREAMS[stream_name](client, entry)
+
+
+def run(stream, parents, before: bool) -> float:
+    """Sync the child stream for every parent record; return the seconds per record."""
+    transformer = CompiledTransformer()
+    state = {}
+    with patch("tap_monday.metrics.record_counter",
+               singer.metrics.record_counter if before else tap_monday.metrics.record_counter):
+        start = time.perf_counter()
+        for parent in parents:
+            if before:
+                stream._plan = None  # pylint: disable=protected-access
+            stream.sync(state, transformer, parent_obj=parent)
+        return (time.perf_counter() - start) / len(parents)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--records", type=int, default=2000, help="Number of parent (board_items) records.")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    # Silence the record counter metrics logged after each parent record.
+    logging.disable(logging.INFO)
+
+    stream = make_stream("column_values")
+    parents = [{"id": str(1000 + i), "board_id": "1", "updated_at": "2024-06-01T00:00:00Z"}
+               for i in range(args.records)]
+    with patch.object(type(stream), "get_records", return_value=iter(())):
+        timings = {"before": [], "after": []}
+        for _ in range(args.rounds):
+            timings["before"].append(run(stream, parents, before=True))
+            timings["after"].append(run(stream, parents, before=False))
+
+    print("{:8} {:>18}".format("variant", "us / parent record"))
+    for variant, variant_timings in timings.items():
+        print("{:8} {:18.1f}".format(variant, min(variant_timings) * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,594 @@
+"""Synthetic Monday accounts served by ``benchmarks/mock_server.py``.
+
+``SyntheticDataset`` generates the records of a small, uniform account on
+access: each record is derived from the seed and its id, so the same seed
+always yields the same account and the dataset takes no memory.
+
+``generate()`` writes a large account with a realistic shape to a directory
+(``python benchmarks/dataset.py DIR --boards 10000 --items 5000000``): board
+sizes follow a heavy-tailed distribution, most items are created and updated
+recently, a few are updated again and again, and activity logs and updates
+are spread over the items. Every entity is a fixed-size binary record (36
+bytes per item with 10 columns, values included), so ``MappedDataset`` serves
+the directory by memory-mapping the files and decoding records on access,
+without loading the account into memory. Records are rendered to the same
+shapes by both datasets.
+
+Ids are allocated in ranges so that any record can be found from its id:
+board ``b`` (0-based) has id ``BOARD_ID_BASE + b``, item ``i`` of the account
+has id ``ITEM_ID_BASE + i``, and so on.
+"""
+import argparse
+import json
+import mmap
+import os
+import random
+import struct
+import time
+from abc import ABC, abstractmethod
+from array import array
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+BOARD_ID_BASE = 1000000
+ITEM_ID_BASE = 100000000
+LOG_ID_BASE = 10000000000
+UPDATE_ID_BASE = 20000000000
+USER_ID_BASE = 5000
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+COLUMN_TYPES = ["status", "text", "numbers", "date", "people", "long_text", "dropdown", "timeline"]
+STATUS_LABELS = ["Working on it", "Done", "Stuck", "Not started", "Waiting for review"]
+BOARD_KINDS = ["public", "private", "share"]
+LOG_EVENTS = ["update_column_value", "create_pulse", "move_pulse_into_group", "update_name"]
+GROUPS_PER_BOARD = 3
+
+FORMAT = 1
+MANIFEST = "manifest.json"
+# Fixed-size records, little-endian. Boards and items end with one column
+# type (boards) or column value (items) per column.
+BOARD_STRUCT = "<QIQIIIBH"  # first item, items, first log, logs, created, updated, kind, workspace
+ITEM_STRUCT = "<IIIBBH"  # board, created, updated, group, state, creator
+LOG_STRUCT = "<IIBH"  # item, created, event, user
+UPDATE_STRUCT = "<IIIHBB"  # item, created, updated, creator, replies, assets
+
+
+def timestamp(seconds: float) -> str:
+    """Return the RFC 3339 date-time *seconds* after the dataset epoch."""
+    return (EPOCH + timedelta(seconds=int(seconds))).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def log_timestamp(seconds: float) -> str:
+    """Return an activity log time: 17-digit UNIX time (tenths of microseconds)."""
+    return str(int((EPOCH.timestamp() + seconds) * 10 ** 7))
+
+
+class LazySequence(Sequence):
+    """A read-only sequence of *length* records built by *factory(index)*."""
+
+    def __init__(self, length: int, factory: Callable[[int], Dict]) -> None:
+        self.length = length
+        self.factory = factory
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.factory(position) for position in range(*index.indices(self.length))]
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError(index)
+        return self.factory(index)
+
+
+class BaseDataset(ABC):
+    """Rendering of the records shared by the datasets. Subclasses set
+    ``board_count``, ``update_count`` and ``user_count``."""
+
+    board_count = 0
+    update_count = 0
+    user_count = 1
+
+    @abstractmethod
+    def boards(self) -> Sequence:
+        """Return the boards of the account."""
+
+    @abstractmethod
+    def board(self, board_id: Any) -> Optional[Dict]:
+        """Return a board, or None if there is none of this id."""
+
+    @abstractmethod
+    def items(self, board_id: Any) -> Sequence:
+        """Return the items of a board."""
+
+    @abstractmethod
+    def item(self, item_id: Any) -> Optional[Dict]:
+        """Return an item, or None if there is none of this id."""
+
+    @abstractmethod
+    def activity_logs(self, board_id: Any) -> Sequence:
+        """Return the activity logs of a board."""
+
+    @abstractmethod
+    def _update(self, index: int) -> Dict:
+        """Return the update of an index of ``collection("updates")``."""
+
+    def collection(self, name: str) -> Any:
+        """Return the records of a root field other than boards and items."""
+        if name == "users":
+            return LazySequence(self.user_count, self._user)
+        if name == "updates":
+            return LazySequence(self.update_count, self._update)
+        if name == "me":
+            return self._user(0)
+        if name == "account":
+            return {"id": "1", "name": "Benchmark account", "slug": "benchmark", "tier": "enterprise",
+                    "country_code": "US", "first_day_of_the_week": "monday", "active_members_count": self.user_count,
+                    "plan": {"max_users": 1000, "period": "yearly", "tier": "enterprise", "version": 1}}
+        if name == "workspaces":
+            return [{"id": str(index + 1), "name": "Workspace {}".format(index + 1), "kind": "open",
+                     "state": "active", "created_at": timestamp(index * 3600), "description": None}
+                    for index in range(max(1, self.board_count // 20))]
+        if name == "tags":
+            return [{"id": str(index + 1), "name": "tag-{}".format(index), "color": "#00c875"} for index in range(20)]
+        if name == "teams":
+            return [{"id": str(index + 1), "name": "Team {}".format(index), "picture_url": None,
+                     "users": [{"id": str(USER_ID_BASE + index)}]} for index in range(5)]
+        return []
+
+    @staticmethod
+    def render_columns(column_types: List[int]) -> List[Dict]:
+        columns = []
+        for position, type_index in enumerate(column_types):
+            column_type = COLUMN_TYPES[type_index % len(COLUMN_TYPES)]
+            columns.append({"id": "{}_{}".format(column_type, position), "title": "Column {}".format(position),
+                            "type": column_type, "archived": False, "description": None, "width": 120,
+                            "settings_str": "{}"})
+        return columns
+
+    @staticmethod
+    def render_column_value(column: Dict, value: int) -> Dict:
+        column_type = column["type"]
+        if column_type == "status":
+            text = STATUS_LABELS[value % len(STATUS_LABELS)]
+            raw = {"index": value % len(STATUS_LABELS)}
+        elif column_type == "date":
+            text = timestamp(value * 86400)[:10]
+            raw = {"date": text}
+        elif column_type == "numbers":
+            text = str(value)
+            raw = value
+        elif column_type == "people":
+            text = "User {}".format(value % 1000)
+            raw = {"personsAndTeams": [{"id": USER_ID_BASE + value % 1000, "kind": "person"}]}
+        else:
+            text = "{} {}".format(column_type, value)
+            raw = {"text": text}
+        return {"id": column["id"], "type": column_type, "text": text, "value": json.dumps(raw),
+                "column": {"id": column["id"]}}
+
+    def render_board(self, index: int, items_count: int, created: float, updated: float, kind: int,
+                     workspace: int, column_types: List[int]) -> Dict:
+        board_id = str(BOARD_ID_BASE + index)
+        groups = [{"id": "group_{}".format(position), "title": "Group {}".format(position), "color": "#579bfc",
+                   "archived": False, "deleted": False, "position": str(position)}
+                  for position in range(GROUPS_PER_BOARD)]
+        return {
+            "id": board_id,
+            "name": "Board {}".format(index),
+            "state": "active",
+            "board_kind": BOARD_KINDS[kind % len(BOARD_KINDS)],
+            "board_folder_id": None,
+            "workspace_id": str(workspace + 1),
+            "description": None,
+            "permissions": "everyone",
+            "access_level": "edit",
+            "communication": None,
+            "item_terminology": "item",
+            "object_type_unique_key": None,
+            "type": "board",
+            "url": "https://benchmark.monday.com/boards/{}".format(board_id),
+            "items_count": items_count,
+            "created_at": timestamp(created),
+            "updated_at": timestamp(updated),
+            "creator": {"id": str(USER_ID_BASE)},
+            "top_group": {"id": "group_0"},
+            "owners": [{"id": str(USER_ID_BASE), "name": "User 0"}],
+            "subscribers": [{"id": str(USER_ID_BASE), "name": "User 0"}],
+            "tags": [],
+            "updates": [],
+            "groups": groups,
+            "columns": self.render_columns(column_types),
+            "views": [{"id": str(index * 10 + 1), "name": "Main table", "type": "table", "settings_str": "{}",
+                       "access_level": "edit", "view_specific_data_str": "{}"}],
+        }
+
+    def render_item(self, index: int, board_index: int, created: float, updated: float, group: int, state: int,
+                    creator: int, columns: List[Dict], values: List[int]) -> Dict:
+        item_id = str(ITEM_ID_BASE + index)
+        board_id = BOARD_ID_BASE + board_index
+        return {
+            "id": item_id,
+            "name": "Item {}".format(index),
+            "state": "archived" if state else "active",
+            "email": "item-{}@benchmark.monday.com".format(item_id),
+            "url": "https://benchmark.monday.com/boards/{}/pulses/{}".format(board_id, item_id),
+            "relative_link": "/boards/{}/pulses/{}".format(board_id, item_id),
+            "created_at": timestamp(created),
+            "updated_at": timestamp(updated),
+            "creator": {"id": str(USER_ID_BASE + creator)},
+            "group": {"id": "group_{}".format(group)},
+            "parent_item": None,
+            "description": None,
+            "subscribers": [],
+            "column_values": [self.render_column_value(column, value) for column, value in zip(columns, values)],
+        }
+
+    @staticmethod
+    def render_activity_log(index: int, board_index: int, item_index: int, created: float, event: int,
+                            user: int) -> Dict:
+        return {
+            "id": str(LOG_ID_BASE + index),
+            "account_id": "1",
+            "user_id": str(USER_ID_BASE + user),
+            "entity": "pulse",
+            "event": LOG_EVENTS[event % len(LOG_EVENTS)],
+            "created_at": log_timestamp(created),
+            "data": json.dumps({"board_id": BOARD_ID_BASE + board_index, "pulse_id": ITEM_ID_BASE + item_index}),
+        }
+
+    @staticmethod
+    def render_update(index: int, item_index: int, created: float, updated: float, creator: int, replies: int,
+                      assets: int) -> Dict:
+        update_id = UPDATE_ID_BASE + index
+
+        def asset(position: int) -> Dict:
+            return {"id": str(update_id * 10 + position), "name": "file-{}.png".format(position),
+                    "file_extension": ".png", "file_size": 1024 * (position + 1), "created_at": timestamp(created),
+                    "original_geometry": None, "public_url": "https://benchmark.monday.com/file.png",
+                    "url": "https://benchmark.monday.com/file.png", "url_thumbnail": None,
+                    "uploaded_by": {"id": str(USER_ID_BASE + creator)}}
+
+        return {
+            "id": str(update_id),
+            "item_id": str(ITEM_ID_BASE + item_index),
+            "creator_id": str(USER_ID_BASE + creator),
+            "body": "<p>update {}</p>".format(index),
+            "text_body": "update {}".format(index),
+            "created_at": timestamp(created),
+            "updated_at": timestamp(updated),
+            "replies": [{"id": str(update_id * 10 + position), "body": "<p>reply</p>", "text_body": "reply",
+                         "kind": "text", "created_at": timestamp(created + 60 * (position + 1)),
+                         "updated_at": timestamp(created + 60 * (position + 1)),
+                         "edited_at": timestamp(created + 60 * (position + 1)),
+                         "creator_id": str(USER_ID_BASE + creator), "assets": [], "likes": [], "viewers": []}
+                        for position in range(replies)],
+            "assets": [asset(position) for position in range(assets)],
+        }
+
+    def _user(self, index: int) -> Dict:
+        return {
+            "id": str(USER_ID_BASE + index),
+            "name": "User {}".format(index),
+            "email": "user-{}@benchmark.monday.com".format(index),
+            "enabled": True,
+            "is_admin": index == 0,
+            "is_guest": False,
+            "is_pending": False,
+            "is_verified": True,
+            "is_view_only": False,
+            "created_at": timestamp(index * 86400),
+            "join_date": None,
+            "last_activity": timestamp(index * 3600),
+            "time_zone_identifier": "Europe/London",
+            "utc_hours_diff": 0,
+            "account": {"id": "1"},
+            "out_of_office": {"active": False, "start_date": None, "end_date": None, "type": None},
+        }
+
+
+class SyntheticDataset(BaseDataset):
+    """A Monday account of *boards* boards of *items_per_board* items.
+
+    Args:
+        seed (int): Seed of the generated values.
+        boards (int): Number of boards.
+        items_per_board (int): Number of items of each board.
+        columns_per_board (int): Number of columns (and column values per item).
+        logs_per_board (int): Number of activity logs of each board.
+        updates (int): Number of updates (with their replies and assets).
+        users (int): Number of users.
+    """
+
+    def __init__(self, seed: int = 0, boards: int = 10, items_per_board: int = 200, columns_per_board: int = 8,
+                 logs_per_board: int = 50, updates: int = 500, users: int = 50) -> None:
+        self.seed = seed
+        self.board_count = boards
+        self.items_per_board = items_per_board
+        self.columns_per_board = columns_per_board
+        self.logs_per_board = logs_per_board
+        self.update_count = updates
+        self.user_count = users
+
+    def _random(self, *key) -> random.Random:
+        return random.Random("{}:{}".format(self.seed, ":".join(str(part) for part in key)))
+
+    def _board_index(self, board_id: Any) -> Optional[int]:
+        index = int(board_id) - BOARD_ID_BASE
+        return index if 0 <= index < self.board_count else None
+
+    def boards(self) -> Sequence:
+        return LazySequence(self.board_count, self._board)
+
+    def board(self, board_id: Any) -> Optional[Dict]:
+        index = self._board_index(board_id)
+        return None if index is None else self._board(index)
+
+    def items(self, board_id: Any) -> Sequence:
+        index = self._board_index(board_id)
+        if index is None:
+            return []
+        start = index * self.items_per_board
+        return LazySequence(self.items_per_board, lambda position: self._item(start + position))
+
+    def item(self, item_id: Any) -> Optional[Dict]:
+        index = int(item_id) - ITEM_ID_BASE
+        if not 0 <= index < self.board_count * self.items_per_board:
+            return None
+        return self._item(index)
+
+    def activity_logs(self, board_id: Any) -> Sequence:
+        index = self._board_index(board_id)
+        if index is None:
+            return []
+        start = index * self.logs_per_board
+        return LazySequence(self.logs_per_board, lambda position: self._activity_log(start + position))
+
+    def _board(self, index: int) -> Dict:
+        rng = self._random("board", index)
+        return self.render_board(index, self.items_per_board, 0, rng.uniform(0, 365 * 86400),
+                                 rng.randrange(len(BOARD_KINDS)), index // 20, list(range(self.columns_per_board)))
+
+    def _item(self, index: int) -> Dict:
+        rng = self._random("item", index)
+        board_index = index // self.items_per_board
+        created = rng.uniform(0, 300 * 86400)
+        columns = self.render_columns(list(range(self.columns_per_board)))
+        return self.render_item(index, board_index, created, created + rng.uniform(0, 60 * 86400),
+                                rng.randrange(GROUPS_PER_BOARD), 0, rng.randrange(self.user_count), columns,
+                                [rng.randrange(1000) for _ in columns])
+
+    def _activity_log(self, index: int) -> Dict:
+        rng = self._random("log", index)
+        board_index = index // self.logs_per_board
+        item_index = board_index * self.items_per_board + rng.randrange(max(1, self.items_per_board))
+        return self.render_activity_log(index, board_index, item_index, rng.uniform(0, 365 * 86400),
+                                        rng.randrange(len(LOG_EVENTS)), rng.randrange(self.user_count))
+
+    def _update(self, index: int) -> Dict:
+        rng = self._random("update", index)
+        created = rng.uniform(0, 365 * 86400)
+        item_count = max(1, self.board_count * self.items_per_board)
+        return self.render_update(index, rng.randrange(item_count), created, created + rng.uniform(0, 86400),
+                                  rng.randrange(self.user_count), rng.randrange(3), int(rng.random() < 0.2))
+
+
+def _split(total: int, weights: List[float]) -> List[int]:
+    """Split *total* into integers proportional to *weights*."""
+    scale = total / (sum(weights) or 1)
+    counts = [int(weight * scale) for weight in weights]
+    remainder = total - sum(counts)
+    by_fraction = sorted(range(len(weights)), key=lambda index: counts[index] - weights[index] * scale)
+    for index in by_fraction[:remainder]:
+        counts[index] += 1
+    return counts
+
+
+def generate(directory: str, seed: int = 0, boards: int = 1000, items: int = 500000, columns_per_board: int = 10,
+             logs_per_item: float = 2.0, updates_per_item: float = 0.1, users: int = 1000, days: int = 3 * 365,
+             skew: float = 1.2, progress: Callable[[str], None] = None) -> Dict:
+    """Write a large account to *directory*; return its manifest.
+
+    Args:
+        seed (int): Seed of the account.
+        boards (int): Number of boards.
+        items (int): Number of items, spread over the boards with a Pareto
+            distribution of shape *skew* (smaller is more skewed).
+        columns_per_board (int): Columns of each board; every item has a value
+            for each of them.
+        logs_per_item (float): Activity logs per item, on average.
+        updates_per_item (float): Updates per item, on average.
+        users (int): Number of users (at most 65536).
+        days (int): Age of the account: items are created over this many days
+            before the dataset end, more of them recently.
+    """
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    end = days * 86400
+    board_struct = struct.Struct(BOARD_STRUCT + "B" * columns_per_board)
+    item_struct = struct.Struct(ITEM_STRUCT + "H" * columns_per_board)
+    log_struct = struct.Struct(LOG_STRUCT)
+    update_struct = struct.Struct(UPDATE_STRUCT)
+    users = min(users, 65536)
+
+    item_counts = _split(items, [rng.paretovariate(skew) for _ in range(boards)])
+    log_counts = _split(int(items * logs_per_item), item_counts)
+    item_start = log_start = 0
+    item_updates = array("I")
+    with open(os.path.join(directory, "boards.bin"), "wb") as boards_file, \
+            open(os.path.join(directory, "items.bin"), "wb") as items_file, \
+            open(os.path.join(directory, "logs.bin"), "wb") as logs_file:
+        for board_index, (item_count, log_count) in enumerate(zip(item_counts, log_counts)):
+            board_created = rng.uniform(0, end * 0.9)
+            column_types = [rng.randrange(len(COLUMN_TYPES)) for _ in range(columns_per_board)]
+            chunk = bytearray()
+            board_updated = board_created
+            created_times = []
+            for _ in range(item_count):
+                # Most items are recent; most are never edited after a short
+                # while, some keep being edited (hot items).
+                created = end - (end - board_created) * rng.random() ** 2
+                draw = rng.random()
+                if draw < 0.05:
+                    updated = end - rng.uniform(0, 7 * 86400)
+                elif draw < 0.3:
+                    updated = created + (end - created) * rng.random()
+                else:
+                    updated = created + rng.expovariate(1 / 3600)
+                updated = max(created, min(updated, end))
+                board_updated = max(board_updated, updated)
+                created_times.append(created)
+                item_updates.append(int(updated))
+                chunk += item_struct.pack(board_index, int(created), int(updated), rng.randrange(GROUPS_PER_BOARD),
+                                          int(rng.random() < 0.02), rng.randrange(users),
+                                          *[rng.getrandbits(16) for _ in range(columns_per_board)])
+            items_file.write(chunk)
+
+            chunk = bytearray()
+            for _ in range(log_count if item_count else 0):
+                position = rng.randrange(item_count)
+                created = rng.uniform(created_times[position], end)
+                chunk += log_struct.pack(item_start + position, int(created), rng.randrange(len(LOG_EVENTS)),
+                                         rng.randrange(users))
+            logs_file.write(chunk)
+
+            boards_file.write(board_struct.pack(item_start, item_count, log_start, log_count if item_count else 0,
+                                                int(board_created), int(board_updated),
+                                                rng.randrange(len(BOARD_KINDS)), board_index // 20, *column_types))
+            item_start += item_count
+            log_start += log_count if item_count else 0
+            if progress and (board_index + 1) % 1000 == 0:
+                progress("{} boards, {} items".format(board_index + 1, item_start))
+
+    update_count = int(items * updates_per_item)
+    with open(os.path.join(directory, "updates.bin"), "wb") as updates_file:
+        chunk = bytearray()
+        for _ in range(update_count if items else 0):
+            item_index = rng.randrange(items)
+            created = rng.uniform(item_updates[item_index] - 86400, end)
+            replies = min(int(rng.expovariate(1.0)), 255)
+            chunk += update_struct.pack(item_index, int(max(created, 0)), int(min(created + rng.expovariate(1 / 600), end)),
+                                        rng.randrange(users), replies, int(rng.random() < 0.2))
+            if len(chunk) >= 1 << 20:
+                updates_file.write(chunk)
+                chunk = bytearray()
+        updates_file.write(chunk)
+
+    manifest = {"format": FORMAT, "seed": seed, "boards": boards, "items": item_start, "logs": log_start,
+                "updates": update_count if items else 0, "users": users, "columns_per_board": columns_per_board,
+                "days": days}
+    with open(os.path.join(directory, MANIFEST), "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    return manifest
+
+
+class _Table:
+    """Fixed-size records of a memory-mapped file."""
+
+    def __init__(self, path: str, record_struct: struct.Struct) -> None:
+        self.record_struct = record_struct
+        with open(path, "rb") as table_file:
+            size = os.fstat(table_file.fileno()).st_size
+            self.data = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self.length = size // record_struct.size
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, index: int) -> tuple:
+        return self.record_struct.unpack_from(self.data, index * self.record_struct.size)
+
+
+class MappedDataset(BaseDataset):
+    """Serves an account written by ``generate()`` from memory-mapped files."""
+
+    def __init__(self, directory: str) -> None:
+        with open(os.path.join(directory, MANIFEST)) as manifest_file:
+            self.manifest = json.load(manifest_file)
+        if self.manifest.get("format") != FORMAT:
+            raise ValueError("Unsupported dataset format: {}".format(self.manifest.get("format")))
+        columns = self.manifest["columns_per_board"]
+        self.board_table = _Table(os.path.join(directory, "boards.bin"), struct.Struct(BOARD_STRUCT + "B" * columns))
+        self.item_table = _Table(os.path.join(directory, "items.bin"), struct.Struct(ITEM_STRUCT + "H" * columns))
+        self.log_table = _Table(os.path.join(directory, "logs.bin"), struct.Struct(LOG_STRUCT))
+        self.update_table = _Table(os.path.join(directory, "updates.bin"), struct.Struct(UPDATE_STRUCT))
+        self.board_count = len(self.board_table)
+        self.update_count = len(self.update_table)
+        self.user_count = self.manifest["users"]
+
+    def _board_index(self, board_id: Any) -> Optional[int]:
+        index = int(board_id) - BOARD_ID_BASE
+        return index if 0 <= index < self.board_count else None
+
+    def boards(self) -> Sequence:
+        return LazySequence(self.board_count, self._board)
+
+    def board(self, board_id: Any) -> Optional[Dict]:
+        index = self._board_index(board_id)
+        return None if index is None else self._board(index)
+
+    def items(self, board_id: Any) -> Sequence:
+        index = self._board_index(board_id)
+        if index is None:
+            return []
+        start, count = self.board_table[index][:2]
+        return LazySequence(count, lambda position: self._item(start + position))
+
+    def item(self, item_id: Any) -> Optional[Dict]:
+        index = int(item_id) - ITEM_ID_BASE
+        return self._item(index) if 0 <= index < len(self.item_table) else None
+
+    def activity_logs(self, board_id: Any) -> Sequence:
+        index = self._board_index(board_id)
+        if index is None:
+            return []
+        start, count = self.board_table[index][2:4]
+        return LazySequence(count, lambda position: self._activity_log(start + position))
+
+    def _board(self, index: int) -> Dict:
+        _, item_count, _, _, created, updated, kind, workspace, *column_types = self.board_table[index]
+        return self.render_board(index, item_count, created, updated, kind, workspace, column_types)
+
+    def _item(self, index: int) -> Dict:
+        board_index, created, updated, group, state, creator, *values = self.item_table[index]
+        columns = self.render_columns(self.board_table[board_index][8:])
+        return self.render_item(index, board_index, created, updated, group, state, creator, columns, values)
+
+    def _activity_log(self, index: int) -> Dict:
+        item_index, created, event, user = self.log_table[index]
+        board_index = self.item_table[item_index][0]
+        return self.render_activity_log(index, board_index, item_index, created, event, user)
+
+    def _update(self, index: int) -> Dict:
+        return self.render_update(index, *self.update_table[index])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write a large synthetic Monday account to a directory.")
+    parser.add_argument("directory")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--boards", type=int, default=1000)
+    parser.add_argument("--items", type=int, default=500000)
+    parser.add_argument("--columns", type=int, default=10, help="Columns per board (column values per item).")
+    parser.add_argument("--logs-per-item", type=float, default=2.0)
+    parser.add_argument("--updates-per-item", type=float, default=0.1)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--days", type=int, default=3 * 365, help="Age of the account.")
+    parser.add_argument("--skew", type=float, default=1.2, help="Pareto shape of the board sizes.")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    manifest = generate(args.directory, seed=args.seed, boards=args.boards, items=args.items,
+                        columns_per_board=args.columns, logs_per_item=args.logs_per_item,
+                        updates_per_item=args.updates_per_item, users=args.users, days=args.days, skew=args.skew,
+                        progress=print)
+    size = sum(os.path.getsize(os.path.join(args.directory, name)) for name in os.listdir(args.directory))
+    print("Wrote {} boards, {} items, {} column values, {} activity logs and {} updates ({:.1f} MB) in {:.1f}s".format(
+        manifest["boards"], manifest["items"], manifest["items"] * manifest["columns_per_board"], manifest["logs"],
+        manifest["updates"], size / 1e6, time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+"""A local stand-in for the Monday GraphQL API, for offline benchmarks.
+
+The server answers the queries the streams generate from a synthetic dataset
+(``benchmarks/dataset.py``): root fields with ``limit``/``page`` and ``ids``
+arguments, ``items_page``/``next_items_page`` cursors, ``items(ids)``,
+``activity_logs``, ``updates``, the ``complexity`` field and aliased probes.
+Queries are parsed with ``tap_monday.complexity.parse_query`` and only the
+selected fields are returned.
+
+Latency and errors can be injected: a fixed latency (plus jitter) per
+request, HTTP 500 errors, HTTP 429 responses with ``retry_in_seconds`` and
+``CursorException`` errors for a given fraction of the requests, cursors that
+expire after ``cursor_ttl`` seconds and a per-minute complexity budget.
+Run it standalone and point the tap at it with the ``base_url`` config
+option:
+
+    python benchmarks/mock_server.py --port 8080 --boards 20 --items 1000 --latency 0.05
+
+or serve a large account written by ``benchmarks/dataset.py`` with
+``--dataset DIR``.
+"""
+import argparse
+import itertools
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from dataset import MappedDataset, SyntheticDataset
+
+from tap_monday import codec
+from tap_monday.complexity import MAX_QUERY_COMPLEXITY, QueryField, estimate_query_complexity, parse_query
+
+# Complexity budget of an account per minute (the API's default).
+DEFAULT_COMPLEXITY_BUDGET = 10000000
+_ALIAS_RE = re.compile(r"(\w+)\s*:\s*[A-Za-z_]")
+_ARGUMENTS_RE = re.compile(r"\([^)]*\)")
+
+
+def parse_request(query: str) -> List[Tuple[str, QueryField]]:
+    """Return the root fields of a query with their response keys (their
+    alias, if any)."""
+    aliases = set(_ALIAS_RE.findall(_ARGUMENTS_RE.sub("", query)))
+    fields, alias = [], None
+    for field in parse_query(query):
+        if field.name in aliases and not field.children and not field.arguments:
+            alias = field.name
+            continue
+        fields.append((alias or field.name, field))
+        alias = None
+    return fields
+
+
+def as_ids(value: Any) -> List[str]:
+    """Return an ``ids`` argument as a list of id strings."""
+    values = value if isinstance(value, list) else [value]
+    return [str(item).strip('"') for item in values]
+
+
+def paginate(records, arguments: Dict) -> list:
+    """Return the page of *records* selected by the ``limit`` and ``page`` arguments."""
+    limit = arguments.get("limit")
+    if not isinstance(limit, int):
+        return list(records)
+    page = arguments.get("page") if isinstance(arguments.get("page"), int) else 1
+    return records[(page - 1) * limit:page * limit]
+
+
+def project(value: Any, fields: List[QueryField]) -> Any:
+    """Return *value* restricted to the selected *fields*."""
+    if isinstance(value, list):
+        return [project(item, fields) for item in value]
+    if not isinstance(value, dict) or not fields:
+        return value
+    return {field.name: project(value.get(field.name), field.children) for field in fields}
+
+
+class MockMonday:
+    """Resolves GraphQL queries against a dataset and injects errors.
+
+    Args:
+        dataset: The account served (see ``benchmarks/dataset.py``).
+        latency (float): Seconds added to every response.
+        jitter (float): Maximum random seconds added to the latency.
+        error_rate (float): Fraction of requests answered with HTTP 500.
+        rate_limit_rate (float): Fraction of requests answered with HTTP 429.
+        cursor_expiry_rate (float): Fraction of ``next_items_page`` requests
+            failing with a ``CursorException``.
+        cursor_ttl (float): Seconds after which a cursor expires.
+        retry_in_seconds (int): ``retry_in_seconds`` of the rate limit errors.
+        complexity_budget (int): Complexity allowed per minute, or 0 for none.
+        seed (int): Seed of the injected errors.
+    """
+
+    def __init__(self, dataset, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 rate_limit_rate: float = 0.0, cursor_expiry_rate: float = 0.0, cursor_ttl: float = 60.0,
+                 retry_in_seconds: int = 1, complexity_budget: int = 0, seed: int = 0) -> None:
+        self.dataset = dataset
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.cursor_expiry_rate = cursor_expiry_rate
+        self.cursor_ttl = cursor_ttl
+        self.retry_in_seconds = retry_in_seconds
+        self.complexity_budget = complexity_budget
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.cursors: Dict[str, Tuple[str, int, float]] = {}
+        self.cursor_ids = itertools.count(1)
+        self.budget_used = 0
+        self.budget_reset_at = time.monotonic() + 60
+        self.stats = {"requests": 0, "errors": 0, "rate_limited": 0, "cursor_expired": 0}
+
+    def handle(self, body: bytes) -> Tuple[int, Dict]:
+        """Answer a request body; return the status code and the JSON response."""
+        with self.lock:
+            self.stats["requests"] += 1
+            draw = self.random.random()
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            time.sleep(delay)
+        if draw < self.error_rate:
+            self.count("errors")
+            return 500, {"error_message": "Internal server error", "status_code": 500}
+        if draw < self.error_rate + self.rate_limit_rate:
+            self.count("rate_limited")
+            return 429, self.error("Rate limit exceeded", "RATE_LIMIT_EXCEEDED",
+                                   retry_in_seconds=self.retry_in_seconds)
+
+        try:
+            query = codec.loads(body).get("query") or ""
+        except Exception:
+            return 400, {"error_message": "Invalid JSON body", "status_code": 400}
+        complexity = estimate_query_complexity(query)
+        if complexity > MAX_QUERY_COMPLEXITY:
+            return 200, self.error("Query has complexity of {}, which exceeds max complexity of {}".format(
+                complexity, MAX_QUERY_COMPLEXITY), "maxComplexityExceeded")
+        error = self.charge(complexity)
+        if error:
+            return 200, error
+
+        data = {}
+        for key, field in parse_request(query):
+            try:
+                data[key] = self.resolve(field, complexity)
+            except CursorExpired:
+                self.count("cursor_expired")
+                return 200, self.error("CursorExpiredError: The cursor provided for pagination has expired.",
+                                       "CursorException")
+        return 200, {"data": data, "account_id": 1}
+
+    def count(self, name: str) -> None:
+        with self.lock:
+            self.stats[name] += 1
+
+    @staticmethod
+    def error(message: str, code: str, **extensions) -> Dict:
+        return {"errors": [{"message": message, "extensions": {"code": code, **extensions}}], "account_id": 1}
+
+    def charge(self, complexity: int) -> Optional[Dict]:
+        """Charge a query to the per-minute budget; return the error of an exhausted budget."""
+        if not self.complexity_budget:
+            return None
+        with self.lock:
+            now = time.monotonic()
+            if now >= self.budget_reset_at:
+                self.budget_used, self.budget_reset_at = 0, now + 60
+            if self.budget_used + complexity > self.complexity_budget:
+                self.stats["rate_limited"] += 1
+                return self.error("Complexity budget exhausted", "ComplexityException",
+                                  retry_in_seconds=max(1, int(self.budget_reset_at - now)))
+            self.budget_used += complexity
+        return None
+
+    def resolve(self, field: QueryField, complexity: int) -> Any:
+        """Resolve a root field."""
+        arguments = field.arguments
+        if field.name == "boards":
+            boards = self.dataset.boards()
+            if "ids" in arguments:
+                boards = [board for board in map(self.dataset.board, as_ids(arguments["ids"])) if board]
+            return [self.resolve_board(board, field.children) for board in paginate(boards, arguments)]
+        if field.name == "items":
+            items = [item for item in map(self.dataset.item, as_ids(arguments.get("ids", []))) if item]
+            return project(paginate(items, arguments), field.children)
+        if field.name == "next_items_page":
+            return self.next_items_page(arguments, field.children)
+        if field.name == "complexity":
+            with self.lock:
+                budget = self.complexity_budget or DEFAULT_COMPLEXITY_BUDGET
+                return project({"query": complexity, "before": budget - self.budget_used + complexity,
+                                "after": budget - self.budget_used,
+                                "reset_in_x_seconds": max(0, int(self.budget_reset_at - time.monotonic()))},
+                               field.children)
+        if field.name == "__typename":
+            return "Query"
+        records = self.dataset.collection(field.name)
+        if isinstance(records, dict):
+            return project(records, field.children)
+        return project(paginate(records, arguments), field.children)
+
+    def resolve_board(self, board: Dict, fields: List[QueryField]) -> Dict:
+        result = {}
+        for field in fields:
+            if field.name == "items_page":
+                result["items_page"] = self.items_page(board["id"], 0, field.arguments, field.children)
+            elif field.name == "activity_logs":
+                logs = paginate(self.dataset.activity_logs(board["id"]), field.arguments)
+                result["activity_logs"] = project(logs, field.children)
+            elif field.name == "__typename":
+                result["__typename"] = "Board"
+            else:
+                result[field.name] = project(board.get(field.name), field.children)
+        return result
+
+    def items_page(self, board_id: str, offset: int, arguments: Dict, fields: List[QueryField]) -> Dict:
+        """Return a page of items of a board and the cursor of the next page."""
+        limit = arguments.get("limit") if isinstance(arguments.get("limit"), int) else 25
+        items = self.dataset.items(board_id)
+        page = items[offset:offset + limit]
+        cursor = None
+        if offset + limit < len(items):
+            cursor = "cursor-{}".format(next(self.cursor_ids))
+            with self.lock:
+                self.cursors[cursor] = (board_id, offset + limit, time.monotonic())
+        result = {}
+        for field in fields:
+            if field.name == "cursor":
+                result["cursor"] = cursor
+            elif field.name == "items":
+                result["items"] = project(page, field.children)
+        return result
+
+    def next_items_page(self, arguments: Dict, fields: List[QueryField]) -> Dict:
+        with self.lock:
+            entry = self.cursors.pop(arguments.get("cursor"), None)
+            expired = self.random.random() < self.cursor_expiry_rate
+        if entry is None or expired or time.monotonic() - entry[2] > self.cursor_ttl:
+            raise CursorExpired()
+        board_id, offset, _ = entry
+        return self.items_page(board_id, offset, arguments, fields)
+
+
+class CursorExpired(Exception):
+    """Raised for a cursor that is unknown or expired."""
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "MockMonday/1.0"
+    # Headers and body are written separately: without this every response
+    # waits for the delayed ACK of the client.
+    disable_nagle_algorithm = True
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        status, response = self.server.monday.handle(body)
+        self._send(status, response)
+
+    def do_HEAD(self):  # pylint: disable=invalid-name
+        self._send(200, None)
+
+    def _send(self, status: int, response: Optional[Dict]) -> None:
+        payload = codec.dumps(response).encode("utf-8") if response is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(payload)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+class MockServer:
+    """Serves a ``MockMonday`` over HTTP in a background thread.
+
+    Use it as a context manager; ``url`` is the ``base_url`` to configure.
+    """
+
+    def __init__(self, monday: MockMonday, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.monday = monday
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.monday = monday
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return "http://{}:{}/v2".format(host, port)
+
+    def __enter__(self) -> "MockServer":
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def add_dataset_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options of the synthetic dataset to *parser*."""
+    parser.add_argument("--dataset", help="Directory of a dataset written by benchmarks/dataset.py, served "
+                                          "instead of the options below.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--boards", type=int, default=10)
+    parser.add_argument("--items", type=int, default=200, help="Items per board.")
+    parser.add_argument("--columns", type=int, default=8, help="Columns per board.")
+    parser.add_argument("--logs", type=int, default=50, help="Activity logs per board.")
+    parser.add_argument("--updates", type=int, default=500)
+    parser.add_argument("--users", type=int, default=50)
+
+
+def make_dataset(args: argparse.Namespace):
+    if args.dataset:
+        return MappedDataset(args.dataset)
+    return SyntheticDataset(seed=args.seed, boards=args.boards, items_per_board=args.items,
+                            columns_per_board=args.columns, logs_per_board=args.logs,
+                            updates=args.updates, users=args.users)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Maximum random seconds added to the latency.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of HTTP 500 responses.")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of HTTP 429 responses.")
+    parser.add_argument("--retry-in-seconds", type=int, default=1)
+    parser.add_argument("--cursor-expiry-rate", type=float, default=0.0,
+                        help="Fraction of next_items_page requests failing with a CursorException.")
+    parser.add_argument("--cursor-ttl", type=float, default=60.0)
+    parser.add_argument("--complexity-budget", type=int, default=0, help="Complexity per minute (0: unlimited).")
+    add_dataset_arguments(parser)
+    args = parser.parse_args()
+
+    monday = MockMonday(make_dataset(args), latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                        rate_limit_rate=args.rate_limit_rate, cursor_expiry_rate=args.cursor_expiry_rate,
+                        cursor_ttl=args.cursor_ttl, retry_in_seconds=args.retry_in_seconds,
+                        complexity_budget=args.complexity_budget, seed=args.seed)
+    server = MockServer(monday, args.host, args.port)
+    print("Serving the mock Monday API on {} (base_url)".format(server.url))
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
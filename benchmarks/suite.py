@@ -0,0 +1,411 @@
+"""Benchmark suite of the tap's hot paths, with results stored as JSON.
+
+The benchmarks are:
+
+- ``graphql_query[stream]``: generating the GraphQL query of a stream from
+  its schema (the cached selection of the stream's plan is discarded first);
+- ``parse_response[stream]``: ``get_dot_path_value`` and ``parse_raw_records``
+  on a response of the mock server (``benchmarks/mock_server.py``);
+- ``transform[stream]``: ``CompiledTransformer.transform`` of a record of
+  each stream schema, taken from a mock server response when the mock serves
+  the stream and generated from the schema otherwise;
+- ``board_items_sync``: ``BoardItems.sync`` of a board against the mock
+  server, with a fraction of the cursors expiring so that the sync restarts;
+- ``end_to_end``: a sync of the tap in a subprocess against the mock server,
+  with the records per second and the peak RSS of the tap.
+
+Each run is written to ``benchmarks/results/<commit>.json`` (or
+``--output``), with the per-call timings (min, median, mean and standard
+deviation over the repeats) and the peak RSS of the suite. ``--compare``
+reports the differences between two result files and fails if the minimum
+time per call (the least noisy statistic) or the peak RSS of a benchmark grew
+by more than ``--threshold``:
+
+    python benchmarks/suite.py [--filter REGEX] [--quick] [--dataset DIR]
+    python benchmarks/suite.py --compare benchmarks/results/BASE.json benchmarks/results/NEW.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import re
+import resource
+import statistics
+import string
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+from unittest.mock import MagicMock, patch
+
+from dataset import BOARD_ID_BASE, ITEM_ID_BASE, MappedDataset, SyntheticDataset, timestamp
+from mock_server import MockMonday, MockServer
+from singer import metadata
+from singer.catalog import CatalogEntry, Schema
+from singer.transform import UNIX_MILLISECONDS_INTEGER_DATETIME_PARSING
+
+from tap_monday import codec
+from tap_monday.client import Client
+from tap_monday.schema import get_schemas
+from tap_monday.streams import STREAMS
+from tap_monday.transform import CompiledTransformer
+
+RESULTS_FORMAT = 1
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+END_TO_END_STREAMS = ["boards", "board_items", "board_columns", "board_groups", "board_views",
+                      "board_activity_logs", "updates", "users", "workspaces", "tags", "teams"]
+
+# (name, thunk) generators; a thunk runs one benchmark and returns its result.
+BENCHMARKS: List[Callable[["Context"], Iterator[Tuple[str, Callable[[], Dict]]]]] = []
+
+
+def benchmark(func):
+    BENCHMARKS.append(func)
+    return func
+
+
+def peak_rss_mb(usage) -> float:
+    """Return the peak RSS of a ``resource.getrusage`` result, in MB."""
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+    return usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def timed(func: Callable[[], Any], repeat: int) -> Dict:
+    """Time *func* like ``timeit``: the number of calls per repeat is chosen
+    so that a repeat takes at least 0.2s; return the seconds per call."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    timings = [elapsed / number for elapsed in timer.repeat(repeat=repeat, number=number)]
+    return {"seconds": {"min": min(timings), "median": statistics.median(timings),
+                        "mean": statistics.mean(timings),
+                        "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+                        "number": number, "repeat": repeat}}
+
+
+def sample_value(schema: Dict, rng: random.Random, depth: int = 0) -> Any:
+    """Return a value of a JSON schema, shaped like the values of the API."""
+    types = schema.get("type", [])
+    types = [types] if isinstance(types, str) else types
+    kind = next((item for item in types if item != "null"), "string")
+    if kind == "object":
+        return {key: sample_value(value, rng, depth + 1) for key, value in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [sample_value(schema.get("items", {}), rng, depth + 1) for _ in range(2 if depth < 3 else 0)]
+    if kind == "integer":
+        return rng.randrange(10 ** 6)
+    if kind == "number":
+        return rng.random() * 1000
+    if kind == "boolean":
+        return rng.random() < 0.5
+    if schema.get("format") == "date-time":
+        return timestamp(rng.uniform(0, 365 * 86400))
+    return "value {}".format(rng.randrange(10 ** 6))
+
+
+class Context:
+    """Shared state of the benchmarks: the dataset, the mock API and the
+    streams, built without a client."""
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.args = args
+        self.repeat = 3 if args.quick else 7
+        if args.dataset:
+            self.dataset = MappedDataset(args.dataset)
+        else:
+            self.dataset = SyntheticDataset(seed=args.seed, boards=args.boards, items_per_board=args.items)
+        self.schemas, self.field_metadata = get_schemas()
+        self.streams = {name: self.make_stream(name, self.offline_client()) for name in sorted(STREAMS)}
+        self._responses = {}
+
+    @staticmethod
+    def offline_client():
+        client = MagicMock()
+        client.config = {"start_date": "2020-01-01T00:00:00Z"}
+        return client
+
+    def catalog_entry(self, stream_name: str) -> CatalogEntry:
+        mdata = metadata.write(metadata.to_map(self.field_metadata[stream_name]), (), "selected", True)
+        return CatalogEntry(stream=stream_name, tap_stream_id=stream_name,
+                            schema=Schema.from_dict(self.schemas[stream_name]), metadata=metadata.to_list(mdata))
+
+    def make_stream(self, stream_name: str, client):
+        return STREAMS[stream_name](client, self.catalog_entry(stream_name))
+
+    def parent_id(self, stream) -> str:
+        """Return the id of the first parent record of a child stream."""
+        if getattr(stream, "parent", None) == "board_items":
+            return str(ITEM_ID_BASE)
+        return str(BOARD_ID_BASE)
+
+    def query(self, stream) -> str:
+        """Return the query of the first page of *stream*."""
+        values = {"limit": stream.page_size, "page": 1, "ids": self.parent_id(stream), "cursor": '""'}
+        query = stream.get_graphql_query(string.Formatter().vformat(stream.root_field or "", (), values))
+        return query + "}" * (query.count("{") - query.count("}"))
+
+    def response(self, stream_name: str) -> Any:
+        """Return the mock server response to the first page of a stream."""
+        if stream_name not in self._responses:
+            stream = self.streams[stream_name]
+            response = None
+            if stream.root_field:
+                status, response = MockMonday(self.dataset).handle(codec.dumps({"query": self.query(stream)}))
+                response = response if status == 200 and not response.get("errors") else None
+            self._responses[stream_name] = response
+        return self._responses[stream_name]
+
+    def parse(self, stream_name: str, response: Any) -> List[Dict]:
+        stream = self.streams[stream_name]
+        if hasattr(stream, "cursor"):
+            stream.cursor = None
+        return stream.parse_raw_records(stream.get_dot_path_value(response, stream.data_key))
+
+    def records(self, stream_name: str, count: int = 50) -> List[Dict]:
+        """Return raw records of a stream, as passed to the transformer."""
+        stream = self.streams[stream_name]
+        response = self.response(stream_name)
+        records = self.parse(stream_name, response)[:count] if response else []
+        if records:
+            parent = {"id": self.parent_id(stream)}
+            return [stream.modify_object(dict(record), parent) for record in records]
+        rng = random.Random(stream_name)
+        return [sample_value(stream.schema, rng) for _ in range(count)]
+
+
+@benchmark
+def graphql_query(context: Context):
+    for stream_name, stream in context.streams.items():
+        if not stream.root_field:
+            continue
+
+        def run(stream=stream):
+            stream._plan = None  # pylint: disable=protected-access
+            context.query(stream)
+
+        yield "graphql_query[{}]".format(stream_name), lambda run=run: timed(run, context.repeat)
+
+
+@benchmark
+def parse_response(context: Context):
+    for stream_name, stream in context.streams.items():
+        if not stream.root_field:
+            continue
+
+        def run(stream_name=stream_name):
+            response = context.response(stream_name)
+            if not response or not context.parse(stream_name, response):
+                return {"skipped": "the mock server does not serve this stream"}
+            result = timed(lambda: context.parse(stream_name, response), context.repeat)
+            result["records"] = len(context.parse(stream_name, response))
+            return result
+
+        yield "parse_response[{}]".format(stream_name), run
+
+
+@benchmark
+def transform(context: Context):
+    for stream_name, stream in context.streams.items():
+        def run(stream_name=stream_name, stream=stream):
+            records = context.records(stream_name)
+            transformer = CompiledTransformer(integer_datetime_fmt=UNIX_MILLISECONDS_INTEGER_DATETIME_PARSING)
+
+            def transform_records():
+                for record in records:
+                    transformer.transform(record, stream.schema, stream.metadata)
+
+            result = timed(transform_records, context.repeat)
+            for key, value in result["seconds"].items():
+                if isinstance(value, float):
+                    result["seconds"][key] = value / len(records)
+            result["records"] = len(records)
+            return result
+
+        yield "transform[{}]".format(stream_name), run
+
+
+@benchmark
+def board_items_sync(context: Context):
+    def run():
+        boards = min(context.dataset.board_count, 3)
+        monday = MockMonday(context.dataset, cursor_expiry_rate=context.args.cursor_expiry_rate,
+                            seed=context.args.seed)
+        written = []
+        with MockServer(monday) as server, Client({"api_token": "benchmark", "user_agent": "benchmark",
+                                                   "start_date": "2020-01-01T00:00:00Z",
+                                                   "base_url": server.url}) as client, \
+                patch("tap_monday.streams.board_items.write_record", lambda *args, **kwargs: written.append(1)), \
+                patch("tap_monday.streams.board_items.write_checkpoint"):
+            stream = context.make_stream("board_items", client)
+            transformer = CompiledTransformer(integer_datetime_fmt=UNIX_MILLISECONDS_INTEGER_DATETIME_PARSING)
+
+            def sync():
+                for board in range(boards):
+                    stream.sync({}, transformer, parent_obj={"id": str(BOARD_ID_BASE + board)})
+
+            # The records and restarts of a single sync, which also warms up
+            # the connection and the transformer.
+            sync()
+            records, cursor_expired = len(written), monday.stats["cursor_expired"]
+            result = timed(sync, context.repeat)
+        result["records"] = records
+        result["records_per_second"] = records / result["seconds"]["median"]
+        result["cursor_expired"] = cursor_expired
+        return result
+
+    yield "board_items_sync", run
+
+
+@benchmark
+def end_to_end(context: Context):
+    def run():
+        catalog = {"streams": [context.catalog_entry(name).to_dict() for name in END_TO_END_STREAMS]}
+        monday = MockMonday(context.dataset, seed=context.args.seed)
+        with tempfile.TemporaryDirectory() as directory, MockServer(monday) as server:
+            config_path = os.path.join(directory, "config.json")
+            catalog_path = os.path.join(directory, "catalog.json")
+            with open(config_path, "w") as config_file:
+                json.dump({"api_token": "benchmark", "user_agent": "benchmark", "start_date": "2020-01-01T00:00:00Z",
+                           "base_url": server.url}, config_file)
+            with open(catalog_path, "w") as catalog_file:
+                json.dump(catalog, catalog_file)
+
+            timings, records, peak_rss = [], 0, []
+            for _ in range(1 if context.args.quick else 3):
+                start = time.perf_counter()
+                process = subprocess.Popen(
+                    [sys.executable, "-c", "import tap_monday; tap_monday.main()",
+                     "--config", config_path, "--catalog", catalog_path],
+                    stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, cwd=ROOT_DIR)
+                records = sum(1 for line in process.stdout if line.startswith(b'{"type":"RECORD"')
+                              or line.startswith(b'{"type": "RECORD"'))
+                _, status, usage = os.wait4(process.pid, 0)
+                process.returncode = os.waitstatus_to_exitcode(status)
+                timings.append(time.perf_counter() - start)
+                if process.returncode:
+                    raise RuntimeError("The tap exited with status {}".format(process.returncode))
+                peak_rss.append(peak_rss_mb(usage))
+        return {"seconds": {"min": min(timings), "median": statistics.median(timings),
+                            "mean": statistics.mean(timings),
+                            "stdev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+                            "number": 1, "repeat": len(timings)},
+                "records": records, "records_per_second": records / statistics.median(timings),
+                "requests": monday.stats["requests"] // len(timings), "peak_rss_mb": max(peak_rss)}
+
+    yield "end_to_end", run
+
+
+def git_commit() -> Tuple[str, bool]:
+    """Return the commit of the working tree and whether it has changes."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True,
+                                check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT_DIR,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown", False
+    return commit, dirty
+
+
+def run_suite(args: argparse.Namespace) -> Dict:
+    context = Context(args)
+    pattern = re.compile(args.filter) if args.filter else None
+    commit, dirty = git_commit()
+    results = {
+        "format": RESULTS_FORMAT,
+        "commit": commit,
+        "dirty": dirty,
+        "date": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "codec": codec.BACKEND,
+        "dataset": args.dataset or {"boards": args.boards, "items_per_board": args.items, "seed": args.seed},
+        "benchmarks": {},
+    }
+    for generator in BENCHMARKS:
+        for name, thunk in generator(context):
+            if pattern and not pattern.search(name):
+                continue
+            result = results["benchmarks"][name] = thunk()
+            if "seconds" in result:
+                print("{:44} {:>12.3f} us".format(name, result["seconds"]["median"] * 1e6), flush=True)
+            else:
+                print("{:44} {:>15}".format(name, "skipped"), flush=True)
+    results["peak_rss_mb"] = peak_rss_mb(resource.getrusage(resource.RUSAGE_SELF))
+    return results
+
+
+def compare(base: Dict, new: Dict, threshold: float) -> List[str]:
+    """Print the changes between two result files; return the regressions."""
+    regressions = []
+    print("{:44} {:>12} {:>12} {:>8}".format("benchmark", "base", "new", "ratio"))
+    for name in sorted(set(base["benchmarks"]) & set(new["benchmarks"])):
+        for metric, unit, scale in (("seconds", "us", 1e6), ("peak_rss_mb", "MB", 1)):
+            before, after = base["benchmarks"][name].get(metric), new["benchmarks"][name].get(metric)
+            if before is None or after is None:
+                continue
+            if metric == "seconds":
+                before, after = before["min"], after["min"]
+            ratio = after / before if before else 1.0
+            flag = ""
+            if ratio > 1 + threshold:
+                flag = "  regression"
+                regressions.append(name)
+            elif ratio < 1 / (1 + threshold):
+                flag = "  improvement"
+            label = name if metric == "seconds" else "{} (peak RSS)".format(name)
+            print("{:44} {:>9.3f} {:2} {:>9.3f} {:2} {:>8.2f}{}".format(
+                label, before * scale, unit, after * scale, unit, ratio, flag))
+    for label, results, other in (("base", base, new), ("new", new, base)):
+        missing = set(results["benchmarks"]) - set(other["benchmarks"])
+        if missing:
+            print("{} benchmarks only in {}".format(len(missing), label))
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--filter", help="Only run the benchmarks whose name matches this regular expression.")
+    parser.add_argument("--quick", action="store_true", help="Fewer repeats, for a smoke run.")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<commit>.json).")
+    parser.add_argument("--dataset", help="Directory of a dataset written by benchmarks/dataset.py.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--boards", type=int, default=10, help="Boards of the synthetic dataset.")
+    parser.add_argument("--items", type=int, default=200, help="Items per board of the synthetic dataset.")
+    parser.add_argument("--cursor-expiry-rate", type=float, default=0.05,
+                        help="Fraction of expiring cursors in board_items_sync.")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"),
+                        help="Compare two result files instead of running the suite.")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Relative increase of a time or peak RSS reported as a regression.")
+    args = parser.parse_args()
+
+    if args.compare:
+        results = []
+        for path in args.compare:
+            with open(path) as results_file:
+                results.append(json.load(results_file))
+        regressions = compare(*results, threshold=args.threshold)
+        sys.exit(1 if regressions else 0)
+
+    # Silence the metrics the streams log for every page and record counter,
+    # and the warnings of the cursor expiry restarts.
+    logging.disable(logging.WARNING)
+    results = run_suite(args)
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, "{}{}.json".format(results["commit"][:12],
+                                                              "-dirty" if results["dirty"] else ""))
+    with open(output, "w") as results_file:
+        json.dump(results, results_file, indent=2, sort_keys=True)
+    print("Peak RSS: {:.1f} MB. Results written to {}".format(results["peak_rss_mb"], output))
+
+
+if __name__ == "__main__":
+    main()
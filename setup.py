@@ -21,7 +21,27 @@ setup(name="tap-monday",
               'pylint',
               'pytest',
               'ipdb',
-              'parameterized'
+              'parameterized',
+              'httpx[http2]',
+              'orjson',
+              'ijson',
+              'zstandard',
+              'pyarrow'
+          ],
+          'http2': [
+              'httpx[http2]==0.28.1'
+          ],
+          'orjson': [
+              'orjson>=3.8'
+          ],
+          'streaming': [
+              'ijson>=3.1'
+          ],
+          'zstd': [
+              'zstandard>=0.18'
+          ],
+          'parquet': [
+              'pyarrow>=10.0'
           ]
         },
       entry_points="""
@@ -30,7 +50,7 @@ setup(name="tap-monday",
       """,
       packages=find_packages(),
       package_data={
-          "tap_monday": ["schemas/*.json"],
+          "tap_monday": ["schemas/*.json", "schema_bundle.json"],
       },
       include_package_data=True,
       )
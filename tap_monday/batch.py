@@ -0,0 +1,146 @@
+"""Singer BATCH output.
+
+Instead of writing every record to stdout as a RECORD message, ``BatchSink``
+writes the records of each stream to compressed JSONL files (one record per
+line) in a local directory and emits a ``BATCH`` message referencing each
+file once it is complete::
+
+    {"type": "BATCH", "stream": "board_items",
+     "encoding": {"format": "jsonl", "compression": "gzip"},
+     "manifest": ["file:///data/board_items-20240131T120000-1a2b3c-000001.jsonl.gz"]}
+
+A file is complete when it holds ``batch_size`` records or when the sink is
+flushed, which happens before every STATE message other than the progress
+checkpoints of ``output.write_checkpoint()``; those are held back until the
+files open when they were written are complete. Files are written under a
+temporary name, fsynced and then renamed, so a BATCH message (and the STATE
+following it) only ever references fully written files.
+
+``zstd`` compression requires the optional ``zstandard`` package (``pip
+install tap-monday[zstd]``).
+"""
+import datetime
+import gzip
+import os
+import uuid
+from typing import Dict, List
+
+from tap_monday import codec
+from tap_monday.output import write_line
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DEFAULT_BATCH_SIZE = 100000
+COMPRESSIONS = {"gzip": ".jsonl.gz", "zstd": ".jsonl.zst"}
+
+
+class _BatchFile:
+    """A JSONL file being written for one stream."""
+
+    def __init__(self, path: str, compression: str) -> None:
+        self.path = path
+        self.part_path = path + ".part"
+        self.raw = open(self.part_path, "wb")
+        if compression == "zstd":
+            self.writer = zstandard.ZstdCompressor().stream_writer(self.raw, closefd=False)
+        else:
+            self.writer = gzip.GzipFile(fileobj=self.raw, mode="wb")
+        self.records = 0
+
+    def write(self, record_json: str) -> None:
+        self.writer.write(record_json.encode("utf-8") + b"\n")
+        self.records += 1
+
+    def finish(self) -> None:
+        """Close, fsync and move the file to its final name."""
+        self.writer.close()
+        self.raw.flush()
+        os.fsync(self.raw.fileno())
+        self.raw.close()
+        os.replace(self.part_path, self.path)
+
+    def discard(self) -> None:
+        self.writer.close()
+        self.raw.close()
+        os.remove(self.part_path)
+
+
+class BatchSink:
+    """Writes records to rotating compressed JSONL files and emits BATCH
+    messages referencing them.
+
+    Args:
+        directory (str): Directory the files are written to; created if missing.
+        compression (str): ``gzip`` or ``zstd``.
+        batch_size (int): Maximum number of records per file.
+    """
+
+    def __init__(self, directory: str, compression: str = "gzip", batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        if compression not in COMPRESSIONS:
+            raise ValueError("Unsupported batch compression '{}', expected one of {}.".format(
+                compression, ", ".join(sorted(COMPRESSIONS))))
+        if compression == "zstd" and zstandard is None:
+            raise ImportError("zstd batch compression requires the 'zstandard' package.")
+        self.directory = os.path.abspath(directory)
+        self.compression = compression
+        self.batch_size = batch_size
+        self.run_id = "{}-{}".format(datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%S"), uuid.uuid4().hex[:6])
+        self._files: Dict[str, _BatchFile] = {}
+        self._sequence = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def write_schema(self, stream_name: str, schema: Dict) -> None:
+        """JSONL files need no schema; the SCHEMA message describes them."""
+
+    def write_record(self, stream_name: str, record: Dict) -> None:
+        """Append a record to the current file of the stream."""
+        self.write_record_json(stream_name, codec.dumps(record))
+
+    def write_record_json(self, stream_name: str, record_json: str) -> None:
+        """Append a serialized record to the current file of the stream."""
+        batch_file = self._files.get(stream_name)
+        if batch_file is None:
+            self._sequence += 1
+            path = os.path.join(self.directory, "{}-{}-{:06d}{}".format(
+                stream_name, self.run_id, self._sequence, COMPRESSIONS[self.compression]))
+            batch_file = self._files[stream_name] = _BatchFile(path, self.compression)
+        batch_file.write(record_json)
+        if batch_file.records >= self.batch_size:
+            self._finish(stream_name)
+
+    def flush(self) -> None:
+        """Complete the files of all streams and emit their BATCH messages."""
+        for stream_name in list(self._files):
+            self._finish(stream_name)
+
+    def open_files(self) -> List[str]:
+        """Return the paths of the files not complete yet."""
+        return [batch_file.path for batch_file in self._files.values()]
+
+    def close(self) -> None:
+        """Remove incomplete files, e.g. after a failed sync."""
+        for batch_file in self._files.values():
+            batch_file.discard()
+        self._files = {}
+
+    def _finish(self, stream_name: str) -> None:
+        batch_file = self._files.pop(stream_name)
+        batch_file.finish()
+        self._fsync_directory()
+        write_line(codec.dumps({
+            "type": "BATCH",
+            "stream": stream_name,
+            "encoding": {"format": "jsonl", "compression": self.compression},
+            "manifest": ["file://" + batch_file.path],
+        }))
+
+    def _fsync_directory(self) -> None:
+        """Persist the rename of a completed file."""
+        fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
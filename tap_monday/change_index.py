@@ -0,0 +1,222 @@
+"""Change detection for streams that return unchanged records.
+
+Full-table streams (``users``, ``workspaces``, ``tags``...) return all their
+records on every sync, although few of them change between syncs. With the
+``change_detection`` config option a ``ChangeIndex`` keeps a digest of each
+record written, by primary key, and the sync only writes the records whose
+digest is new or differs from the one of the previous sync. With
+``change_detection_deletions`` the records missing from the API response are
+written as deletion records, holding their key and ``_sdc_deleted_at``.
+
+The digests are 8 bytes of a BLAKE2b hash of the transformed record, so they
+change when the selected fields of the stream change, and all records are
+then written once.
+
+Child streams holding a collection of their parent record (the columns,
+groups and views of a board) keep one digest per parent instead, of the whole
+collection; see ``CollectionChangeMixin``.
+
+``board_items`` can detect deleted items by enumerating the ids of the items
+of each synced board and comparing them with the ids of the previous sync.
+The ids are stored as an id snapshot: the sorted ids, delta-encoded as 64-bit
+integers and compressed, which takes a few bytes per id.
+
+An ``IndexStore`` keeps the digests between syncs, in a file of the
+``change_index_dir`` directory (default: ``.tap_monday_index`` in the working
+directory), and the bookmark of the stream only holds the name of the file,
+so the digests are not copied into every STATE message. Each sync writes a
+new file, so the file referenced by the state the target last committed is
+always intact. The index is saved once the
+stream is complete, and the state is written after the records, so a sync
+that fails writes the changed records again on the next run.
+"""
+import base64
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+import zlib
+from array import array
+from itertools import accumulate
+from typing import Any, Dict, Iterable, List, Optional
+
+from singer import get_logger, utils
+
+from tap_monday import codec
+
+LOGGER = get_logger()
+
+DIGEST_SIZE = 8
+INDEX_FORMAT = 1
+DEFAULT_INDEX_DIR = ".tap_monday_index"
+DELETED_AT = "_sdc_deleted_at"
+DELETED_AT_SCHEMA = {"type": ["null", "string"], "format": "date-time"}
+
+
+def record_digest(record: Dict) -> str:
+    """Return the digest of a record, independent of the order of its keys."""
+    canonical = json.dumps(record, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=DIGEST_SIZE).hexdigest()
+
+
+def collection_digest(records: Iterable[Dict], excluded_fields: Iterable[str] = ()) -> str:
+    """Return the digest of a collection of records, independent of their
+    order, ignoring *excluded_fields*."""
+    excluded_fields = set(excluded_fields)
+    digests = sorted(
+        record_digest({key: value for key, value in record.items() if key not in excluded_fields})
+        for record in records
+    )
+    return hashlib.blake2b("".join(digests).encode("ascii"), digest_size=DIGEST_SIZE).hexdigest()
+
+
+def record_key(record: Dict, key_properties: List[str]) -> Optional[str]:
+    """Return the primary key of a record as a string, or None if it has none.
+
+    A single key property is kept as is; composite keys are encoded as a
+    JSON array, which ``ChangeIndex.deletion_record`` decodes again.
+    """
+    values = [record.get(key) for key in key_properties]
+    if not values or any(value is None for value in values):
+        return None
+    if len(values) == 1:
+        return str(values[0])
+    return codec.dumps(values)
+
+
+def encode_ids(ids: Iterable) -> str:
+    """Return the id snapshot of numeric ids; raises ValueError for other ids."""
+    keys = sorted({int(record_id) for record_id in ids})
+    deltas = array("q", (key - previous for previous, key in zip([0] + keys, keys)))
+    if sys.byteorder == "big":
+        deltas.byteswap()
+    return base64.b64encode(zlib.compress(deltas.tobytes())).decode("ascii")
+
+
+def decode_ids(snapshot: str) -> array:
+    """Return the sorted ids of an id snapshot."""
+    deltas = array("q")
+    deltas.frombytes(zlib.decompress(base64.b64decode(snapshot)))
+    if sys.byteorder == "big":
+        deltas.byteswap()
+    return array("q", accumulate(deltas))
+
+
+class ChangeIndex:
+    """Digests of the records of a stream, by primary key.
+
+    Args:
+        key_properties (list): Key properties of the stream.
+        digests (dict): Digests of the records written by the previous sync.
+    """
+
+    def __init__(self, key_properties: List[str], digests: Optional[Dict[str, str]] = None) -> None:
+        self.key_properties = list(key_properties)
+        self.previous = digests or {}
+        self.digests = {}
+        self.unchanged = 0
+
+    def is_changed(self, record: Dict) -> bool:
+        """Record the digest of a transformed record; return True if it is
+        new or changed since the previous sync."""
+        key = record_key(record, self.key_properties)
+        if key is None:
+            return True
+        digest = self.digests[key] = record_digest(record)
+        if self.previous.get(key) == digest:
+            self.unchanged += 1
+            return False
+        return True
+
+    def deleted_keys(self) -> List[str]:
+        """Return the keys of the previous sync that were not seen since."""
+        return [key for key in self.previous if key not in self.digests]
+
+    def deletion_record(self, key: str, deleted_at: str = None) -> Dict:
+        """Return the deletion record of a key returned by ``deleted_keys``."""
+        values = [key] if len(self.key_properties) == 1 else codec.loads(key)
+        record = dict(zip(self.key_properties, values))
+        record[DELETED_AT] = deleted_at or utils.strftime(utils.now())
+        return record
+
+
+class IndexStore:
+    """Keeps the digests of each stream between syncs in files of a
+    directory; the bookmark of the stream holds the name of its file.
+
+    Args:
+        directory (str): Directory of the index files; created if missing.
+        kind (str): Name of the index, for streams keeping several kinds of
+            index (default: the record digests).
+    """
+
+    STATE_KEY = "record_digests"
+    FILE_KEY = "record_digests_file"
+
+    def __init__(self, directory: str = DEFAULT_INDEX_DIR, kind: str = None) -> None:
+        self.directory = directory
+        self.kind = kind
+        self.state_key = kind or self.STATE_KEY
+        self.file_key = "{}_file".format(kind) if kind else self.FILE_KEY
+
+    @classmethod
+    def from_config(cls, config: Dict, kind: str = None) -> "IndexStore":
+        """Return the store configured by ``change_index_dir``."""
+        return cls(config.get("change_index_dir") or DEFAULT_INDEX_DIR, kind)
+
+    def load(self, state: Dict, stream_name: str) -> Dict[str, Any]:
+        """Return the digests saved by the last sync of a stream."""
+        bookmark = state.get("bookmarks", {}).get(stream_name, {})
+        file_name = bookmark.get(self.file_key)
+        if not file_name:
+            # Digests stored in state by earlier versions of the tap.
+            return dict(bookmark.get(self.state_key) or {})
+        path = os.path.join(self.directory, file_name)
+        try:
+            with open(path, "rb") as index_file:
+                entry = codec.loads(index_file.read())
+        except FileNotFoundError:
+            LOGGER.warning("Change index %s of stream %s is missing; all its records are written.", path, stream_name)
+            return {}
+        except Exception as err:
+            LOGGER.warning("Ignoring unreadable change index %s: %s", path, err)
+            return {}
+        if not isinstance(entry, dict) or entry.get("format") != INDEX_FORMAT or entry.get("stream") != stream_name:
+            return {}
+        return entry["digests"]
+
+    def save(self, state: Dict, stream_name: str, digests: Dict[str, Any]) -> None:
+        """Save the digests of a stream; the state must be written afterwards."""
+        bookmark = state.setdefault("bookmarks", {}).setdefault(stream_name, {})
+        os.makedirs(self.directory, exist_ok=True)
+        previous = bookmark.get(self.file_key)
+        file_name = "{}-{}.json".format(self._file_stem(stream_name), time.time_ns())
+        entry = {"format": INDEX_FORMAT, "stream": stream_name, "digests": digests}
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as index_file:
+                index_file.write(codec.dumps(entry).encode("utf-8"))
+            os.replace(temp_path, os.path.join(self.directory, file_name))
+        except BaseException:
+            os.remove(temp_path)
+            raise
+        bookmark[self.file_key] = file_name
+        bookmark.pop(self.state_key, None)
+        # The previous file is kept until the next sync, in case the target
+        # does not commit the state referencing the new one.
+        self._remove_files(stream_name, keep=(file_name, previous))
+
+    def _file_stem(self, stream_name: str) -> str:
+        return "{}-{}".format(stream_name, self.kind) if self.kind else stream_name
+
+    def _remove_files(self, stream_name: str, keep: Iterable[str]) -> None:
+        pattern = re.compile(r"{}-\d+\.json$".format(re.escape(self._file_stem(stream_name))))
+        for file_name in os.listdir(self.directory):
+            if pattern.match(file_name) and file_name not in keep:
+                try:
+                    os.remove(os.path.join(self.directory, file_name))
+                except FileNotFoundError:
+                    pass
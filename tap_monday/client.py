@@ -1,77 +1,201 @@
-from typing import Any, Dict, Mapping, Optional, Tuple
-import json
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Generator, Iterator, List, Mapping, Optional, Tuple
+import re
+import socket
+import time
 
 import backoff
 import requests
 from requests import session
-from requests.exceptions import Timeout, ConnectionError, ChunkedEncodingError
+from requests.adapters import HTTPAdapter
+from requests.exceptions import Timeout, ConnectionError, ChunkedEncodingError, RequestException
+from urllib3.connection import HTTPConnection
 
 from singer import get_logger, metrics
 
+from tap_monday import codec, http2, output, streaming
+from tap_monday.complexity import parse_query
 from tap_monday.exceptions import (
     ERROR_CODE_EXCEPTION_MAPPING,
+    GRAPHQL_ERROR_CODE_EXCEPTION_MAPPING,
+    MondayBackoffError,
     MondayError,
     MondayCursorExpiredError,
-    MondayForbiddenError,
-    MondayGraphQLInternalError,
+    MondayQueryComplexityError,
     MondayRateLimitError,
     MondayInternalServerError,
-    MondayServiceUnavailableError)
+    MondayServiceUnavailableError,
+    MondayUnauthorizedError)
 
 LOGGER = get_logger()
+BASE_URL = "https://api.monday.com/v2"
 REQUEST_TIMEOUT = 300
+POOL_CONNECTIONS = 10
+POOL_MAXSIZE = 10
+KEEPALIVE_IDLE = 60
+KEEPALIVE_INTERVAL = 30
+KEEPALIVE_COUNT = 4
+MAX_STREAM_TRIES = 5
 
-def raise_for_error(response: requests.Response) -> None:
+# Errors that invalidate the whole response, so they are raised even when the
+# caller accepts partial data.
+WHOLE_RESPONSE_ERRORS = (
+    MondayBackoffError,
+    MondayCursorExpiredError,
+    MondayQueryComplexityError,
+    MondayUnauthorizedError,
+)
+
+_PROBE_QUERY_RE = re.compile(r"^\s*query\s*\{(.*)\}\s*$", re.DOTALL)
+
+
+def get_keepalive_socket_options():
+    """Returns the socket options enabling TCP keep-alive on pooled connections,
+    so that idle connections survive between pages instead of being dropped
+    by intermediaries and re-established with a new TLS handshake.
+    """
+    options = list(HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    # The probe timings are only tunable on some platforms.
+    for name, value in (("TCP_KEEPIDLE", KEEPALIVE_IDLE),
+                        ("TCP_KEEPINTVL", KEEPALIVE_INTERVAL),
+                        ("TCP_KEEPCNT", KEEPALIVE_COUNT)):
+        if hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+    return options
+
+
+class PoolingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies custom socket options to its connection pools."""
+
+    def __init__(self, socket_options=None, **kwargs):
+        # Set before super().__init__, which builds the pool manager.
+        self.socket_options = socket_options
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.socket_options is not None:
+            kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+    def pool_stats(self) -> Dict[str, int]:
+        """Returns the number of connections opened and requests sent by the
+        pools of this adapter."""
+        pools = self.poolmanager.pools
+        created = requests_sent = 0
+        for key in pools.keys():
+            pool = pools[key]
+            created += pool.num_connections
+            requests_sent += pool.num_requests
+        return {
+            "connections_created": created,
+            "connections_reused": max(requests_sent - created, 0),
+            "requests": requests_sent,
+        }
+
+def decode_response(response: requests.Response) -> Any:
+    """Decodes the JSON body of a response, returning {} if it is not JSON."""
+    try:
+        return codec.loads(response.content)
+    except Exception:
+        return {}
+
+
+def get_response_error(response: requests.Response, response_json: Any) -> Optional[MondayError]:
+    """Classifies a response from its status code and its decoded body.
+
+    Returns the exception describing the error carried by the response, or
+    None when the response is successful.
+    """
+    if not isinstance(response_json, dict):
+        response_json = {}
+    if response.status_code in [200, 201, 204] and "errors" not in response_json:
+        return None
+
+    error_messages = response_json.get("errors") or []
+    if error_messages:
+        # Scan *all* errors; CursorException may not be the first entry.
+        # Use a default of None so the absence of CursorException is handled
+        # gracefully instead of raising StopIteration.
+        cursor_error = next(
+            (e for e in error_messages
+             if e.get("extensions", {}).get("code") == "CursorException"),
+            None,
+        )
+        if cursor_error:
+            message = "HTTP-error-code: {}, Error: {}, Error Extensions: {}".format(
+                response.status_code,
+                cursor_error.get("message"),
+                "CursorException",
+            )
+            return MondayCursorExpiredError(message, response, response_json)
+        # Non-cursor GraphQL error — fall through to generic handling.
+        error = error_messages[0].get("message", "Exception occurred")
+        error_extension = error_messages[0].get("extensions", {}).get("code", "Error Code")
+        message = "HTTP-error-code: {}, Error: {}, Error Extensions: {}".format(
+            response.status_code, error, error_extension)
+    else:
+        message = "HTTP-error-code: {}, Error: {}".format(
+            response.status_code,
+            response_json.get("message", ERROR_CODE_EXCEPTION_MAPPING.get(
+                response.status_code, {}).get("message", "Unknown Error")))
+    exc = ERROR_CODE_EXCEPTION_MAPPING.get(
+        response.status_code, {}).get("raise_exception", MondayError)
+    # Monday returns HTTP 200 for GraphQL-level errors. Map known extension
+    # codes to the appropriate exception so callers can handle them.
+    if response.status_code == 200 and error_messages:
+        error_code = error_messages[0].get("extensions", {}).get("code", "")
+        exc = GRAPHQL_ERROR_CODE_EXCEPTION_MAPPING.get(error_code, exc)
+    return exc(message, response, response_json)
+
+
+def raise_for_error(response: requests.Response, response_json: Any = None) -> None:
     """Raises the associated response exception. Takes in a response object,
     checks the status code, and throws the associated exception based on the
     status code.
 
     :param resp: requests.Response object
+    :param response_json: the already decoded body of the response, decoded
+        from the response when not given
     """
+    if response_json is None:
+        response_json = decode_response(response)
+    error = get_response_error(response, response_json)
+    if error is not None:
+        raise error from None
+
+
+def is_partial_response(response: requests.Response, response_json: Any, error: MondayError) -> bool:
+    """Returns True when a response carrying *error* still holds usable data:
+    a HTTP-200 GraphQL response with both ``data`` and ``errors`` whose error
+    only affects part of the selection. Errors that invalidate the whole
+    request (rate limits, cursor expiry, complexity, authentication) never
+    count as partial data.
+    """
+    if response.status_code != 200 or isinstance(error, WHOLE_RESPONSE_ERRORS):
+        return False
+    data = response_json.get("data") if isinstance(response_json, dict) else None
+    return isinstance(data, dict) and any(value is not None for value in data.values())
+
+def get_probe_selection(query: str) -> Optional[Tuple[str, str]]:
+    """Returns the root field name and the selection of a probe query
+    selecting a single root field (``query { boards { __typename } }``), or
+    None when the query cannot be combined with others."""
+    match = _PROBE_QUERY_RE.match(query)
+    fields = parse_query(query)
+    if not match or len(fields) != 1:
+        return None
+    return fields[0].name, match.group(1).strip()
+
+
+def get_probe_query(body: Any) -> Optional[str]:
+    """Returns the query of a request body, or None."""
     try:
-        response_json = response.json()
+        payload = codec.loads(body)
     except Exception:
-        response_json = {}
-    if response.status_code not in [200, 201, 204] or "errors" in response_json:
-        if response_json.get("errors"):
-            error_messages = response_json.get("errors", [])
-            # Scan *all* errors; CursorException may not be the first entry.
-            # Use a default of None so the absence of CursorException is handled
-            # gracefully instead of raising StopIteration.
-            cursor_error = next(
-                (e for e in error_messages
-                 if e.get("extensions", {}).get("code") == "CursorException"),
-                None,
-            )
-            if cursor_error:
-                message = "HTTP-error-code: {}, Error: {}, Error Extensions: {}".format(
-                    response.status_code,
-                    cursor_error.get("message"),
-                    "CursorException",
-                )
-                raise MondayCursorExpiredError(message, response) from None
-            # Non-cursor GraphQL error — fall through to generic handling.
-            error = error_messages[0].get("message", "Exception occurred")
-            error_extension = error_messages[0].get("extensions", {}).get("code", "Error Code")
-            message = "HTTP-error-code: {}, Error: {}, Error Extensions: {}".format(
-                response.status_code, error, error_extension)
-        else:
-            message = "HTTP-error-code: {}, Error: {}".format(
-                response.status_code,
-                response_json.get("message", ERROR_CODE_EXCEPTION_MAPPING.get(
-                    response.status_code, {}).get("message", "Unknown Error")))
-        exc = ERROR_CODE_EXCEPTION_MAPPING.get(
-            response.status_code, {}).get("raise_exception", MondayError)
-        # Monday returns HTTP 200 for GraphQL-level errors. Map known extension
-        # codes to the appropriate exception so callers can handle them.
-        if response.status_code == 200 and response_json.get("errors"):
-            error_code = response_json["errors"][0].get("extensions", {}).get("code", "")
-            _GRAPHQL_ERROR_CODE_MAPPING = {
-                "UserUnauthorizedException": MondayForbiddenError,
-                "INTERNAL_SERVER_ERROR": MondayGraphQLInternalError,
-            }
-            exc = _GRAPHQL_ERROR_CODE_MAPPING.get(error_code, exc)
-        raise exc(message, response) from None
+        return None
+    return payload.get("query") if isinstance(payload, dict) else None
 
 def get_retry_after(exception_info):
     """Returns the retry_after value from RateLimitError exception.
@@ -98,26 +222,76 @@ class Client:
 
     def __init__(self, config: Mapping[str, Any]) -> None:
         self.config = config
-        self._session = session()
-        self.base_url = "https://api.monday.com/v2"
+        self.base_url = config.get("base_url") or BASE_URL
         self.api_version = "2025-07"
 
         config_request_timeout = config.get("request_timeout")
         self.request_timeout = float(config_request_timeout) if config_request_timeout else REQUEST_TIMEOUT
 
+        pool_maxsize = int(config.get("pool_maxsize") or POOL_MAXSIZE)
+        self._adapter = None
+        # Outcomes of combined probes, by probe query (see combined_probes).
+        self._probe_outcomes: Dict[str, Tuple[Any, Optional[MondayError]]] = {}
+        if config.get("http2") and http2.is_available():
+            self._session = http2.Http2Session(max_connections=pool_maxsize)
+        else:
+            if config.get("http2"):
+                LOGGER.warning("HTTP/2 was requested but 'httpx[http2]' is not installed, using HTTP/1.1.")
+            self._adapter = PoolingHTTPAdapter(
+                socket_options=get_keepalive_socket_options() if config.get("tcp_keepalive", True) else None,
+                pool_connections=int(config.get("pool_connections") or POOL_CONNECTIONS),
+                pool_maxsize=pool_maxsize,
+            )
+            self._session = session()
+            self._session.mount("https://", self._adapter)
+            self._session.mount("http://", self._adapter)
+
     def __enter__(self):
+        self.warm_up(int(self.config.get("warmup_connections") or 0))
         return self
 
     def __exit__(self, exception_type, exception_value, traceback):
+        self.log_pool_stats()
         self._session.close()
 
+    def warm_up(self, connections: int) -> None:
+        """Open *connections* pooled connections to the API host ahead of the
+        first request, so that TCP and TLS handshakes are not paid lazily by
+        the first request of each stream. Failures are logged and ignored;
+        the connections are simply opened on demand instead.
+        """
+        if connections <= 0:
+            return
+
+        def open_connection(_):
+            try:
+                self._session.request("HEAD", self.base_url, timeout=self.request_timeout).close()
+            except RequestException as err:
+                LOGGER.warning("Connection warm-up failed: %s", err)
+
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            list(executor.map(open_connection, range(connections)))
+        LOGGER.info("Warmed up %s connection(s) to %s", connections, self.base_url)
+
+    def pool_stats(self) -> Dict[str, int]:
+        """Returns connection pool statistics (connections created and reused)."""
+        if self._adapter is None:
+            return self._session.pool_stats()
+        return self._adapter.pool_stats()
+
+    def log_pool_stats(self) -> None:
+        """Emit the connection pool statistics as singer counter metrics."""
+        stats = self.pool_stats()
+        for name in ("connections_created", "connections_reused"):
+            metrics.log(LOGGER, metrics.Point("counter", "http_" + name, stats[name], {"endpoint": self.base_url}))
+
     def check_access(self):
         """Validate the API token by making a lightweight authenticated request.
 
         Raises MondayUnauthorizedError (401) or MondayForbiddenError (403) if
         the token is invalid or lacks required permissions.
         """
-        body = json.dumps({"query": "query { me { id } }"})
+        body = codec.dumps({"query": "query { me { id } }"})
         self.make_request("POST", self.base_url, body=body)
 
     @property
@@ -146,17 +320,23 @@ class Client:
         params: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, Any]] = None,
         body: Optional[Dict[str, Any]] = None,
-        path: Optional[str] = None
+        path: Optional[str] = None,
+        allow_partial: bool = False
     ) -> Any:
         """
         Sends an HTTP request to the specified API endpoint.
+
+        With ``allow_partial``, a GraphQL response holding both ``data`` and
+        ``errors`` is returned as is (errors included) instead of raising, so
+        the caller can keep the data that was resolved.
         """
         params = params or {}
         headers = headers or {}
         body = body or {}
         endpoint = endpoint or f"{self.base_url}/{path}"
         headers, params = self.authenticate(headers, params)
-        return self.__make_request(method, endpoint, headers=headers, params=params, data=body, timeout=self.request_timeout)
+        return self.__make_request(method, endpoint, headers=headers, params=params, data=body,
+                                   timeout=self.request_timeout, allow_partial=allow_partial)
 
     def probe_request(
         self,
@@ -165,9 +345,19 @@ class Client:
         params: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, Any]] = None,
         body: Optional[Any] = None,
+        allow_partial: bool = False,
     ) -> Any:
         """Single-shot request with no backoff or retry — intended for access
-        probes during discovery where retrying is not appropriate."""
+        probes during discovery where retrying is not appropriate.
+
+        Within ``combined_probes``, a probe that was already answered by the
+        combined request returns (or raises) its outcome without a request."""
+        outcome = self._probe_outcomes.pop(get_probe_query(body), None) if self._probe_outcomes else None
+        if outcome is not None:
+            response_json, error = outcome
+            if error is not None:
+                raise error
+            return response_json
         params = params or {}
         headers = headers or {}
         body = body or {}
@@ -177,8 +367,179 @@ class Client:
             headers=headers, params=params, data=body,
             timeout=self.request_timeout,
         )
-        raise_for_error(response)
-        return response.json()
+        return self._handle_response(response, allow_partial)
+
+    @contextmanager
+    def combined_probes(
+        self,
+        queries: List[str],
+        method: str = "POST",
+        endpoint: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, Any]] = None,
+    ) -> Iterator[None]:
+        """Sends the probe *queries* as a single request, each root field
+        under its own alias, and answers the ``probe_request`` calls sending
+        them within the block from its response. GraphQL errors are
+        attributed to a probe by the alias at the start of their ``path``.
+
+        When the combined request fails as a whole (HTTP error, rate limit,
+        error without a path), the probes are sent one by one as usual.
+        """
+        self._probe_outcomes = self._send_combined_probes(
+            queries, method, endpoint or self.base_url, params, headers)
+        try:
+            yield
+        finally:
+            self._probe_outcomes = {}
+
+    def _send_combined_probes(self, queries, method, endpoint, params, headers) -> Dict:
+        probes = {}
+        for query in dict.fromkeys(queries):
+            selection = get_probe_selection(query)
+            if selection is not None:
+                probes["probe_{}".format(len(probes))] = (query, selection)
+        if len(probes) < 2:
+            return {}
+
+        body = codec.dumps({"query": "query { " + " ".join(
+            "{}: {}".format(alias, selection) for alias, (_, (_, selection)) in probes.items()) + " }"})
+        headers, params = self.authenticate(headers or {}, params or {})
+        try:
+            response = self._session.request(
+                method.upper(), endpoint,
+                headers=headers, params=params, data=body,
+                timeout=self.request_timeout,
+            )
+        except RequestException as err:
+            LOGGER.warning("Combined access probe failed, probing each field separately: %s", err)
+            return {}
+        response_json = decode_response(response)
+        error = get_response_error(response, response_json)
+        errors = (response_json.get("errors") if isinstance(response_json, dict) else None) or []
+        if error is not None and (
+                response.status_code != 200 or isinstance(error, WHOLE_RESPONSE_ERRORS)
+                or any(not isinstance(e, dict) or not e.get("path") or e["path"][0] not in probes
+                       for e in errors)):
+            LOGGER.warning("Combined access probe failed, probing each field separately: %s", error)
+            return {}
+
+        data = (response_json.get("data") if isinstance(response_json, dict) else None) or {}
+        outcomes = {}
+        for alias, (query, (root_field, _)) in probes.items():
+            probe_json = {"data": {root_field: data.get(alias)}}
+            probe_errors = [e for e in errors if e["path"][0] == alias]
+            if probe_errors:
+                probe_json["errors"] = [dict(e, path=[root_field] + list(e["path"][1:])) for e in probe_errors]
+            outcomes[query] = (probe_json, get_response_error(response, probe_json) if probe_errors else None)
+        LOGGER.info("Sent %s access probes in a single request.", len(outcomes))
+        return outcomes
+
+    @staticmethod
+    def _handle_response(response: requests.Response, allow_partial: bool = False) -> Any:
+        """Decodes the response body once and raises the exception matching
+        its error, unless the error is partial and ``allow_partial`` is set."""
+        response_json = decode_response(response)
+        error = get_response_error(response, response_json)
+        if error is not None and not (allow_partial and is_partial_response(response, response_json, error)):
+            raise error from None
+        return response_json
+
+    def stream_request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, Any]] = None,
+        body: Optional[Any] = None,
+        path: Optional[str] = None,
+        page_prefix: str = "data",
+        items_key: str = "items",
+        allow_partial: bool = False,
+    ) -> Generator[Dict, None, streaming.PageResult]:
+        """
+        Sends a request and yields the items of the page found at
+        *page_prefix* while the response body is still being downloaded
+        (see ``tap_monday.streaming.iter_page_items``).
+
+        Returns (as the generator's return value) the scalar fields of the
+        page, e.g. its ``cursor``, and the GraphQL errors that were accepted
+        as partial data, or None.
+
+        HTTP errors are retried like in ``make_request``. GraphQL errors are
+        only known once the whole body was read; a rate limit reported
+        before any item was yielded is retried, any other error is raised.
+        """
+        params = params or {}
+        headers = headers or {}
+        body = body or {}
+        endpoint = endpoint or f"{self.base_url}/{path}"
+        headers, params = self.authenticate(headers, params)
+        for attempt in range(1, MAX_STREAM_TRIES + 1):
+            response = self.__open_stream(method, endpoint, headers=headers, params=params, data=body,
+                                          timeout=self.request_timeout, allow_partial=allow_partial)
+            items_yielded = 0
+            page, errors = {}, None
+            try:
+                items = streaming.iter_page_items(
+                    streaming.iter_response_chunks(response), page_prefix, items_key)
+                while True:
+                    try:
+                        item = next(items)
+                    except StopIteration as stop:
+                        page, errors = stop.value
+                        break
+                    items_yielded += 1
+                    yield item
+            finally:
+                response.close()
+
+            if not errors:
+                return page, None
+            response_json = {"data": {"page": page} if page or items_yielded else None, "errors": errors}
+            error = get_response_error(response, response_json)
+            if allow_partial and is_partial_response(response, response_json, error):
+                return page, errors
+            if isinstance(error, MondayRateLimitError) and not items_yielded and attempt < MAX_STREAM_TRIES:
+                time.sleep(get_retry_after(error))
+                continue
+            raise error from None
+
+    @backoff.on_exception(
+        wait_gen=backoff.expo,
+        exception=(
+            ConnectionResetError,
+            ConnectionError,
+            ChunkedEncodingError,
+            Timeout,
+            MondayInternalServerError,
+            MondayServiceUnavailableError,
+        ),
+        max_tries=5,
+        factor=2,
+    )
+    @backoff.on_exception(
+        backoff.runtime,
+        exception=(
+            MondayRateLimitError,
+        ),
+        max_tries=5,
+        value=get_retry_after,
+        jitter=None,
+    )
+    def __open_stream(self, method: str, endpoint: str, **kwargs):
+        """
+        Sends a request with a streamed response body and returns the
+        response once its headers are received. Responses with an error
+        status are read in full and raise their exception.
+        """
+        allow_partial = kwargs.pop("allow_partial", False)
+        output.flush_if_due()
+        with metrics.http_request_timer(endpoint):
+            response = self._session.request(method.upper(), endpoint, stream=True, **kwargs)
+        if response.status_code != 200:
+            self._handle_response(response, allow_partial)
+        return response
 
     @backoff.on_exception(
         wait_gen=backoff.expo,
@@ -211,10 +572,13 @@ class Client:
             params (dict): A mapping for url params eg: ?name=Avery&age=3
             headers (dict): A mapping for the headers that need to be sent
             body (dict): only applicable to post request, body of the request
+            allow_partial (bool): return responses with partial data and errors
 
         Returns:
             Dict,List,None: Returns a `Json Parsed` HTTP Response or None if exception
         """
+        allow_partial = kwargs.pop("allow_partial", False)
+        output.flush_if_due()
         with metrics.http_request_timer(endpoint) as timer:
             method = method.upper()
             if method not in ("GET", "POST"):
@@ -223,7 +587,7 @@ class Client:
             if method == "GET":
                 kwargs.pop("data", None)
             response = self._session.request(method, endpoint, **kwargs)
-            raise_for_error(response)
+            response_json = self._handle_response(response, allow_partial)
 
-        return response.json()
+        return response_json
 
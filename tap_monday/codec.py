@@ -0,0 +1,43 @@
+"""JSON encoding and decoding used on the tap's hot paths.
+
+Request bodies, API responses and the Singer messages written to stdout are
+all JSON. When the optional ``orjson`` package is installed it is used for
+these conversions, otherwise the standard library ``json`` module is used.
+Values ``orjson`` cannot encode natively (e.g. ``Decimal``) are encoded with
+``simplejson``, the encoder singer-python itself uses for messages.
+"""
+import json
+from typing import Any, Union
+
+import simplejson
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = "orjson" if orjson is not None else "json"
+
+
+def _dumps_fallback(obj: Any) -> str:
+    return simplejson.dumps(obj, use_decimal=True, ensure_ascii=False, separators=(",", ":"))
+
+
+def dumps(obj: Any) -> str:
+    """Serialize *obj* to a compact JSON string."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode("utf-8")  # pylint: disable=no-member
+        except TypeError:
+            return _dumps_fallback(obj)
+    try:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+    except TypeError:
+        return _dumps_fallback(obj)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Deserialize a JSON document from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)  # pylint: disable=no-member
+    return json.loads(data)
@@ -0,0 +1,235 @@
+"""Offline estimation of Monday.com GraphQL query complexity.
+
+Monday rejects any query whose complexity exceeds a per-query ceiling. The
+cost of a query grows with every field that is selected and is multiplied by
+the size of each list it is nested in, so wide schemas combined with a large
+``limit`` (or a long ``ids`` batch) can exceed the ceiling. The helpers in this
+module parse the queries produced by ``BaseStream.get_graphql_query`` and
+estimate their complexity locally, so a stream can choose the largest safe
+page or id-batch size before a request is sent.
+
+Run ``python -m tap_monday.complexity_report`` for a per-stream report.
+"""
+import re
+import string
+from typing import Any, Callable, Dict, List, Optional
+
+from singer import get_logger
+
+LOGGER = get_logger()
+
+# Maximum complexity Monday accepts for a single query.
+MAX_QUERY_COMPLEXITY = 5000000
+
+# Number of elements assumed for nested lists that are not bounded by a
+# ``limit`` or ``ids`` argument (e.g. ``column_values`` or ``subscribers``).
+DEFAULT_LIST_SIZE = 25
+
+# Known nested lists whose typical size differs from DEFAULT_LIST_SIZE.
+NESTED_LIST_SIZES = {
+    "column_values": 50,
+}
+
+_TOKEN_RE = re.compile(r'\s*(?:(\{)|(\})|(\([^)]*\))|([A-Za-z_][A-Za-z0-9_]*)|(\S))')
+_ARGUMENT_RE = re.compile(r'(\w+)\s*:\s*(\[[^\]]*\]|"[^"]*"|[^,\s)]+)')
+
+
+class QueryField:
+    """A field of a parsed GraphQL selection set."""
+
+    def __init__(self, name: str, arguments: Dict[str, Any] = None) -> None:
+        self.name = name
+        self.arguments = arguments or {}
+        self.children: List["QueryField"] = []
+
+    def __repr__(self) -> str:
+        return f"QueryField({self.name!r}, {self.arguments!r}, {self.children!r})"
+
+
+def _parse_arguments(raw: str) -> Dict[str, Any]:
+    """Parse a GraphQL argument list like ``(limit: 10, ids: [1, 2])``."""
+    arguments = {}
+    for key, value in _ARGUMENT_RE.findall(raw.strip("()")):
+        if value.startswith("["):
+            arguments[key] = [v.strip() for v in value.strip("[]").split(",") if v.strip()]
+        elif value.startswith('"'):
+            arguments[key] = value.strip('"')
+        elif value.isdigit():
+            arguments[key] = int(value)
+        else:
+            arguments[key] = value
+    return arguments
+
+
+def parse_query(query: str) -> List[QueryField]:
+    """Parse a GraphQL query into a tree of QueryField objects.
+
+    Only the subset of GraphQL emitted by the streams is understood: field
+    names, argument lists and nested selection sets. Selection sets that are
+    left open at the end of the string (the streams close some of them when
+    the payload is built) are treated as closed.
+    """
+    root = QueryField("query")
+    stack = [root]
+    last_field = None
+    for match in _TOKEN_RE.finditer(query):
+        open_brace, close_brace, arguments, name, _ = match.groups()
+        if open_brace:
+            if last_field is not None:
+                stack.append(last_field)
+                last_field = None
+        elif close_brace:
+            if len(stack) > 1:
+                stack.pop()
+            last_field = None
+        elif arguments:
+            if last_field is not None:
+                last_field.arguments.update(_parse_arguments(arguments))
+        elif name:
+            if name == "query" and len(stack) == 1 and not root.children:
+                continue
+            last_field = QueryField(name)
+            stack[-1].children.append(last_field)
+    return root.children
+
+
+def _list_size(field: QueryField, list_sizes: Dict[str, int]) -> int:
+    """Return the number of elements a field is expected to resolve to."""
+    if "limit" in field.arguments and isinstance(field.arguments["limit"], int):
+        return field.arguments["limit"]
+    if "ids" in field.arguments:
+        ids = field.arguments["ids"]
+        return len(ids) if isinstance(ids, list) else 1
+    return list_sizes.get(field.name, 1)
+
+
+def _field_complexity(field: QueryField, list_sizes: Dict[str, int]) -> int:
+    if not field.children:
+        return 1
+    children = sum(_field_complexity(child, list_sizes) for child in field.children)
+    return 1 + _list_size(field, list_sizes) * children
+
+
+def estimate_query_complexity(query: str, list_sizes: Optional[Dict[str, int]] = None) -> int:
+    """Estimate the complexity of a GraphQL query string.
+
+    Every selected field costs one point per object it is resolved on. The
+    cost of a selection set is multiplied by the ``limit`` argument of its
+    field, by the number of ``ids`` requested, or by the size given for the
+    field name in *list_sizes* (for nested lists without arguments).
+    """
+    list_sizes = list_sizes or {}
+    return sum(_field_complexity(field, list_sizes) for field in parse_query(query))
+
+
+def get_list_sizes(schema: Dict, default_size: int = DEFAULT_LIST_SIZE) -> Dict[str, int]:
+    """Collect the names of every array-of-objects property in *schema*."""
+    sizes = {}
+
+    def walk(properties: Dict) -> None:
+        for name, prop in (properties or {}).items():
+            types = prop.get("type", [])
+            types = [types] if isinstance(types, str) else types
+            if "array" in types:
+                items = prop.get("items", {})
+                sizes[name] = NESTED_LIST_SIZES.get(name, default_size)
+                walk(items.get("properties", {}))
+            elif "object" in types:
+                walk(prop.get("properties", {}))
+
+    walk(schema.get("properties", {}))
+    return sizes
+
+
+class _Placeholders(dict):
+    """Format mapping that substitutes a dummy value for unknown fields."""
+
+    def __missing__(self, key):
+        return 1
+
+
+def _format_root_field(stream, page_size: int = None, batch_size: int = 1) -> str:
+    values = _Placeholders(
+        limit=stream.page_size if page_size is None else page_size,
+        page=1,
+        ids="[{}]".format(", ".join(str(i) for i in range(1, batch_size + 1))),
+        cursor='"cursor"',
+    )
+    return string.Formatter().vformat(stream.root_field or "", (), values)
+
+
+def build_stream_query(stream, page_size: int = None, batch_size: int = 1) -> str:
+    """Build the query *stream* would send for the given page and batch size."""
+    return stream.get_graphql_query(_format_root_field(stream, page_size, batch_size))
+
+
+def estimate_stream_complexity(stream, page_size: int = None, batch_size: int = 1,
+                               default_list_size: int = DEFAULT_LIST_SIZE) -> int:
+    """Estimate the complexity of a stream's query.
+
+    Args:
+        stream: A BaseStream instance; its schema, extra fields and root field
+            are used to build the query.
+        page_size (int): Value substituted for ``{limit}``. Defaults to the
+            stream's page size.
+        batch_size (int): Number of parent ids substituted for ``{ids}``.
+        default_list_size (int): Assumed size of nested unbounded lists.
+    """
+    query = build_stream_query(stream, page_size, batch_size)
+    list_sizes = get_list_sizes(stream.schema, default_list_size)
+    # Child streams select their records as an unbounded list at the end of
+    # the root field (e.g. ``boards(ids: ...) { columns``); size it like any
+    # other nested list unless a ``limit`` already bounds it.
+    chain = []
+    fields = parse_query(_format_root_field(stream, page_size, batch_size))
+    while fields:
+        chain.append(fields[-1])
+        fields = fields[-1].children
+    if chain and not chain[-1].arguments and not any("limit" in field.arguments for field in chain):
+        list_sizes.setdefault(chain[-1].name, NESTED_LIST_SIZES.get(chain[-1].name, default_list_size))
+    # Extra fields that are not mapped to an id are nested lists (e.g. the
+    # replies and assets of an update) that do not appear in the schema.
+    for path in stream.extra_fields or {}:
+        name = path.split(".")[-1]
+        if name not in stream.object_to_id:
+            list_sizes.setdefault(name, NESTED_LIST_SIZES.get(name, default_list_size))
+    return estimate_query_complexity(query, list_sizes)
+
+
+def _largest_within_budget(estimate: Callable[[int], int], upper: int, budget: int) -> int:
+    """Binary search the largest value in [1, upper] whose estimate fits the budget."""
+    if estimate(upper) <= budget:
+        return upper
+    low, high = 1, upper
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate(middle) <= budget:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def largest_safe_page_size(stream, max_page_size: int = None,
+                           budget: int = MAX_QUERY_COMPLEXITY) -> int:
+    """Return the largest ``limit`` not above *max_page_size* that fits *budget*."""
+    max_page_size = max_page_size or stream.page_size
+    if "{limit}" not in (stream.root_field or ""):
+        return max_page_size
+    return _largest_within_budget(
+        lambda size: estimate_stream_complexity(stream, page_size=size), max_page_size, budget)
+
+
+def complexity_report(streams: Dict[str, Any], budget: int = MAX_QUERY_COMPLEXITY,
+                      page_size: int = None) -> List[Dict[str, Any]]:
+    """Return one row per stream with its estimated complexity and safe page size."""
+    rows = []
+    for name, stream in streams.items():
+        size = page_size or stream.page_size
+        rows.append({
+            "stream": name,
+            "page_size": size,
+            "complexity": estimate_stream_complexity(stream, page_size=size),
+            "safe_page_size": largest_safe_page_size(stream, size, budget),
+        })
+    return rows
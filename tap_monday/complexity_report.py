@@ -0,0 +1,41 @@
+"""Per-stream report of the estimated query complexity and safe page size.
+
+    python -m tap_monday.complexity_report [--budget 5000000] [--page-size 100]
+"""
+import argparse
+import sys
+from typing import List
+
+from singer.catalog import CatalogEntry, Schema
+
+from tap_monday.complexity import MAX_QUERY_COMPLEXITY, complexity_report
+from tap_monday.schema import get_schemas
+from tap_monday.streams import STREAMS
+
+
+def main(argv: List[str] = None) -> None:
+    """Print a per-stream complexity report for the catalog schemas."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--budget", type=int, default=MAX_QUERY_COMPLEXITY,
+                        help="Maximum complexity allowed per query.")
+    parser.add_argument("--page-size", type=int, default=None,
+                        help="Page size to evaluate instead of each stream's default.")
+    args = parser.parse_args(argv)
+
+    schemas, field_metadata = get_schemas()
+    streams = {}
+    for name, stream_cls in STREAMS.items():
+        catalog_entry = CatalogEntry(stream=name, tap_stream_id=name,
+                                     schema=Schema.from_dict(schemas[name]),
+                                     metadata=field_metadata[name])
+        streams[name] = stream_cls(catalog=catalog_entry)
+
+    rows = complexity_report(streams, args.budget, args.page_size)
+    sys.stdout.write("{:<24}{:>10}{:>14}{:>16}\n".format(
+        "stream", "page_size", "complexity", "safe_page_size"))
+    for row in rows:
+        sys.stdout.write("{stream:<24}{page_size:>10}{complexity:>14}{safe_page_size:>16}\n".format(**row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Memory-bounded record id index.
+
+``BoardItems.sync`` remembers the ids of the records it has written at the
+latest ``updated_at`` value, so that records written before a cursor expiry
+are not written again when the board's query restarts. On boards where many
+items share one ``updated_at`` (bulk imports) a ``set`` of id strings costs
+around 100 bytes per id.
+
+``IdIndex`` packs numeric ids (all Monday ids are numeric strings) as 64-bit
+integers in a sorted ``array``, with recent additions in a small set that is
+merged into the array when it reaches a fraction of its size: about 20 bytes
+per id. Other ids are kept in a plain set.
+
+Beyond ``max_ids`` ids the index stops recording and reports no id as
+present: records are then never skipped, so a restart may write some of them
+twice (targets de-duplicate them by key) but never loses one.
+"""
+from array import array
+from bisect import bisect_left
+from typing import Optional
+
+from singer import get_logger
+
+LOGGER = get_logger()
+
+DEFAULT_MAX_IDS = 1000000
+INT64_MAX = 2 ** 63 - 1
+# The tail is merged when it holds more than 1/MERGE_RATIO of the ids in the
+# array (and at least MIN_TAIL ids), which keeps merging linear overall.
+MERGE_RATIO = 8
+MIN_TAIL = 1024
+
+
+class IdIndex:
+    """A set of record ids with a bounded memory footprint.
+
+    Args:
+        max_ids (int): Number of ids kept before the index overflows.
+        name (str): Name used in the overflow warning.
+    """
+
+    def __init__(self, max_ids: int = DEFAULT_MAX_IDS, name: str = "") -> None:
+        self.max_ids = max_ids
+        self.name = name
+        self.overflowed = False
+        self.peak_ids = 0
+        self._ids = array("q")
+        self._tail = set()
+        self._other = set()
+
+    def __len__(self) -> int:
+        return len(self._ids) + len(self._tail) + len(self._other)
+
+    def __iter__(self):
+        """Iterate over the ids, numeric ids as strings."""
+        for key in self._ids:
+            yield str(key)
+        for key in self._tail:
+            yield str(key)
+        yield from self._other
+
+    def __contains__(self, record_id) -> bool:
+        if self.overflowed:
+            return False
+        key = self._key(record_id)
+        if key is None:
+            return record_id in self._other
+        if key in self._tail:
+            return True
+        position = bisect_left(self._ids, key)
+        return position < len(self._ids) and self._ids[position] == key
+
+    def add(self, record_id) -> None:
+        """Add an id, unless the index overflowed."""
+        if self.overflowed:
+            return
+        key = self._key(record_id)
+        if key is None:
+            self._other.add(record_id)
+        else:
+            self._tail.add(key)
+            if len(self._tail) > MIN_TAIL and len(self._tail) * MERGE_RATIO > len(self._ids):
+                self._merge()
+        size = len(self._ids) + len(self._tail) + len(self._other)
+        if size > self.max_ids:
+            self._overflow()
+        elif size > self.peak_ids:
+            self.peak_ids = size
+
+    def clear(self) -> None:
+        """Remove all ids and reset the overflow."""
+        self.overflowed = False
+        self._ids = array("q")
+        self._tail = set()
+        self._other = set()
+
+    @property
+    def size_bytes(self) -> int:
+        """Approximate memory used by the ids."""
+        return self._ids.itemsize * len(self._ids) + 80 * len(self._tail) + 100 * len(self._other)
+
+    @staticmethod
+    def _key(record_id) -> Optional[int]:
+        """The integer stored for a numeric id, or None."""
+        if isinstance(record_id, int) and not isinstance(record_id, bool):
+            key = record_id
+        elif isinstance(record_id, str) and record_id.isascii() and record_id.isdigit() \
+                and (len(record_id) == 1 or record_id[0] != "0"):
+            # Leading zeros would map different strings to the same integer.
+            key = int(record_id)
+        else:
+            return None
+        return key if 0 <= key <= INT64_MAX else None
+
+    def _merge(self) -> None:
+        self._ids.extend(self._tail)
+        self._ids = array("q", sorted(self._ids))
+        self._tail = set()
+
+    def _overflow(self) -> None:
+        LOGGER.warning(
+            "De-duplication index %s exceeded %d ids; records at the current bookmark may be "
+            "written again if the query restarts.", self.name, self.max_ids,
+        )
+        self.clear()
+        self.overflowed = True
@@ -1,6 +1,7 @@
 import singer
 from singer import metadata
 from singer.catalog import Catalog, CatalogEntry, Schema
+from tap_monday.discovery_cache import DiscoveryCache
 from tap_monday.schema import get_schemas
 from tap_monday.streams import STREAMS
 from tap_monday.exceptions import MondayForbiddenError
@@ -30,27 +31,36 @@ def _apply_access_checks(client, schemas: dict, field_metadata: dict) -> None:
     Note: check_access() always returns True for child streams, so this loop
     effectively identifies only inaccessible parent streams by design.
     Child stream removal is handled separately by _prune_inaccessible_children().
+    The probes of all streams are sent to the API as a single request (see
+    Client.combined_probes).
     Raises MondayForbiddenError if no parent streams are accessible.
     """
-    inaccessible_streams = [
-        stream_name
-        for stream_name, stream_obj in STREAMS.items()
-        if stream_name in schemas and not stream_obj(client=client).check_access()
-    ]
-
-    for stream_name in inaccessible_streams:
-        schemas.pop(stream_name, None)
-        field_metadata.pop(stream_name, None)
-
-    _prune_inaccessible_children(schemas, field_metadata)
-
-    # For accessible streams, prune any plan-gated fields from their catalog schema.
-    for stream_name in list(schemas.keys()):
-        stream_cls = STREAMS.get(stream_name)
-        if stream_cls:
-            stream_cls(client=client).prune_inaccessible_fields(
-                schemas[stream_name], field_metadata[stream_name]
-            )
+    streams = {
+        stream_name: stream_cls(client=client)
+        for stream_name, stream_cls in STREAMS.items()
+        if stream_name in schemas
+    }
+    probes = [query for stream in streams.values() for query in stream.get_access_probes()]
+
+    with client.combined_probes(probes):
+        inaccessible_streams = [
+            stream_name
+            for stream_name, stream in streams.items()
+            if not stream.check_access()
+        ]
+
+        for stream_name in inaccessible_streams:
+            schemas.pop(stream_name, None)
+            field_metadata.pop(stream_name, None)
+
+        _prune_inaccessible_children(schemas, field_metadata)
+
+        # For accessible streams, prune any plan-gated fields from their catalog schema.
+        for stream_name in list(schemas.keys()):
+            if stream_name in streams:
+                streams[stream_name].prune_inaccessible_fields(
+                    schemas[stream_name], field_metadata[stream_name]
+                )
 
     if not schemas:
         raise MondayForbiddenError(
@@ -65,6 +75,46 @@ def _apply_access_checks(client, schemas: dict, field_metadata: dict) -> None:
         )
 
 
+def _apply_cached_access(accessible: dict, schemas: dict, field_metadata: dict) -> None:
+    """
+    Remove the streams missing from *accessible* (the cached outcome of
+    _apply_access_checks) and the fields pruned from the others, from
+    schemas and field_metadata in place.
+    """
+    for stream_name in list(schemas.keys()):
+        if stream_name not in accessible:
+            schemas.pop(stream_name)
+            field_metadata.pop(stream_name)
+            continue
+        for field_name in accessible[stream_name]:
+            schemas[stream_name].get("properties", {}).pop(field_name, None)
+            field_metadata[stream_name] = [
+                entry for entry in field_metadata[stream_name]
+                if tuple(entry.get("breadcrumb", ())) != ("properties", field_name)
+            ]
+
+
+def _check_access(client, schemas: dict, field_metadata: dict) -> None:
+    """
+    Apply the access checks, or their cached outcome when discovery_cache_dir
+    is configured and the cache holds a valid entry for the token.
+    """
+    cache = DiscoveryCache.from_config(client.config, client.api_version)
+    accessible = cache.load() if cache else None
+    if accessible is not None:
+        LOGGER.info("Using the access checks cached in %s.", cache.path)
+        _apply_cached_access(accessible, schemas, field_metadata)
+        return
+
+    fields = {stream_name: list(schema.get("properties", {})) for stream_name, schema in schemas.items()}
+    _apply_access_checks(client, schemas, field_metadata)
+    if cache:
+        cache.save({
+            stream_name: [field for field in fields[stream_name] if field not in schema.get("properties", {})]
+            for stream_name, schema in schemas.items()
+        })
+
+
 def discover(client) -> Catalog:
     """
     Run the discovery mode, prepare the catalog file and return the catalog.
@@ -72,7 +122,7 @@ def discover(client) -> Catalog:
     the credentials cannot read are excluded from the returned catalog.
     """
     schemas, field_metadata = get_schemas()
-    _apply_access_checks(client, schemas, field_metadata)
+    _check_access(client, schemas, field_metadata)
     catalog = Catalog([])
 
     for stream_name, schema_dict in schemas.items():
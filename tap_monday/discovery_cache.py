@@ -0,0 +1,120 @@
+"""Local cache of the results of the discovery access probes.
+
+Discovery probes the API for the streams and plan-gated fields the token may
+read (see ``discover._apply_access_checks``). Permissions rarely change, so
+when ``discovery_cache_dir`` is configured the outcome is stored in that
+directory and reused by the next discoveries within ``discovery_cache_ttl``
+seconds, without any request.
+
+An entry is keyed on a hash of the API token, the tap version and the API
+version, so a new token or release never reads an entry written by another.
+The token itself is never stored. The entry of a token is removed when a sync
+fails with a 401 or 403 error, so that the next discovery probes again.
+"""
+import hashlib
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from importlib.metadata import PackageNotFoundError, version
+from typing import Dict, Iterator, List, Optional
+
+from singer import get_logger
+
+from tap_monday import codec
+from tap_monday.exceptions import MondayForbiddenError, MondayUnauthorizedError
+
+LOGGER = get_logger()
+
+DEFAULT_DISCOVERY_CACHE_TTL = 86400
+CACHE_FORMAT = 1
+
+
+def get_tap_version() -> str:
+    """Return the installed version of the tap, or "unknown"."""
+    try:
+        return version("tap-monday")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def get_cache_key(api_token: str, api_version: str) -> str:
+    """Return the fingerprint of a token, the tap version and the API version."""
+    fingerprint = "\0".join((str(api_token), get_tap_version(), str(api_version)))
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+
+class DiscoveryCache:
+    """Stores the accessible streams and the fields pruned from each of them.
+
+    Args:
+        directory (str): Directory of the cache files; created if missing.
+        key (str): Fingerprint of the token (see ``get_cache_key``).
+        ttl (int): Number of seconds an entry is reused for.
+    """
+
+    def __init__(self, directory: str, key: str, ttl: int = DEFAULT_DISCOVERY_CACHE_TTL) -> None:
+        self.directory = directory
+        self.key = key
+        self.ttl = ttl
+        self.path = os.path.join(directory, "discovery-{}.json".format(key))
+
+    @classmethod
+    def from_config(cls, config: Dict, api_version: str) -> Optional["DiscoveryCache"]:
+        """Return the cache configured by ``discovery_cache_dir``, or None."""
+        if not config.get("discovery_cache_dir"):
+            return None
+        ttl = config.get("discovery_cache_ttl")
+        return cls(config["discovery_cache_dir"], get_cache_key(config.get("api_token"), api_version),
+                   DEFAULT_DISCOVERY_CACHE_TTL if ttl is None else int(ttl))
+
+    def load(self) -> Optional[Dict[str, List[str]]]:
+        """Return the pruned fields of each accessible stream, or None when
+        there is no valid entry."""
+        try:
+            with open(self.path, "rb") as cache_file:
+                entry = codec.loads(cache_file.read())
+        except FileNotFoundError:
+            return None
+        except Exception as err:
+            LOGGER.warning("Ignoring unreadable discovery cache %s: %s", self.path, err)
+            return None
+        if not isinstance(entry, dict) or entry.get("format") != CACHE_FORMAT or entry.get("key") != self.key:
+            return None
+        age = time.time() - entry.get("created_at", 0)
+        if not 0 <= age < self.ttl:
+            LOGGER.info("Discovery cache expired %d seconds ago.", age - self.ttl)
+            return None
+        return entry["streams"]
+
+    def save(self, streams: Dict[str, List[str]]) -> None:
+        """Store the pruned fields of each accessible stream."""
+        os.makedirs(self.directory, exist_ok=True)
+        entry = {"format": CACHE_FORMAT, "key": self.key, "created_at": time.time(), "streams": streams}
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as cache_file:
+                cache_file.write(codec.dumps(entry).encode("utf-8"))
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+
+    def invalidate(self) -> None:
+        """Remove the entry, if any."""
+        try:
+            os.remove(self.path)
+            LOGGER.info("Removed discovery cache %s.", self.path)
+        except FileNotFoundError:
+            pass
+
+
+@contextmanager
+def invalidated_on_auth_error(cache: Optional[DiscoveryCache]) -> Iterator[None]:
+    """Remove the entry of *cache* when the block raises a 401 or 403 error."""
+    try:
+        yield
+    except (MondayUnauthorizedError, MondayForbiddenError):
+        if cache is not None:
+            cache.invalidate()
+        raise
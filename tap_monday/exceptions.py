@@ -1,10 +1,11 @@
 class MondayError(Exception):
     """class representing Generic Http error."""
 
-    def __init__(self, message=None, response=None):
+    def __init__(self, message=None, response=None, response_json=None):
         super().__init__(message)
         self.message = message
         self.response = response
+        self.response_json = response_json
 
 
 class MondayBackoffError(MondayError):
@@ -43,19 +44,21 @@ class MondayUnprocessableEntityError(MondayBackoffError):
 
 class MondayRateLimitError(MondayBackoffError):
     """class representing 429 status code."""
-    def __init__(self, message=None, response=None):
+    def __init__(self, message=None, response=None, response_json=None):
         """Initialize the MondayRateLimitError. Parses the 'retry_in_seconds'  from the response (if present) and sets the
-            `retry_after` attribute accordingly.
+            `retry_after` attribute accordingly. The already decoded body can be passed as
+            `response_json` to avoid decoding the response again.
         """
         self.response = response
         self.retry_after = None
 
-        if response is not None:
+        if response_json is None and response is not None:
             try:
                 response_json = response.json()
             except Exception:
                 response_json = {}
-            errors = response_json.get("errors", [])
+        if isinstance(response_json, dict):
+            errors = response_json.get("errors") or []
             if errors:
                 extensions = errors[0].get("extensions", {})
                 retry_in_seconds = extensions.get("retry_in_seconds")
@@ -66,7 +69,7 @@ class MondayRateLimitError(MondayBackoffError):
         retry_info = f"(Retry after {self.retry_after} seconds.)" \
             if self.retry_after is not None else "(Retry after unknown delay.)"
         full_message = f"{base_msg} {retry_info}"
-        super().__init__(full_message, response=response)
+        super().__init__(full_message, response=response, response_json=response_json)
 
 class MondayInternalServerError(MondayBackoffError):
     """class representing 500 status code."""
@@ -81,6 +84,13 @@ class MondayGraphQLInternalError(MondayError):
     """
     pass
 
+class MondayQueryComplexityError(MondayError):
+    """Raised when a single query exceeds Monday.com's per-query complexity limit.
+    Retrying the same query cannot succeed; the page size (or the
+    max_query_complexity config value) has to be lowered instead.
+    """
+    pass
+
 class MondayNotImplementedError(MondayBackoffError):
     """class representing 501 status code."""
     pass
@@ -141,3 +151,14 @@ ERROR_CODE_EXCEPTION_MAPPING = {
     }
 }
 
+
+# Monday returns HTTP 200 for GraphQL-level errors; these extension codes are
+# mapped to the exception that callers handle for them.
+GRAPHQL_ERROR_CODE_EXCEPTION_MAPPING = {
+    "CursorException": MondayCursorExpiredError,
+    "UserUnauthorizedException": MondayForbiddenError,
+    "INTERNAL_SERVER_ERROR": MondayGraphQLInternalError,
+    "ComplexityException": MondayRateLimitError,
+    "COMPLEXITY_BUDGET_EXHAUSTED": MondayRateLimitError,
+    "maxComplexityExceeded": MondayQueryComplexityError,
+}
@@ -0,0 +1,144 @@
+"""Optional HTTP/2 transport for the API client.
+
+Every request of the tap goes to the single host ``api.monday.com``. Over
+HTTP/1.1 each in-flight request needs its own connection (and TLS handshake),
+while HTTP/2 multiplexes concurrent requests as streams of one connection.
+``Http2Session`` wraps an ``httpx.Client`` behind the subset of the
+``requests.Session`` interface used by ``Client`` so it can be swapped in
+when the ``http2`` config option is enabled. It requires the optional
+``httpx[http2]`` dependency (``pip install tap-monday[http2]``).
+
+The sync itself sends its requests one at a time, child streams included, so
+this only replaces the transport: one long-lived connection with compressed
+headers. Only the concurrent warm-up requests are multiplexed.
+"""
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+from requests.exceptions import ConnectionError, Timeout
+
+try:
+    import httpx
+    import h2  # noqa: F401  pylint: disable=unused-import
+except ImportError:
+    httpx = None
+
+
+def is_available() -> bool:
+    """Returns True when the optional HTTP/2 dependencies are installed."""
+    return httpx is not None
+
+
+class Http2Session:
+    """A requests-compatible session that sends requests over HTTP/2.
+
+    Args:
+        max_connections (int): Maximum number of connections in the pool.
+            Requests beyond one connection's stream limit open a new one.
+        http1 (bool): Allow falling back to HTTP/1.1 when the server does
+            not negotiate HTTP/2 through ALPN. Disable it to talk HTTP/2 with
+            prior knowledge to cleartext (h2c) servers.
+
+    httpcore's synchronous HTTP/2 connection is not safe for concurrent
+    senders: a thread can allocate a stream id and send its headers after a
+    thread that allocated a higher id, which the server rejects as a protocol
+    error, and several threads opening the first streams race with the
+    SETTINGS exchange. So requests are sent one at a time until the first one
+    has succeeded, and afterwards each request holds a lock until its body is
+    sent; the responses are still awaited concurrently.
+    """
+
+    def __init__(self, max_connections: int = 10, http1: bool = True) -> None:
+        if not is_available():
+            raise ImportError("HTTP/2 support requires the 'httpx[http2]' package.")
+        self._client = httpx.Client(
+            http1=http1,
+            http2=True,
+            limits=httpx.Limits(max_connections=max_connections),
+        )
+        self._lock = threading.Lock()
+        self._connect_lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._connected = False
+        self._connections_created = 0
+        self._requests = 0
+        # httpx logs every request at INFO level; the client already records
+        # a metric per request, so keep its logger quiet unless configured.
+        httpx_logger = logging.getLogger("httpx")
+        if httpx_logger.level == logging.NOTSET:
+            httpx_logger.setLevel(logging.WARNING)
+
+    def _trace(self, event_name: str, info: Dict) -> None:
+        """httpcore trace hook; counts the connections opened by the pool."""
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self._connections_created += 1
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        data: Any = None,
+        timeout: Optional[float] = None,
+        stream: bool = False,
+    ):
+        """Send a request and return an ``httpx.Response``, which provides the
+        ``status_code``, ``headers``, ``content`` and ``json()`` members the
+        client relies on. With ``stream`` the body is not read up front but
+        iterated with ``iter_bytes()``. Transport errors are re-raised as
+        their ``requests`` counterparts so the client's retry handling
+        applies unchanged."""
+        if not self._connected:
+            with self._connect_lock:
+                if not self._connected:
+                    response = self._send(method, url, headers, params, data, timeout, stream)
+                    self._connected = True
+                    return response
+        return self._send(method, url, headers, params, data, timeout, stream)
+
+    def _send(self, method, url, headers, params, data, timeout, stream):
+        content = data if isinstance(data, (str, bytes)) else None
+        form = data if isinstance(data, dict) and data else None
+        with self._lock:
+            self._requests += 1
+        sending = [True]
+
+        def release_send_lock() -> None:
+            if sending[0]:
+                sending[0] = False
+                self._send_lock.release()
+
+        def trace(event_name: str, info: Dict) -> None:
+            self._trace(event_name, info)
+            if event_name.endswith("send_request_body.complete"):
+                release_send_lock()
+
+        self._send_lock.acquire()
+        try:
+            request = self._client.build_request(
+                method, url, headers=headers, params=params or None,
+                content=content, data=form, timeout=timeout,
+                extensions={"trace": trace},
+            )
+            return self._client.send(request, stream=stream)
+        except httpx.TimeoutException as err:
+            raise Timeout(str(err)) from err
+        except httpx.TransportError as err:
+            raise ConnectionError(str(err)) from err
+        finally:
+            release_send_lock()
+
+    def pool_stats(self) -> Dict[str, int]:
+        """Returns the number of connections opened and requests sent."""
+        with self._lock:
+            return {
+                "connections_created": self._connections_created,
+                "connections_reused": max(self._requests - self._connections_created, 0),
+                "requests": self._requests,
+            }
+
+    def close(self) -> None:
+        self._client.close()
@@ -0,0 +1,248 @@
+"""Singer message output.
+
+Drop-in replacements for ``singer.write_record`` and ``singer.write_message``
+that serialize messages with ``tap_monday.codec`` instead of re-encoding every
+record with ``simplejson``.
+
+Within ``buffered()`` messages are collected and written to stdout in large
+chunks, when the buffer is full or its oldest message reaches the flush
+interval. Besides on every write, the interval is checked by
+``flush_if_due()``, which the client calls before each request so that
+messages do not wait for a slow response. ``flush()`` must be called before writing messages that bypass this
+module (the SCHEMA and STATE messages written by singer) to keep all messages
+in order; ``write_schema()`` and ``write_state()`` do so.
+
+Within ``sink()`` records are handed to a record sink (e.g.
+``tap_monday.batch.BatchSink`` or ``tap_monday.parquet.ParquetSink``) instead
+of being written as RECORD messages; ``flush()`` then also completes the
+output of the sink. ``write_checkpoint()`` writes a STATE message without
+completing the sink's files: the message is held back until the files that
+were open when it was written are complete, so that it never references
+records the sink has not announced yet.
+
+Within ``deferred()`` a callback writing records held back elsewhere (e.g.
+``tap_monday.parallel.RecordPipeline.flush``) is called before every SCHEMA
+and STATE message.
+"""
+import sys
+import time
+from contextlib import contextmanager
+
+import singer
+from singer import get_logger, metrics
+from singer.messages import RecordMessage, StateMessage
+
+from tap_monday import codec
+
+LOGGER = get_logger()
+
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+
+class _OutputBuffer:
+    """Buffers serialized messages for stdout; a buffer size of 0 writes
+    every message through."""
+
+    def __init__(self) -> None:
+        self.buffer_size = 0
+        self.flush_interval = DEFAULT_FLUSH_INTERVAL
+        self.lines = []
+        self.size = 0
+        self.first_write = None
+        self.bytes_written = 0
+        self.flushes = 0
+
+    def write(self, line: str) -> None:
+        data = (line + "\n").encode("utf-8")
+        self.lines.append(data)
+        self.size += len(data)
+        if self.first_write is None:
+            self.first_write = time.monotonic()
+        if self.size >= self.buffer_size or self.is_due():
+            self.flush()
+
+    def is_due(self) -> bool:
+        return self.first_write is not None and time.monotonic() - self.first_write >= self.flush_interval
+
+    def flush(self) -> None:
+        if not self.lines:
+            return
+        data = b"".join(self.lines)
+        self.lines = []
+        self.size = 0
+        self.first_write = None
+        stdout = sys.stdout
+        stdout.flush()
+        if hasattr(stdout, "buffer"):
+            stdout.buffer.write(data)
+            stdout.buffer.flush()
+        else:
+            stdout.write(data.decode("utf-8"))
+            stdout.flush()
+        self.bytes_written += len(data)
+        self.flushes += 1
+
+
+_output = _OutputBuffer()
+_sink = None
+# STATE messages held back by write_checkpoint(): the serialized message and
+# the files of the sink that were open when it was written.
+_pending_states = []
+# Callbacks writing the records held back within deferred().
+_deferred = []
+
+
+def format_message(message) -> str:
+    """Serialize a singer Message to a single JSON line (without newline)."""
+    return codec.dumps(message.asdict())
+
+
+def write_message(message) -> None:
+    """Write a singer Message to stdout."""
+    write_line(format_message(message))
+
+
+def write_line(line: str) -> None:
+    """Write an already serialized message to stdout."""
+    _output.write(line)
+    if _pending_states:
+        _write_pending_states()
+
+
+def format_record_json(stream_name: str, record_json: str) -> str:
+    """Serialize a RECORD message for a record already serialized to JSON;
+    the same document as format_message(RecordMessage(...)), without decoding
+    and encoding the record again."""
+    return '{"type":"RECORD","stream":' + codec.dumps(stream_name) + ',"record":' + record_json + "}"
+
+
+def write_record(stream_name, record, stream_alias=None, time_extracted=None) -> None:
+    """Write a single record for the given stream."""
+    if _sink is not None:
+        _sink.write_record(stream_alias or stream_name, record)
+        return
+    write_message(RecordMessage(stream=(stream_alias or stream_name),
+                                record=record,
+                                time_extracted=time_extracted))
+
+
+def write_record_json(stream_name: str, record_json: str) -> None:
+    """Write a record already serialized to JSON for the given stream."""
+    if _sink is not None:
+        _sink.write_record_json(stream_name, record_json)
+        return
+    write_line(format_record_json(stream_name, record_json))
+
+
+def write_schema(stream_name: str, schema, key_properties) -> None:
+    """Write a SCHEMA message after the messages written before it, and
+    hand the schema to the record sink."""
+    flush()
+    if _sink is not None:
+        _sink.write_schema(stream_name, schema)
+    singer.write_schema(stream_name, schema, key_properties)
+
+
+def write_state(state) -> None:
+    """Write a STATE message after the messages written before it."""
+    flush()
+    singer.write_state(state)
+
+
+def write_checkpoint(state) -> None:
+    """Write a STATE message checkpointing progress without completing the
+    files of the record sink; the message is written once the files holding
+    the records written before it are complete."""
+    _write_deferred()
+    open_files = set(_sink.open_files()) if _sink is not None else set()
+    if not open_files:
+        del _pending_states[:]
+        _output.flush()
+        singer.write_state(state)
+        return
+    _pending_states.append((format_message(StateMessage(value=state)), open_files))
+
+
+def _write_pending_states() -> None:
+    """Write the latest held back STATE message whose files are complete,
+    and drop the earlier ones it supersedes."""
+    open_files = set(_sink.open_files()) if _sink is not None else set()
+    for index in range(len(_pending_states) - 1, -1, -1):
+        line, files = _pending_states[index]
+        if not files & open_files:
+            del _pending_states[:index + 1]
+            write_line(line)
+            return
+
+
+def flush_if_due() -> None:
+    """Write out the buffered messages if the oldest of them reached the
+    flush interval."""
+    if _output.is_due():
+        _output.flush()
+
+
+def _write_deferred() -> None:
+    for write_records in _deferred:
+        write_records()
+
+
+def flush() -> None:
+    """Write the deferred records, complete the output of the record sink
+    and write out the buffered messages."""
+    _write_deferred()
+    if _sink is not None:
+        _sink.flush()
+    _output.flush()
+
+
+@contextmanager
+def sink(record_sink):
+    """Hand the records written within the block to *record_sink*, an object
+    with ``write_schema(stream_name, schema)``, ``write_record(stream_name,
+    record)``, ``write_record_json(stream_name, record_json)``, ``flush()``
+    and ``close()`` methods, and ``open_files()`` returning the files not
+    complete yet. The sink is flushed when the block exits normally and
+    closed in any case; STATE messages still held back are then dropped."""
+    global _sink  # pylint: disable=global-statement
+    previous, _sink = _sink, record_sink
+    try:
+        yield record_sink
+        flush()
+    finally:
+        _sink = previous
+        del _pending_states[:]
+        record_sink.close()
+
+
+@contextmanager
+def deferred(write_records):
+    """Call *write_records* to write the records it holds back before every
+    SCHEMA and STATE message written within the block, and when the block
+    exits normally."""
+    _deferred.append(write_records)
+    try:
+        yield
+        write_records()
+    finally:
+        _deferred.remove(write_records)
+
+
+@contextmanager
+def buffered(buffer_size: int = DEFAULT_BUFFER_SIZE, flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+    """Buffer the messages written within the block, up to *buffer_size*
+    bytes or *flush_interval* seconds. The buffer is flushed when the
+    block exits, and the bytes written and the number of flushes are logged
+    as the ``output_bytes_written`` and ``output_flushes`` metrics."""
+    previous = (_output.buffer_size, _output.flush_interval)
+    bytes_written, flushes = _output.bytes_written, _output.flushes
+    _output.buffer_size, _output.flush_interval = buffer_size, flush_interval
+    try:
+        yield
+    finally:
+        _output.flush()
+        _output.buffer_size, _output.flush_interval = previous
+        metrics.log(LOGGER, metrics.Point("counter", "output_bytes_written",
+                                          _output.bytes_written - bytes_written, {}))
+        metrics.log(LOGGER, metrics.Point("counter", "output_flushes", _output.flushes - flushes, {}))
@@ -0,0 +1,217 @@
+"""Record transformation in a pool of worker processes.
+
+Transforming records and serializing them to Singer messages is CPU-bound and
+otherwise runs on the thread that also waits for the API. ``RecordPipeline``
+sends batches of raw records to worker processes, which transform and
+serialize them, and yields the resulting JSON documents in the original
+order so the main process only has to write them.
+
+Child streams synced once per parent record hand their records to
+``RecordPipeline.submit`` instead: they are collected into batches spanning
+parent records, and each result is passed to a callback in the original
+order once its batch is transformed, at the latest when ``flush()`` is
+called.
+
+The schema and metadata of the streams given to the pipeline are sent to
+each worker once, when it starts; the batches of these streams only carry
+the stream name.
+
+The pipeline is enabled with the ``transform_workers`` config option.
+"""
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from singer.transform import NO_INTEGER_DATETIME_PARSING
+
+from tap_monday import codec
+from tap_monday.transform import CompiledTransformer
+
+BATCH_SIZE = 500
+
+# State of a worker process: its transformer and the schema and metadata
+# of each stream, reused so the transformer's compiled cache hits.
+_worker_transformer = None
+_worker_schemas = {}
+
+
+def _init_worker(integer_datetime_fmt: str, schemas: Dict[str, Tuple[Dict, Dict]]) -> None:
+    global _worker_transformer  # pylint: disable=global-statement
+    _worker_transformer = CompiledTransformer(integer_datetime_fmt=integer_datetime_fmt)
+    _worker_schemas.update(schemas)
+
+
+def transform_batch(
+    transformer, schema: Dict, metadata: Dict, records: List[Dict], replication_key: Optional[str]
+) -> List[Tuple[str, Any]]:
+    """Transforms *records* and returns them serialized to JSON, each with
+    the value of *replication_key* in the transformed record (or None)."""
+    results = []
+    for record in records:
+        transformed = transformer.transform(record, schema, metadata)
+        results.append((codec.dumps(transformed), transformed[replication_key] if replication_key else None))
+    return results
+
+
+def _transform_batch_in_worker(stream_name, schema, metadata, records, replication_key):
+    """Worker entry point; *schema* and *metadata* are None for the streams
+    registered when the worker started. Returns None when the batch could
+    not be transformed; the main process then transforms it itself to raise
+    the error with its original type and message."""
+    cached = _worker_schemas.get(stream_name)
+    if schema is None or cached == (schema, metadata):
+        schema, metadata = cached
+    else:
+        _worker_schemas[stream_name] = (schema, metadata)
+    try:
+        return transform_batch(_worker_transformer, schema, metadata, records, replication_key)
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+
+class _Batch:
+    """Records of one stream collected for a worker, with the callback
+    receiving the result of each record."""
+
+    def __init__(self, stream_name: str, schema: Dict, metadata: Dict, replication_key: Optional[str]) -> None:
+        self.stream_name = stream_name
+        self.schema = schema
+        self.metadata = metadata
+        self.replication_key = replication_key
+        self.records = []
+        self.callbacks = []
+        self.future = None
+
+
+class RecordPipeline:
+    """Transforms records in *workers* processes, preserving their order.
+
+    At most two batches per worker are in flight, which bounds memory and
+    lets the main process fetch the next page while workers are busy.
+
+    Args:
+        schemas (dict): Schema and metadata of each stream, sent to the
+            workers when they start.
+    """
+
+    def __init__(self, workers: int, integer_datetime_fmt: str = NO_INTEGER_DATETIME_PARSING,
+                 batch_size: int = BATCH_SIZE, schemas: Optional[Dict[str, Tuple[Dict, Dict]]] = None) -> None:
+        self.workers = workers
+        self.batch_size = batch_size
+        self.transformer = CompiledTransformer(integer_datetime_fmt=integer_datetime_fmt)
+        self.schemas = dict(schemas or {})
+        # Streams whose schema and metadata objects were found equal to the
+        # registered ones, by identity of the objects.
+        self._registered = {}
+        self._batches: Dict[str, _Batch] = {}
+        self._pending = deque()
+        self._on_flush: Dict[str, Callable[[], None]] = {}
+        # Spawned rather than forked workers: the client's connection pool
+        # threads must not be duplicated into the children.
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(integer_datetime_fmt, self.schemas),
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def transform(
+        self,
+        stream_name: str,
+        schema: Dict,
+        metadata: Dict,
+        records: Iterable[Dict],
+        replication_key: Optional[str] = None,
+    ) -> Iterator[Tuple[str, Any]]:
+        """Yields a (record JSON, replication value) pair for each record,
+        in the order of *records*."""
+        pending = deque()
+        batch = _Batch(stream_name, schema, metadata, replication_key)
+        for record in records:
+            batch.records.append(record)
+            if len(batch.records) < self.batch_size:
+                continue
+            pending.append(self._send(batch))
+            batch = _Batch(stream_name, schema, metadata, replication_key)
+            while len(pending) > 2 * self.workers:
+                yield from self._results(pending.popleft())
+        if batch.records:
+            pending.append(self._send(batch))
+        while pending:
+            yield from self._results(pending.popleft())
+
+    def submit(
+        self,
+        stream_name: str,
+        schema: Dict,
+        metadata: Dict,
+        records: Iterable[Dict],
+        replication_key: Optional[str],
+        callback: Callable[[str, Any], None],
+        on_flush: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """Adds *records* to the stream's current batch, which is sent to the
+        workers once it holds ``batch_size`` records. *callback* is called
+        with the (record JSON, replication value) pair of each record, in
+        order, once its batch is transformed; *on_flush* is called by
+        ``flush()`` after the results of the stream."""
+        batch = self._batches.get(stream_name)
+        if batch is None or batch.schema is not schema or batch.metadata is not metadata:
+            if batch is not None and batch.records:
+                self._pending.append(self._send(batch))
+            batch = self._batches[stream_name] = _Batch(stream_name, schema, metadata, replication_key)
+        if on_flush is not None:
+            self._on_flush[stream_name] = on_flush
+        for record in records:
+            batch.records.append(record)
+            batch.callbacks.append(callback)
+            if len(batch.records) >= self.batch_size:
+                self._pending.append(self._send(self._batches.pop(stream_name)))
+                batch = self._batches[stream_name] = _Batch(stream_name, schema, metadata, replication_key)
+        while self._pending and (len(self._pending) > 2 * self.workers or self._pending[0].future.done()):
+            self._call_back(self._pending.popleft())
+
+    def flush(self) -> None:
+        """Sends the current batches and passes all results to their
+        callbacks, then calls the ``on_flush`` callbacks."""
+        for batch in self._batches.values():
+            if batch.records:
+                self._pending.append(self._send(batch))
+        self._batches = {}
+        while self._pending:
+            self._call_back(self._pending.popleft())
+        on_flush, self._on_flush = self._on_flush, {}
+        for callback in on_flush.values():
+            callback()
+
+    def _send(self, batch: _Batch) -> _Batch:
+        registered = self._registered.get(batch.stream_name)
+        if registered != (id(batch.schema), id(batch.metadata)):
+            registered = None
+            if self.schemas.get(batch.stream_name) == (batch.schema, batch.metadata):
+                registered = self._registered[batch.stream_name] = (id(batch.schema), id(batch.metadata))
+        schema, metadata = (None, None) if registered else (batch.schema, batch.metadata)
+        batch.future = self._executor.submit(
+            _transform_batch_in_worker, batch.stream_name, schema, metadata, batch.records, batch.replication_key)
+        return batch
+
+    def _results(self, batch: _Batch) -> List[Tuple[str, Any]]:
+        transformed = batch.future.result()
+        if transformed is None:
+            transformed = transform_batch(
+                self.transformer, batch.schema, batch.metadata, batch.records, batch.replication_key)
+        return transformed
+
+    def _call_back(self, batch: _Batch) -> None:
+        for callback, (record_json, value) in zip(batch.callbacks, self._results(batch)):
+            callback(record_json, value)
@@ -0,0 +1,313 @@
+"""Parquet output for high-volume streams.
+
+``ParquetSink`` writes the records of the ``board_items``, ``column_values``,
+``board_activity_logs`` and ``updates`` streams to Parquet files partitioned
+by stream and board::
+
+    <directory>/board_items/board_id=123/20240131T120000-1a2b3c-000001.parquet
+
+and emits a ``BATCH`` message referencing each file once it is complete::
+
+    {"type": "BATCH", "stream": "board_items",
+     "encoding": {"format": "parquet", "compression": "snappy"},
+     "manifest": ["file:///data/board_items/board_id=123/20240131T120000-1a2b3c-000001.parquet"]}
+
+The Arrow schema of a stream is derived from the JSON schema of its SCHEMA
+message (``tap_monday/schemas`` until one is written): date-times become UTC timestamps, objects with known
+properties become structs and objects with arbitrary properties are stored
+as JSON strings. Records without a board (``updates``) are written to the
+``board_id=__HIVE_DEFAULT_PARTITION__`` partition.
+
+Records are written in row groups of ``row_group_size`` rows. A file is
+complete when the records of another board start or when the sink is
+flushed, which happens before every STATE message (progress checkpoints
+wait for the files instead, see ``output.write_checkpoint()``), so STATE
+keeps tracking the bookmarks and every run appends new files. The records of other streams
+go to the ``fallback`` sink, or are written as RECORD messages.
+
+Requires the optional ``pyarrow`` package (``pip install tap-monday[parquet]``).
+"""
+import datetime
+import os
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from singer.utils import strptime_to_utc
+
+from tap_monday import codec
+from tap_monday.output import format_record_json, write_line
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+PARQUET_STREAMS = ("board_items", "column_values", "board_activity_logs", "updates")
+PARTITION_KEY = "board_id"
+DEFAULT_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+DEFAULT_ROW_GROUP_SIZE = 100000
+DEFAULT_PARQUET_COMPRESSION = "snappy"
+
+Converter = Optional[Callable]
+
+
+def is_available() -> bool:
+    """Return True when pyarrow is installed."""
+    return pyarrow is not None
+
+
+def _to_timestamp(value):
+    if value is None:
+        return None
+    try:
+        # The format written by the transformer.
+        return datetime.datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%fZ").replace(tzinfo=datetime.timezone.utc)
+    except ValueError:
+        return strptime_to_utc(value)
+
+
+def _to_json(value):
+    return None if value is None else codec.dumps(value)
+
+
+def _struct_converter(converters: Dict[str, Callable]) -> Callable:
+    def convert(value):
+        if value is None:
+            return None
+        value = dict(value)
+        for name, converter in converters.items():
+            value[name] = converter(value.get(name))
+        return value
+    return convert
+
+
+def _list_converter(converter: Callable) -> Callable:
+    def convert(value):
+        return None if value is None else [converter(item) for item in value]
+    return convert
+
+
+def arrow_type(schema: Dict) -> Tuple["pyarrow.DataType", Converter]:
+    """Return the Arrow type of the values described by a JSON *schema*
+    and a function converting transformed values to it (None when they can
+    be used as they are)."""
+    types = schema.get("type", [])
+    types = [types] if isinstance(types, str) else [t for t in types if t != "null"]
+    if len(types) != 1 or "anyOf" in schema:
+        return pyarrow.string(), _to_json
+    json_type = types[0]
+
+    if json_type == "string":
+        if schema.get("format") == "date-time":
+            return pyarrow.timestamp("us", tz="UTC"), _to_timestamp
+        return pyarrow.string(), None
+    if json_type == "integer":
+        return pyarrow.int64(), None
+    if json_type == "number":
+        return pyarrow.float64(), None
+    if json_type == "boolean":
+        return pyarrow.bool_(), None
+    if json_type == "array" and "items" in schema:
+        item_type, converter = arrow_type(schema["items"])
+        return pyarrow.list_(item_type), converter and _list_converter(converter)
+    if (json_type == "object" and schema.get("properties")
+            and not schema.get("additionalProperties") and not schema.get("patternProperties")):
+        fields, converters = [], {}
+        for name, property_schema in schema["properties"].items():
+            field_type, converter = arrow_type(property_schema)
+            fields.append(pyarrow.field(name, field_type))
+            if converter:
+                converters[name] = converter
+        return pyarrow.struct(fields), converters and _struct_converter(converters)
+    return pyarrow.string(), _to_json
+
+
+def arrow_schema(schema: Dict) -> Tuple["pyarrow.Schema", List[Converter]]:
+    """Return the Arrow schema of the records described by a JSON *schema*
+    and the converter of each of its columns."""
+    fields, converters = [], []
+    for name, property_schema in schema["properties"].items():
+        field_type, converter = arrow_type(property_schema)
+        fields.append(pyarrow.field(name, field_type))
+        converters.append(converter)
+    return pyarrow.schema(fields), converters
+
+
+class _ParquetFile:
+    """A Parquet file being written for one partition of a stream."""
+
+    def __init__(self, path: str, partition: str, schema, converters: List[Converter],
+                 compression: str, row_group_size: int) -> None:
+        self.path = path
+        self.part_path = path + ".part"
+        self.partition = partition
+        self.schema = schema
+        self.converters = converters
+        self.row_group_size = row_group_size
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.raw = open(self.part_path, "wb")
+        self.writer = pyarrow.parquet.ParquetWriter(self.raw, schema, compression=compression)
+        self.rows = []
+
+    def write(self, record: Dict) -> None:
+        self.rows.append(record)
+        if len(self.rows) >= self.row_group_size:
+            self._write_row_group()
+
+    def _write_row_group(self) -> None:
+        columns = []
+        for field, converter in zip(self.schema, self.converters):
+            values = [row.get(field.name) for row in self.rows]
+            if converter:
+                values = [converter(value) for value in values]
+            columns.append(pyarrow.array(values, type=field.type))
+        self.writer.write_table(pyarrow.Table.from_arrays(columns, schema=self.schema))
+        self.rows = []
+
+    def finish(self) -> None:
+        """Write the remaining rows, close, fsync and move the file to its
+        final name."""
+        if self.rows:
+            self._write_row_group()
+        self.writer.close()
+        self.raw.flush()
+        os.fsync(self.raw.fileno())
+        self.raw.close()
+        os.replace(self.part_path, self.path)
+
+    def discard(self) -> None:
+        self.writer.close()
+        self.raw.close()
+        os.remove(self.part_path)
+
+
+class ParquetSink:
+    """Writes the records of high-volume streams to Parquet files partitioned
+    by board and emits BATCH messages referencing them.
+
+    Args:
+        directory (str): Directory the files are written to; created if missing.
+        row_group_size (int): Number of rows per row group.
+        compression (str): Parquet compression codec, e.g. ``snappy``, ``zstd`` or ``none``.
+        streams (tuple): Streams written to Parquet files.
+        fallback: Sink for the records of the other streams; RECORD messages
+            are written when None.
+        schemas (dict): JSON schema of each stream until its SCHEMA message
+            is written; defaults to the schemas in ``tap_monday/schemas``.
+    """
+
+    def __init__(self, directory: str, row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+                 compression: str = DEFAULT_PARQUET_COMPRESSION, streams=PARQUET_STREAMS,
+                 fallback=None, schemas: Optional[Dict] = None) -> None:
+        if pyarrow is None:
+            raise ImportError("Parquet output requires the 'pyarrow' package.")
+        if compression != "none" and not pyarrow.Codec.is_available(compression):
+            raise ValueError("Unsupported parquet compression '{}'.".format(compression))
+        if schemas is None:
+            from tap_monday.schema import get_schemas  # pylint: disable=import-outside-toplevel
+            schemas, _ = get_schemas()
+        self.directory = os.path.abspath(directory)
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.streams = set(streams)
+        self.fallback = fallback
+        self.schemas = schemas
+        self.run_id = "{}-{}".format(datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%S"), uuid.uuid4().hex[:6])
+        self._arrow_schemas = {}
+        self._files: Dict[str, _ParquetFile] = {}
+        self._sequence = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def write_schema(self, stream_name: str, schema: Dict) -> None:
+        """Use the schema of the stream's SCHEMA message, e.g. with the
+        ``_sdc_deleted_at`` of its deletion records, for its next files."""
+        if stream_name not in self.streams:
+            if self.fallback is not None:
+                self.fallback.write_schema(stream_name, schema)
+            return
+        self.schemas = {**self.schemas, stream_name: schema}
+        self._arrow_schemas.pop(stream_name, None)
+
+    def write_record(self, stream_name: str, record: Dict) -> None:
+        """Append a record to the current file of the stream's partition."""
+        if stream_name not in self.streams:
+            if self.fallback is not None:
+                self.fallback.write_record(stream_name, record)
+            else:
+                write_line(format_record_json(stream_name, codec.dumps(record)))
+            return
+        partition = record.get(PARTITION_KEY)
+        partition = DEFAULT_PARTITION if partition is None else quote(str(partition), safe="")
+        parquet_file = self._files.get(stream_name)
+        if parquet_file is not None and parquet_file.partition != partition:
+            self._finish(stream_name)
+            parquet_file = None
+        if parquet_file is None:
+            parquet_file = self._files[stream_name] = self._open(stream_name, partition)
+        parquet_file.write(record)
+
+    def write_record_json(self, stream_name: str, record_json: str) -> None:
+        """Append a serialized record."""
+        if stream_name not in self.streams:
+            if self.fallback is not None:
+                self.fallback.write_record_json(stream_name, record_json)
+            else:
+                write_line(format_record_json(stream_name, record_json))
+            return
+        self.write_record(stream_name, codec.loads(record_json))
+
+    def flush(self) -> None:
+        """Complete the files of all streams and emit their BATCH messages."""
+        for stream_name in list(self._files):
+            self._finish(stream_name)
+        if self.fallback is not None:
+            self.fallback.flush()
+
+    def open_files(self) -> List[str]:
+        """Return the paths of the files not complete yet, including those
+        of the fallback sink."""
+        paths = [parquet_file.path for parquet_file in self._files.values()]
+        if self.fallback is not None:
+            paths.extend(self.fallback.open_files())
+        return paths
+
+    def close(self) -> None:
+        """Remove incomplete files, e.g. after a failed sync."""
+        try:
+            for parquet_file in self._files.values():
+                parquet_file.discard()
+            self._files = {}
+        finally:
+            if self.fallback is not None:
+                self.fallback.close()
+
+    def _open(self, stream_name: str, partition: str) -> _ParquetFile:
+        if stream_name not in self._arrow_schemas:
+            self._arrow_schemas[stream_name] = arrow_schema(self.schemas[stream_name])
+        schema, converters = self._arrow_schemas[stream_name]
+        self._sequence += 1
+        path = os.path.join(self.directory, stream_name, "{}={}".format(PARTITION_KEY, partition),
+                            "{}-{:06d}.parquet".format(self.run_id, self._sequence))
+        return _ParquetFile(path, partition, schema, converters, self.compression, self.row_group_size)
+
+    def _finish(self, stream_name: str) -> None:
+        parquet_file = self._files.pop(stream_name)
+        parquet_file.finish()
+        self._fsync_directory(os.path.dirname(parquet_file.path))
+        write_line(codec.dumps({
+            "type": "BATCH",
+            "stream": stream_name,
+            "encoding": {"format": "parquet", "compression": self.compression},
+            "manifest": ["file://" + parquet_file.path],
+        }))
+
+    @staticmethod
+    def _fsync_directory(directory: str) -> None:
+        """Persist the rename of a completed file."""
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
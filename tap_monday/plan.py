@@ -0,0 +1,89 @@
+"""Per-stream sync plans.
+
+A sync consults the catalog entry of a stream much more often than it
+changes: whether the stream is selected for every record, whether a child is
+incremental for every bookmark written, and the GraphQL selection generated
+from its schema for every parent record of a child stream (twice, as
+``update_data_payload`` formats the root field again). A ``StreamPlan``
+resolves them once from the stream's schema and metadata, so that each later
+lookup is a plain attribute or dictionary access.
+
+``BaseStream.plan`` builds the plan of a stream on first use, and again if
+the stream is given another schema or metadata object. Schemas and metadata
+are not expected to be modified in place during a sync.
+
+A ``SyncPlan`` resolves the streams of the whole sync once from the catalog:
+the streams to sync, including the parents of the selected child streams,
+the root streams the sync iterates over, and the children to sync of each
+stream. ``SyncPlan.build`` then instantiates a root stream with the tree of
+its children to sync, each built once.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import singer
+from singer import metadata
+
+
+class StreamPlan:
+    """Sync settings of a stream resolved from its catalog entry.
+
+    Args:
+        schema (dict): JSON schema of the stream.
+        mdata (dict): Metadata map of the stream (``singer.metadata.to_map``).
+        replication_method (str): ``INCREMENTAL`` or ``FULL_TABLE``.
+        replication_keys (list): Replication keys of the stream.
+    """
+
+    def __init__(self, schema: Dict, mdata: Dict, replication_method: str,
+                 replication_keys: Optional[List[str]]) -> None:
+        self.schema = schema
+        self.metadata = mdata
+        self.selected = bool(metadata.get(mdata, (), "selected"))
+        self.incremental = (replication_method or "").upper() == "INCREMENTAL"
+        self.replication_key = replication_keys[0] if replication_keys else None
+        # GraphQL selection sets generated from the schema, by (indent, level).
+        self.selections: Dict[Tuple[int, int], str] = {}
+
+    def is_current(self, schema: Dict, mdata: Dict) -> bool:
+        """Return True if the plan was built from these schema and metadata objects."""
+        return self.schema is schema and self.metadata is mdata
+
+
+class SyncPlan:
+    """Streams to sync and their topology, resolved from the catalog.
+
+    Args:
+        catalog (singer.Catalog): Catalog of the sync.
+        state (dict): State of the sync, which orders the selected streams.
+        streams (dict): Stream classes by name.
+    """
+
+    def __init__(self, catalog: singer.Catalog, state: Dict, streams: Dict) -> None:
+        self.catalog = catalog
+        self.streams = streams
+        self.selected_streams = [entry.stream for entry in catalog.get_selected_streams(state)]
+        # The parents of the selected child streams are synced too, as they
+        # drive the sync of their children. The appended parents are walked
+        # as well, for their own parents.
+        self.streams_to_sync = list(self.selected_streams)
+        for name in self.streams_to_sync:
+            parent = getattr(streams.get(name), "parent", None)
+            if parent and parent not in self.streams_to_sync:
+                self.streams_to_sync.append(parent)
+        self.root_streams = [
+            name for name in self.streams_to_sync if not getattr(streams.get(name), "parent", None)
+        ]
+        self.children: Dict[str, List[str]] = {
+            name: [child for child in getattr(streams.get(name), "children", None) or []
+                   if child in self.streams_to_sync]
+            for name in self.streams_to_sync
+        }
+
+    def build(self, stream_name: str, client, pipeline=None):
+        """Return the stream *stream_name* with its children to sync in
+        ``child_to_sync``, recursively, all using *pipeline*."""
+        stream = self.streams[stream_name](client, self.catalog.get_stream(stream_name))
+        stream.pipeline = pipeline
+        for child in self.children[stream_name]:
+            stream.child_to_sync.append(self.build(child, client, pipeline))
+        return stream
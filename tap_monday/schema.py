@@ -1,12 +1,18 @@
+import argparse
 import os
 import json
 import singer
-from typing import Dict, Tuple
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 from singer import metadata
+from tap_monday import codec
 from tap_monday.streams import STREAMS
 
 LOGGER = singer.get_logger()
 
+# Schemas and metadata of all streams, precompiled by `python -m tap_monday.schema`.
+SCHEMA_BUNDLE = "schema_bundle.json"
+
 
 def get_abs_path(path: str) -> str:
     """
@@ -37,7 +43,49 @@ def load_schema_references() -> Dict:
     return refs
 
 
-def get_schemas() -> Tuple[Dict, Dict]:
+@lru_cache(maxsize=None)
+def read_schema_bundle() -> Optional[bytes]:
+    """
+    Read the precompiled schema bundle once, or return None if it is missing.
+    """
+    try:
+        with open(get_abs_path(SCHEMA_BUNDLE), "rb") as bundle_file:
+            return bundle_file.read()
+    except FileNotFoundError:
+        return None
+
+
+def load_schema_bundle() -> Optional[Tuple[Dict, Dict]]:
+    """
+    Return the schemas and metadata of the precompiled bundle, or None if there is no bundle.
+    A new copy is returned on every call, as callers modify them.
+    """
+    bundle = read_schema_bundle()
+    if bundle is None:
+        return None
+    bundle = codec.loads(bundle)
+    if list(bundle["schemas"]) != list(STREAMS):
+        LOGGER.warning("The schema bundle does not match the streams of the tap, ignoring it.")
+        return None
+    for mdata in bundle["metadata"].values():
+        for entry in mdata:
+            entry["breadcrumb"] = tuple(entry["breadcrumb"])
+    return bundle["schemas"], bundle["metadata"]
+
+
+def get_schemas(use_bundle: bool = True) -> Tuple[Dict, Dict]:
+    """
+    Return the schema and metadata of each stream for the catalog, from the
+    precompiled bundle when there is one, otherwise from the schema files.
+    """
+    if use_bundle:
+        bundle = load_schema_bundle()
+        if bundle is not None:
+            return bundle
+    return compile_schemas()
+
+
+def compile_schemas() -> Tuple[Dict, Dict]:
     """
     Load the schema references, prepare metadata for each streams and return schema and metadata for the catalog.
     """
@@ -78,3 +126,25 @@ def get_schemas() -> Tuple[Dict, Dict]:
 
     return schemas, field_metadata
 
+
+
+def write_schema_bundle(path: str = None) -> None:
+    """
+    Compile the schema files and the metadata of all streams into the bundle.
+    """
+    schemas, field_metadata = compile_schemas()
+    with open(path or get_abs_path(SCHEMA_BUNDLE), "w") as bundle_file:
+        json.dump({"schemas": schemas, "metadata": field_metadata}, bundle_file, separators=(",", ":"))
+        bundle_file.write("\n")
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Precompile the stream schemas and metadata into {}.".format(SCHEMA_BUNDLE))
+    parser.add_argument("--output", help="Path of the bundle (default: the one loaded by the tap).")
+    args = parser.parse_args(argv)
+    write_schema_bundle(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Incremental parsing of paginated GraphQL responses.
+
+A ``board_items`` page holds every item of the page together with all of its
+column values, which can add up to tens of megabytes. Instead of decoding the
+whole body before the first record can be processed, ``iter_page_items``
+parses the body chunk by chunk as it is downloaded and yields each item of
+the page as soon as it is complete, so memory is bounded by a single item.
+
+Streaming requires the optional ``ijson`` package (``pip install
+tap-monday[streaming]``). Without it the body is decoded in one go and the
+items are yielded from the decoded document, with the same results.
+"""
+from typing import Any, Dict, Generator, Iterable, List, Optional, Tuple
+
+from tap_monday import codec
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+CHUNK_SIZE = 64 * 1024
+SCALAR_EVENTS = ("null", "boolean", "integer", "double", "number", "string")
+
+PageResult = Tuple[Dict[str, Any], Optional[List[Dict]]]
+
+
+def is_available() -> bool:
+    """Returns True when the optional ``ijson`` dependency is installed."""
+    return ijson is not None
+
+
+def iter_response_chunks(response, chunk_size: int = CHUNK_SIZE) -> Iterable[bytes]:
+    """Iterates over the body of a ``requests`` or ``httpx`` response opened
+    in streaming mode."""
+    if hasattr(response, "iter_content"):
+        return response.iter_content(chunk_size=chunk_size)
+    return response.iter_bytes(chunk_size)
+
+
+def iter_page_items(
+    chunks: Iterable[bytes], page_prefix: str, items_key: str = "items"
+) -> Generator[Dict, None, PageResult]:
+    """Yields the objects of the ``items_key`` array of the page found at
+    *page_prefix*, a dotted path in which ``item`` stands for any element of
+    an array (e.g. ``data.boards.item.items_page``).
+
+    Returns (as the generator's return value) the scalar fields of the page,
+    such as its ``cursor``, and the GraphQL ``errors`` of the response, or
+    None when there are none.
+    """
+    if ijson is None:
+        return (yield from _iter_page_items_decoded(b"".join(chunks), page_prefix, items_key))
+    return (yield from _iter_page_items_streamed(chunks, page_prefix, items_key))
+
+
+def _iter_page_items_streamed(chunks, page_prefix, items_key):
+    items_prefix = f"{page_prefix}.{items_key}.item"
+    field_prefix = page_prefix + "."
+    page = {}
+    errors = None
+    builder = None
+    builder_prefix = None
+
+    events = ijson.sendable_list()
+    parser = ijson.parse_coro(events, use_float=True)
+    for chunk in _chunks_then_end(chunks):
+        if chunk:
+            parser.send(chunk)
+        else:
+            parser.close()
+        for prefix, event, value in events:
+            if builder is not None:
+                builder.event(event, value)
+                if prefix == builder_prefix and event in ("end_map", "end_array"):
+                    if builder_prefix == "errors":
+                        errors = builder.value
+                    else:
+                        yield builder.value
+                    builder = None
+            elif prefix in (items_prefix, "errors") and event in ("start_map", "start_array"):
+                builder_prefix = prefix
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+            elif event in SCALAR_EVENTS and prefix.startswith(field_prefix):
+                field = prefix[len(field_prefix):]
+                if "." not in field:
+                    page[field] = value
+        del events[:]
+    return page, errors
+
+
+def _chunks_then_end(chunks):
+    """Yields the chunks, then an empty chunk marking the end of the body."""
+    for chunk in chunks:
+        if chunk:
+            yield chunk
+    yield b""
+
+
+def _iter_page_items_decoded(body, page_prefix, items_key):
+    document = codec.loads(body) if body else {}
+    if not isinstance(document, dict):
+        document = {}
+    page = {}
+    for node in _find(document, page_prefix.split(".")):
+        if not isinstance(node, dict):
+            continue
+        for key, value in node.items():
+            if key == items_key:
+                yield from value or []
+            elif not isinstance(value, (dict, list)):
+                page[key] = value
+    return page, document.get("errors")
+
+
+def _find(node: Any, parts: List[str]) -> Iterable[Any]:
+    """Yields the values found at a dotted ijson-style path."""
+    if not parts:
+        yield node
+        return
+    head, rest = parts[0], parts[1:]
+    if head == "item" and isinstance(node, list):
+        for element in node:
+            yield from _find(element, rest)
+    elif isinstance(node, dict) and head in node:
+        yield from _find(node[head], rest)
@@ -1,42 +1,71 @@
-from tap_monday.streams.account import Account
-from tap_monday.streams.assets import Assets
-from tap_monday.streams.audit_event_catalogue import AuditEventCatalogue
-from tap_monday.streams.boards import Boards
-from tap_monday.streams.board_activity_logs import BoardActivityLogs
-from tap_monday.streams.board_columns import BoardColumns
-from tap_monday.streams.board_groups import BoardGroups
-from tap_monday.streams.board_items import BoardItems
-from tap_monday.streams.board_views import BoardViews
-from tap_monday.streams.column_values import ColumnValues
-from tap_monday.streams.docs import Docs
-from tap_monday.streams.folders import Folders
-from tap_monday.streams.platform_api import PlatformApi
-from tap_monday.streams.reply import Reply
-from tap_monday.streams.tags import Tags
-from tap_monday.streams.teams import Teams
-from tap_monday.streams.updates import Updates
-from tap_monday.streams.users import Users
-from tap_monday.streams.workspaces import Workspaces
-
-STREAMS = {
-    "account": Account,
-    "assets": Assets,
-    "audit_event_catalogue": AuditEventCatalogue,
-    "boards": Boards,
-    "board_activity_logs": BoardActivityLogs,
-    "board_columns": BoardColumns,
-    "board_groups": BoardGroups,
-    "board_items": BoardItems,
-    "board_views": BoardViews,
-    "column_values": ColumnValues,
-    "docs": Docs,
-    "folders": Folders,
-    "platform_api": PlatformApi,
-    "reply": Reply,
-    "tags": Tags,
-    "teams": Teams,
-    "updates": Updates,
-    "users": Users,
-    "workspaces": Workspaces,
+"""Stream classes, by tap_stream_id.
+
+The module of a stream is only imported when its class is first looked up in
+``STREAMS``, so that a sync does not import the streams it does not select.
+"""
+import importlib
+from collections.abc import Mapping
+from typing import Dict, Iterator, Type
+
+STREAM_CLASSES = {
+    "account": "tap_monday.streams.account.Account",
+    "assets": "tap_monday.streams.assets.Assets",
+    "audit_event_catalogue": "tap_monday.streams.audit_event_catalogue.AuditEventCatalogue",
+    "boards": "tap_monday.streams.boards.Boards",
+    "board_activity_logs": "tap_monday.streams.board_activity_logs.BoardActivityLogs",
+    "board_columns": "tap_monday.streams.board_columns.BoardColumns",
+    "board_groups": "tap_monday.streams.board_groups.BoardGroups",
+    "board_items": "tap_monday.streams.board_items.BoardItems",
+    "board_views": "tap_monday.streams.board_views.BoardViews",
+    "column_values": "tap_monday.streams.column_values.ColumnValues",
+    "docs": "tap_monday.streams.docs.Docs",
+    "folders": "tap_monday.streams.folders.Folders",
+    "platform_api": "tap_monday.streams.platform_api.PlatformApi",
+    "reply": "tap_monday.streams.reply.Reply",
+    "tags": "tap_monday.streams.tags.Tags",
+    "teams": "tap_monday.streams.teams.Teams",
+    "updates": "tap_monday.streams.updates.Updates",
+    "users": "tap_monday.streams.users.Users",
+    "workspaces": "tap_monday.streams.workspaces.Workspaces",
 }
 
+
+def _import_class(path: str) -> Type:
+    module_name, class_name = path.rsplit(".", 1)
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+class StreamRegistry(Mapping):
+    """Read-only mapping of stream names to stream classes, importing each
+    class on first access."""
+
+    def __init__(self, classes: Dict[str, str]) -> None:
+        self._paths = dict(classes)
+        self._classes = {}
+
+    def __getitem__(self, stream_name: str) -> Type:
+        stream_cls = self._classes.get(stream_name)
+        if stream_cls is None:
+            stream_cls = self._classes[stream_name] = _import_class(self._paths[stream_name])
+        return stream_cls
+
+    def __contains__(self, stream_name) -> bool:
+        return stream_name in self._paths
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+
+STREAMS = StreamRegistry(STREAM_CLASSES)
+
+_CLASS_PATHS = {path.rsplit(".", 1)[1]: path for path in STREAM_CLASSES.values()}
+
+
+def __getattr__(name: str):
+    """Import stream classes on access, e.g. ``from tap_monday.streams import Boards``."""
+    if name in _CLASS_PATHS:
+        return _import_class(_CLASS_PATHS[name])
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
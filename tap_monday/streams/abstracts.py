@@ -1,17 +1,21 @@
+import time
 from abc import ABC, abstractmethod
-import json
-from typing import Any, Dict, Tuple, Iterator, List
+from typing import Any, Dict, Tuple, Iterator, List, Optional
 from singer import (
     Transformer,
     get_bookmark,
     get_logger,
-    metrics,
     write_bookmark,
-    write_record,
-    write_schema,
     metadata
 )
+from tap_monday import codec, metrics
+from tap_monday.change_index import (
+    DELETED_AT, DELETED_AT_SCHEMA, ChangeIndex, IndexStore, collection_digest, record_digest
+)
+from tap_monday.complexity import MAX_QUERY_COMPLEXITY, largest_safe_page_size
 from tap_monday.exceptions import MondayForbiddenError, MondayGraphQLInternalError
+from tap_monday.output import write_record, write_record_json, write_schema
+from tap_monday.plan import StreamPlan
 
 LOGGER = get_logger()
 
@@ -44,6 +48,11 @@ class BaseStream(ABC):
     excluded_fields = []
     pagination_supported = False
     cursor = None
+    pipeline = None
+    derived = False
+    _plan = None
+    _pipelined_count = 0
+    _pipelined_max = None
 
     def __init__(self, client=None, catalog=None) -> None:
         self.client = client
@@ -55,6 +64,12 @@ class BaseStream(ABC):
         self.data_payload = {}
         self.http_method = "POST"
         self.page_size = self.client.config.get("page_size", self.page_size) if client else self.page_size
+        self.allow_partial_data = bool(self.client.config.get("allow_partial_data")) if client else False
+        self.stream_responses = bool(self.client.config.get("stream_responses")) if client else False
+        self.change_detection = bool(self.client.config.get("change_detection")) if client else False
+        self.emit_deletions = bool(self.client.config.get("change_detection_deletions")) if client else False
+        if client:
+            self.page_size = self.get_safe_page_size()
 
     @property
     @abstractmethod
@@ -87,16 +102,13 @@ class BaseStream(ABC):
         Returns True if accessible, False if not.
         Child streams always return True (access is governed by the parent check).
         """
-        if self.parent:
-            return True
-
-        root_bare = (self.root_field or "").split("(")[0].strip()
-        if not root_bare:
+        query = self.get_access_query()
+        if query is None:
             return True
 
         url = self.get_url_endpoint()
         self.update_params()
-        body = json.dumps({"query": f"query {{ {root_bare} {{ {self.check_access_fields} }} }}"})
+        body = codec.dumps({"query": query})
         try:
             self.client.probe_request(self.http_method, url, self.params, self.headers, body=body)
             return True
@@ -115,8 +127,52 @@ class BaseStream(ABC):
             )
             return False
 
-    def is_selected(self):
-        return metadata.get(self.metadata, (), "selected")
+    def get_access_query(self) -> Optional[str]:
+        """
+        Return the query probing read access to the stream, or None when the
+        stream is not probed (child streams and streams without a root field).
+        """
+        if self.parent:
+            return None
+        root_bare = (self.root_field or "").split("(")[0].strip()
+        if not root_bare:
+            return None
+        return f"query {{ {root_bare} {{ {self.check_access_fields} }} }}"
+
+    def get_access_probes(self) -> List[str]:
+        """
+        Return the queries sent by check_access() and prune_inaccessible_fields(),
+        which discovery sends together as a single request.
+        """
+        query = self.get_access_query()
+        return [query] if query else []
+
+    def get_safe_page_size(self) -> int:
+        """
+        Return the largest page size, up to the configured one, whose query
+        stays within the per-query complexity budget.
+        """
+        if not isinstance(self.page_size, int) or "{limit}" not in (self.root_field or ""):
+            return self.page_size
+        budget = self.client.config.get("max_query_complexity") or MAX_QUERY_COMPLEXITY
+        page_size = largest_safe_page_size(self, self.page_size, int(budget))
+        if page_size < self.page_size:
+            LOGGER.info(
+                "Stream '%s': reducing page size from %s to %s to stay within the query complexity budget of %s.",
+                self.tap_stream_id, self.page_size, page_size, budget,
+            )
+        return page_size
+
+    @property
+    def plan(self) -> StreamPlan:
+        """The sync settings resolved from the stream's schema and metadata."""
+        plan = self._plan
+        if plan is None or not plan.is_current(self.schema, self.metadata):
+            plan = self._plan = StreamPlan(self.schema, self.metadata, self.replication_method, self.replication_keys)
+        return plan
+
+    def is_selected(self) -> bool:
+        return self.plan.selected
 
     def prune_inaccessible_fields(self, schema: dict, field_metadata: list) -> None:
         """Probe individual fields that may not be accessible on all plans and
@@ -151,29 +207,195 @@ class BaseStream(ABC):
 
     def get_records(self, parent_record: Dict = None) -> Iterator:
         """Interacts with api client interaction and pagination."""
+        if self.stream_responses and self.get_stream_page_prefix():
+            yield from self.get_streamed_records(parent_record)
+            return
         next_page = 1
         while next_page:
             response = self.client.make_request(
-                self.http_method, self.url_endpoint, self.params, self.headers, body=json.dumps(self.data_payload), path=self.path
+                self.http_method, self.url_endpoint, self.params, self.headers, body=codec.dumps(self.data_payload),
+                path=self.path, allow_partial=self.allow_partial_data
             )
+            if isinstance(response, dict) and response.get("errors"):
+                self.handle_partial_errors(response["errors"])
             raw_records = self.get_dot_path_value(response, self.data_key)
             raw_records = self.parse_raw_records(raw_records)
             yield from raw_records
 
             next_page = self.update_pagination_key(raw_records, parent_record, next_page)
 
+    def get_stream_page_prefix(self) -> str:
+        """
+        Return the path of the page object in the response (in ``ijson``
+        prefix notation) for streams whose pages can be parsed while they are
+        downloaded, or None. Such streams set their pagination state from the
+        page fields in ``parse_streamed_page``.
+        """
+        return None
+
+    def parse_streamed_page(self, page: Dict) -> None:
+        """Update the pagination state from the scalar fields of a streamed page."""
+
+    def get_streamed_records(self, parent_record: Dict = None) -> Iterator:
+        """
+        Like ``get_records``, but yields the records of each page while the
+        response is being downloaded instead of after decoding the whole page
+        (enabled by the ``stream_responses`` config option).
+        """
+        next_page = 1
+        while next_page:
+            page, errors = yield from self.client.stream_request(
+                self.http_method, self.url_endpoint, self.params, self.headers, body=codec.dumps(self.data_payload),
+                path=self.path, page_prefix=self.get_stream_page_prefix(), allow_partial=self.allow_partial_data
+            )
+            if errors:
+                self.handle_partial_errors(errors)
+            self.parse_streamed_page(page)
+            next_page = self.update_pagination_key(None, parent_record, next_page)
+
+    def handle_partial_errors(self, errors: List[Dict]) -> None:
+        """
+        Called with the GraphQL errors of a response that also returned data
+        (only when the ``allow_partial_data`` config option is enabled). The
+        records that were resolved are still synced; the default
+        implementation logs the errors.
+        """
+        for error in errors:
+            LOGGER.warning(
+                "Stream '%s': partial response, path %s could not be resolved: %s",
+                self.tap_stream_id,
+                ".".join(str(part) for part in error.get("path") or []) or "unknown",
+                error.get("message"),
+            )
+
+    def uses_pipeline(self) -> bool:
+        """
+        Return True when records are transformed in the process pool of
+        ``self.pipeline``. Only streams without children to sync use it, as
+        children are synced from each record in turn.
+        """
+        return self.pipeline is not None and not self.child_to_sync
+
+    def sync_with_pipeline(self, counter, parent_obj: Dict = None, bookmark_date: Any = None) -> Any:
+        """
+        Transform and write the records through ``self.pipeline``. With a
+        ``bookmark_date``, records older than it are skipped; returns the
+        largest replication value written.
+        """
+        replication_key = self.replication_keys[0] if bookmark_date is not None else None
+        records = (self.modify_object(record, parent_obj) for record in self.get_records(parent_obj))
+        max_bookmark_date = bookmark_date
+        selected = self.is_selected()
+        for record_json, record_timestamp in self.pipeline.transform(
+                self.tap_stream_id, self.schema, self.metadata, records, replication_key):
+            if bookmark_date is not None:
+                if record_timestamp < bookmark_date:
+                    continue
+                max_bookmark_date = max(max_bookmark_date, record_timestamp)
+            if selected:
+                write_record_json(self.tap_stream_id, record_json)
+                counter.increment()
+        return max_bookmark_date
+
+    def submit_to_pipeline(self, state: Dict, parent_obj: Dict, bookmark_date: Any = None) -> None:
+        """
+        Hand the records of a child stream to ``self.pipeline``, which
+        collects them into batches spanning parent records and writes them
+        as the batches complete, at the latest before the next SCHEMA or
+        STATE message. With a ``bookmark_date``, records older than it are
+        skipped. The records are counted (and the bookmark of incremental
+        streams advanced) by ``flush_pipelined_records``.
+        """
+        replication_key = self.replication_keys[0] if bookmark_date is not None else None
+        records = (self.modify_object(record, parent_obj) for record in self.get_records(parent_obj))
+        selected = self.is_selected()
+
+        def write(record_json, record_timestamp):
+            if bookmark_date is not None:
+                if record_timestamp < bookmark_date:
+                    return
+                if self._pipelined_max is None or record_timestamp > self._pipelined_max:
+                    self._pipelined_max = record_timestamp
+            if selected:
+                write_record_json(self.tap_stream_id, record_json)
+                self._pipelined_count += 1
+
+        self.pipeline.submit(self.tap_stream_id, self.schema, self.metadata, records, replication_key,
+                             write, lambda: self.flush_pipelined_records(state))
+
+    def flush_pipelined_records(self, state: Dict) -> None:
+        """
+        Count the records of a child stream written through the pipeline
+        since the last flush.
+        """
+        with metrics.record_counter(self.tap_stream_id) as counter:
+            counter.increment(self._pipelined_count)
+        self._pipelined_count, self._pipelined_max = 0, None
+
+    def clear_checkpoint(self, state: Dict) -> Dict:
+        """
+        Remove the progress checkpoint a stream keeps in state while it is
+        synced from its parent records, once the parent completed.
+        """
+        return state
+
+    def save_change_index(self, state: Dict) -> Dict:
+        """
+        Save the change index a stream keeps while it is synced from its
+        parent records, once the parent completed.
+        """
+        return state
+
+    def sync_child_streams(self, state: Dict, transformer: Transformer, record: Dict, page: List[Dict]) -> None:
+        """
+        Sync the child streams of a parent record. Derived children are not
+        synced per record: the record is added to *page*, which is handed to
+        them with ``sync_derived_children`` once it holds a page of records.
+        """
+        for child in self.child_to_sync:
+            if not child.derived:
+                child.sync(state=state, transformer=transformer, parent_obj=record)
+        if any(child.derived for child in self.child_to_sync):
+            page.append(record)
+            if len(page) >= self.page_size:
+                self.sync_derived_children(state, transformer, page)
+
+    def sync_derived_children(self, state: Dict, transformer: Transformer, page: List[Dict]) -> None:
+        """Sync the derived children from a page of parent records and empty it."""
+        if not page:
+            return
+        for child in self.child_to_sync:
+            if child.derived:
+                child.sync_from_parents(state, transformer, page)
+        page.clear()
+
     def write_schema(self) -> None:
         """
         Write a schema message.
         """
         try:
-            write_schema(self.tap_stream_id, self.schema, self.key_properties)
+            write_schema(self.tap_stream_id, self.get_output_schema(), self.key_properties)
         except OSError as err:
             LOGGER.error(
                 "OS Error while writing schema for: {}".format(self.tap_stream_id)
             )
             raise err
 
+    def get_output_schema(self) -> Dict:
+        """
+        Return the schema written in the SCHEMA message of the stream: its
+        schema, with ``_sdc_deleted_at`` when it writes deletion records.
+        """
+        if not self.writes_deletions():
+            return self.schema
+        schema = dict(self.schema)
+        schema["properties"] = {**self.schema.get("properties", {}), DELETED_AT: DELETED_AT_SCHEMA}
+        return schema
+
+    def writes_deletions(self) -> bool:
+        """Return True when the stream writes deletion records."""
+        return False
+
     def update_params(self, **kwargs) -> None:
         """
         Update params for the stream
@@ -361,17 +583,21 @@ class BaseStream(ABC):
         Returns:
             str: GraphQL query string
         """
-        extra_fields = self.extra_fields or {}
-        schema_properties = self.schema.get("properties", {})
-
-        extra_tree = self._collect_extra_tree(extra_fields)
-        inner_body = self._process_properties(
-            schema_properties,
-            depth=level,
-            parent_path="",
-            extras_branch=extra_tree,
-            indent=indent
-        )
+        # The selection only depends on the schema: it is generated once per plan.
+        selections = self.plan.selections
+        inner_body = selections.get((indent, level))
+        if inner_body is None:
+            extra_fields = self.extra_fields or {}
+            schema_properties = self.schema.get("properties", {})
+
+            extra_tree = self._collect_extra_tree(extra_fields)
+            inner_body = selections[(indent, level)] = self._process_properties(
+                schema_properties,
+                depth=level,
+                parent_path="",
+                extras_branch=extra_tree,
+                indent=indent
+            )
 
         if root_field:
             outer_indent = " " * indent * level
@@ -403,6 +629,14 @@ class IncrementalStream(BaseStream):
             state, stream, key or self.replication_keys[0], value
         )
 
+    def flush_pipelined_records(self, state: Dict) -> None:
+        """Also advance the bookmark to the largest replication value
+        written through the pipeline."""
+        max_bookmark_date = self._pipelined_max
+        super().flush_pipelined_records(state)
+        if max_bookmark_date is not None:
+            self.write_bookmark(state, self.tap_stream_id, value=max_bookmark_date)
+
     def sync(
         self,
         state: Dict,
@@ -415,24 +649,36 @@ class IncrementalStream(BaseStream):
         self.url_endpoint = self.get_url_endpoint(parent_obj)
         self._graphql_query = self.get_graphql_query(self.root_field)
         self.update_data_payload(graphql_query=self._graphql_query, parent_obj=parent_obj)
+        if self.uses_pipeline() and self.parent:
+            # Counted once written, see flush_pipelined_records.
+            self.submit_to_pipeline(state, parent_obj, bookmark_date)
+            return 0, state
 
         with metrics.record_counter(self.tap_stream_id) as counter:
+            if self.uses_pipeline():
+                current_max_bookmark_date = self.sync_with_pipeline(counter, parent_obj, bookmark_date)
+                state = self.write_bookmark(state, self.tap_stream_id, value=current_max_bookmark_date)
+                return counter.value, state
+
+            page = []
+            selected = self.is_selected()
+            replication_key = self.replication_keys[0]
             for record in self.get_records(parent_obj):
                 record = self.modify_object(record, parent_obj)
                 transformed_record = transformer.transform(
                     record, self.schema, self.metadata
                 )
-                record_timestamp = transformed_record[self.replication_keys[0]]
+                record_timestamp = transformed_record[replication_key]
                 if record_timestamp >= bookmark_date:
-                    if self.is_selected():
+                    if selected:
                         write_record(self.tap_stream_id, transformed_record)
                         counter.increment()
 
                     current_max_bookmark_date = max(
                         current_max_bookmark_date, record_timestamp
                     )
-                    for child in self.child_to_sync:
-                        child.sync(state=state, transformer=transformer, parent_obj=record)
+                    self.sync_child_streams(state, transformer, record, page)
+            self.sync_derived_children(state, transformer, page)
 
             state = self.write_bookmark(state, self.tap_stream_id, value=current_max_bookmark_date)
             return counter.value, state
@@ -440,6 +686,16 @@ class IncrementalStream(BaseStream):
 
 class FullTableStream(BaseStream):
     """Base Class for Incremental Stream."""
+    def uses_change_detection(self) -> bool:
+        """
+        Return True when only the new and changed records are written (the
+        ``change_detection`` config option). Only applies to root streams.
+        """
+        return self.change_detection and not self.parent
+
+    def writes_deletions(self) -> bool:
+        return self.emit_deletions and self.uses_change_detection()
+
     def sync(
         self,
         state: Dict,
@@ -450,22 +706,134 @@ class FullTableStream(BaseStream):
         self._graphql_query = self.get_graphql_query(self.root_field)
         self.url_endpoint = self.get_url_endpoint(parent_obj)
         self.update_data_payload(graphql_query=self._graphql_query, parent_obj=parent_obj)
+        selected = self.is_selected()
+        if selected and self.uses_change_detection():
+            return self.sync_changes(state, transformer)
+        if self.uses_pipeline() and self.parent:
+            # Counted once written, see flush_pipelined_records.
+            self.submit_to_pipeline(state, parent_obj)
+            return 0, state
+
         with metrics.record_counter(self.tap_stream_id) as counter:
+            if self.uses_pipeline():
+                self.sync_with_pipeline(counter, parent_obj)
+                return counter.value, state
+
+            page = []
             for record in self.get_records(parent_obj):
                 record = self.modify_object(record, parent_obj)
                 transformed_record = transformer.transform(
                     record, self.schema, self.metadata
                 )
-                if self.is_selected():
+                if selected:
                     write_record(self.tap_stream_id, transformed_record)
                     counter.increment()
 
-                for child in self.child_to_sync:
-                    child.sync(state=state, transformer=transformer, parent_obj=record)
+                self.sync_child_streams(state, transformer, record, page)
+            self.sync_derived_children(state, transformer, page)
+
+            return counter.value, state
 
+    def sync_changes(self, state: Dict, transformer: Transformer) -> Tuple[int, Dict]:
+        """
+        Write the records that are new or changed since the previous sync
+        and, with ``change_detection_deletions``, deletion records for the
+        records that are gone. Records are transformed in the main process,
+        as their digests are computed from the transformed records.
+        """
+        store = IndexStore.from_config(self.client.config)
+        index = ChangeIndex(self.key_properties, store.load(state, self.tap_stream_id))
+        with metrics.record_counter(self.tap_stream_id) as counter:
+            page = []
+            for record in self.get_records():
+                record = self.modify_object(record)
+                transformed_record = transformer.transform(record, self.schema, self.metadata)
+                if index.is_changed(transformed_record):
+                    write_record(self.tap_stream_id, transformed_record)
+                    counter.increment()
+                self.sync_child_streams(state, transformer, record, page)
+            self.sync_derived_children(state, transformer, page)
+
+            deleted = 0
+            if self.emit_deletions:
+                for key in index.deleted_keys():
+                    write_record(self.tap_stream_id, index.deletion_record(key))
+                    deleted += 1
+                counter.increment(deleted)
+
+            tags = {"endpoint": self.tap_stream_id}
+            metrics.log(LOGGER, metrics.Point("counter", "records_unchanged", index.unchanged, tags))
+            metrics.log(LOGGER, metrics.Point("counter", "records_deleted", deleted, tags))
+            store.save(state, self.tap_stream_id, index.digests)
             return counter.value, state
 
 
+class DerivedStreamMixin(ABC):
+    """
+    Mixin for child streams whose records are embedded in the parent records
+    (e.g. the assets and replies of an update) rather than requested from
+    the API. The parent hands them whole pages of its records, which are
+    extracted, transformed and written in one pass, with one record counter
+    and one bookmark update per page.
+    """
+    derived = True
+
+    @abstractmethod
+    def extract_records(self, parent_record: Dict) -> List[Dict]:
+        """Return the records of the stream embedded in *parent_record*."""
+
+    def sync(self, state: Dict, transformer: Transformer, parent_obj: Dict = None) -> Dict:
+        """Sync the records of a single parent record."""
+        return self.sync_from_parents(state, transformer, [parent_obj])
+
+    def sync_from_parents(self, state: Dict, transformer: Transformer, parent_records: List[Dict]) -> Tuple[int, Dict]:
+        """Sync the records embedded in a page of parent records."""
+        incremental = self.plan.incremental
+        replication_key = self.plan.replication_key if incremental else None
+        bookmark_date = self.get_bookmark(state, self.tap_stream_id) if incremental else None
+        max_bookmark_date = bookmark_date
+        records = [
+            self.modify_object(record, parent_record)
+            for parent_record in parent_records
+            for record in self.extract_records(parent_record)
+        ]
+
+        if self.uses_pipeline():
+            results = self.pipeline.transform(self.tap_stream_id, self.schema, self.metadata, records, replication_key)
+            write = write_record_json
+        else:
+            results = self._transform_records(transformer, records, replication_key)
+            write = write_record
+
+        selected = self.is_selected()
+        written = 0
+        synced = []
+        for record, (transformed_record, record_timestamp) in zip(records, results):
+            if incremental:
+                if record_timestamp < bookmark_date:
+                    continue
+                max_bookmark_date = max(max_bookmark_date, record_timestamp)
+            if selected:
+                write(self.tap_stream_id, transformed_record)
+                written += 1
+            synced.append(record)
+
+        with metrics.record_counter(self.tap_stream_id) as counter:
+            counter.increment(written)
+        page = []
+        for record in synced:
+            self.sync_child_streams(state, transformer, record, page)
+        self.sync_derived_children(state, transformer, page)
+        if incremental:
+            state = self.write_bookmark(state, self.tap_stream_id, value=max_bookmark_date)
+        return written, state
+
+    def _transform_records(self, transformer: Transformer, records: List[Dict], replication_key: str = None):
+        for record in records:
+            transformed_record = transformer.transform(record, self.schema, self.metadata)
+            yield transformed_record, transformed_record[replication_key] if replication_key else None
+
+
 class ParentChildBookmarkMixin:
     """
     Mixin to extend bookmark handling for streams with child streams.
@@ -480,7 +848,7 @@ class ParentChildBookmarkMixin:
         for child in self.child_to_sync:
             if not child.is_selected():
                 continue
-            if getattr(child, "replication_method", "").upper() == "FULL_TABLE":
+            if not child.plan.incremental:
                 continue
 
             child_replication_key = child.replication_keys[0]
@@ -495,15 +863,18 @@ class ParentChildBookmarkMixin:
 
     def write_bookmark(self, state: Dict, stream: str, key: Any = None, value: Any = None) -> Dict:
         """
-        Write the bookmark value to the parent and all incremental children.
+        Write the bookmark value to the parent and all incremental children,
+        and clear the checkpoints of the children, which are complete.
         """
         if self.is_selected():
             super().write_bookmark(state, stream, value=value)
 
         for child in self.child_to_sync:
+            child.clear_checkpoint(state)
+            child.save_change_index(state)
             if not child.is_selected():
                 continue
-            if getattr(child, "replication_method", "").upper() == "FULL_TABLE":
+            if not child.plan.incremental:
                 continue
 
             bookmark_key = f"{self.tap_stream_id}_{self.replication_keys[0]}"
@@ -511,3 +882,85 @@ class ParentChildBookmarkMixin:
 
         return state
 
+
+class CollectionChangeMixin:
+    """
+    Mixin for child streams whose records are a collection of the parent
+    record (the columns, groups and views of a board), stamped with fields
+    of the parent that change with any edit of it (e.g. ``updated_at``).
+
+    With the ``change_detection`` config option the stream keeps a digest of
+    the collection of each parent, ignoring the stamped fields, and only
+    writes the collections whose digest changed. It also keeps a digest of
+    the parent record without its ``volatile_parent_fields``: while it is
+    unchanged, the collection is not requested again for
+    ``collection_max_age`` seconds after it was last requested (0 always
+    requests it).
+    """
+    stamped_fields = ("updated_at",)
+    volatile_parent_fields = ("updated_at", "items_count", "updates")
+    _collection_index = None
+
+    def uses_change_detection(self) -> bool:
+        return self.change_detection and self.is_selected()
+
+    def get_collection_index(self, state: Dict) -> Dict[str, List]:
+        """
+        Return the ``[collection digest, parent digest, requested at]`` entry
+        of each parent, loaded from the index store on first use.
+        """
+        if self._collection_index is None:
+            self._collection_index = IndexStore.from_config(self.client.config).load(state, self.tap_stream_id)
+            self.unchanged_collections = 0
+            self.skipped_requests = 0
+        return self._collection_index
+
+    def sync(self, state: Dict, transformer: Transformer, parent_obj: Dict = None) -> Tuple[int, Dict]:
+        if not self.uses_change_detection():
+            return super().sync(state, transformer, parent_obj)
+
+        index = self.get_collection_index(state)
+        parent_id = str(parent_obj["id"])
+        parent_digest = record_digest(
+            {key: value for key, value in parent_obj.items() if key not in self.volatile_parent_fields})
+        max_age = int(self.client.config.get("collection_max_age") or 0)
+        now = time.time()
+        entry = index.get(parent_id)
+        if entry and entry[1] == parent_digest and 0 <= now - entry[2] < max_age:
+            self.skipped_requests += 1
+            return 0, state
+
+        bookmark_date = self.get_bookmark(state, self.tap_stream_id)
+        self.url_endpoint = self.get_url_endpoint(parent_obj)
+        self._graphql_query = self.get_graphql_query(self.root_field)
+        self.update_data_payload(graphql_query=self._graphql_query, parent_obj=parent_obj)
+        replication_key = self.plan.replication_key
+        records = []
+        for record in self.get_records(parent_obj):
+            record = self.modify_object(record, parent_obj)
+            transformed_record = transformer.transform(record, self.schema, self.metadata)
+            if transformed_record[replication_key] >= bookmark_date:
+                records.append(transformed_record)
+
+        digest = collection_digest(records, self.stamped_fields)
+        index[parent_id] = [digest, parent_digest, now]
+        if entry and entry[0] == digest:
+            self.unchanged_collections += 1
+            return 0, state
+
+        with metrics.record_counter(self.tap_stream_id) as counter:
+            for record in records:
+                write_record(self.tap_stream_id, record)
+                counter.increment()
+            return counter.value, state
+
+    def save_change_index(self, state: Dict) -> Dict:
+        """Save the digests of the collections synced since the last save."""
+        if self._collection_index is None:
+            return state
+        tags = {"endpoint": self.tap_stream_id}
+        metrics.log(LOGGER, metrics.Point("counter", "collections_unchanged", self.unchanged_collections, tags))
+        metrics.log(LOGGER, metrics.Point("counter", "collection_requests_skipped", self.skipped_requests, tags))
+        IndexStore.from_config(self.client.config).save(state, self.tap_stream_id, self._collection_index)
+        self._collection_index = None
+        return state
@@ -1,11 +1,11 @@
 from typing import Dict, List, Any
 from singer import get_logger
-from tap_monday.streams.abstracts import IncrementalStream
+from tap_monday.streams.abstracts import CollectionChangeMixin, IncrementalStream
 
 LOGGER = get_logger()
 
 
-class BoardColumns(IncrementalStream):
+class BoardColumns(CollectionChangeMixin, IncrementalStream):
     tap_stream_id = "board_columns"
     key_properties = ["id", "board_id"]
     replication_method = "INCREMENTAL"
@@ -1,5 +1,10 @@
+import time
 from typing import Dict, Any, List, Tuple
-from singer import get_logger, metrics, write_record, Transformer
+from singer import get_logger, utils, Transformer
+from tap_monday import codec, metrics
+from tap_monday.change_index import DELETED_AT, IndexStore, decode_ids, encode_ids
+from tap_monday.dedupe import DEFAULT_MAX_IDS, IdIndex
+from tap_monday.output import write_checkpoint, write_record
 from tap_monday.streams.abstracts import IncrementalStream
 from tap_monday.exceptions import MondayCursorExpiredError
 
@@ -8,6 +13,25 @@ from tap_monday.exceptions import MondayCursorExpiredError
 # case where the API consistently expires cursors for a given board.
 MAX_CURSOR_RETRIES = 5
 
+# Key of the checkpoint in the stream's bookmark: the bookmark the run started
+# from, the boards already completed and the items of the current board
+# written at its latest updated_at, so an interrupted run skips them.
+CHECKPOINT_KEY = "checkpoint"
+# Boundary ids are only persisted up to this number to keep the state small;
+# beyond it a resumed board may write its boundary records again.
+MAX_CHECKPOINT_IDS = 10000
+# Minimum number of seconds between two checkpoint STATE messages; the
+# checkpoint in state is still updated after every page and board.
+DEFAULT_CHECKPOINT_INTERVAL = 60
+
+# Ids-only queries enumerating the items of a board for deletion detection,
+# with the largest page size the API allows.
+ITEM_IDS_QUERY = "query {{ boards (ids: {ids}) {{ items_page(limit: {limit}) {{ cursor items {{ id }} }} }} }}"
+NEXT_ITEM_IDS_QUERY = 'query {{ next_items_page(limit: {limit}, cursor: "{cursor}") {{ cursor items {{ id }} }} }}'
+ITEM_IDS_PAGE_SIZE = 500
+# Kind of the id snapshots in the index store.
+ITEM_IDS_INDEX = "item_ids"
+
 LOGGER = get_logger()
 
 
@@ -32,15 +56,66 @@ class BoardItems(IncrementalStream):
         }
     excluded_fields = ["creator_id", "board_id", "group_id", "parent_item_id"]
 
+    on_page_complete = None
+    _item_snapshots = None
+    _checkpoint_written_at = None
+
     def get_bookmark(self, state: Dict, key: Any = None) -> int:
         """
-        Return initial bookmark value only for the child stream.
+        Return initial bookmark value only for the child stream. A resumed
+        run starts from the bookmark of the interrupted run, as the boards
+        completed since advanced the stream bookmark.
         """
         if not self.bookmark_value:
-            self.bookmark_value = super().get_bookmark(state, key)
+            self.bookmark_value = (self.get_checkpoint(state).get("start_bookmark")
+                                   or super().get_bookmark(state, key))
 
         return self.bookmark_value
 
+    def get_checkpoint(self, state: Dict) -> Dict:
+        """Return the checkpoint of an interrupted run, or an empty dict."""
+        return state.get("bookmarks", {}).get(self.tap_stream_id, {}).get(CHECKPOINT_KEY) or {}
+
+    def write_checkpoint(self, state: Dict, **progress) -> None:
+        """Update the checkpoint with *progress* and write the state: the
+        first time, then at most once every ``checkpoint_interval`` seconds."""
+        checkpoint = self.get_checkpoint(state)
+        checkpoint.setdefault("start_bookmark", self.bookmark_value)
+        checkpoint.setdefault("completed_boards", [])
+        checkpoint.update(progress)
+        state.setdefault("bookmarks", {}).setdefault(self.tap_stream_id, {})[CHECKPOINT_KEY] = checkpoint
+
+        interval = self.client.config.get("checkpoint_interval")
+        interval = DEFAULT_CHECKPOINT_INTERVAL if interval is None else float(interval)
+        now = time.monotonic()
+        if self._checkpoint_written_at is not None and now - self._checkpoint_written_at < interval:
+            return
+        self._checkpoint_written_at = now
+        write_checkpoint(state)
+
+    def write_page_checkpoint(self, state: Dict, board_id: Any, updated_at: str, emitted_ids: IdIndex) -> None:
+        """Persist the progress within a board once all records of a page
+        (and their children) are written."""
+        boundary_ids = list(emitted_ids) if not emitted_ids.overflowed and len(emitted_ids) <= MAX_CHECKPOINT_IDS else []
+        self.write_checkpoint(state, board_id=board_id, updated_at=updated_at, boundary_ids=boundary_ids)
+
+    def write_board_checkpoint(self, state: Dict, board_id: Any) -> None:
+        """Record a completed board."""
+        checkpoint = self.get_checkpoint(state)
+        self.write_checkpoint(
+            state,
+            completed_boards=checkpoint.get("completed_boards", []) + [board_id],
+            board_id=None,
+            updated_at=None,
+            boundary_ids=[],
+        )
+
+    def clear_checkpoint(self, state: Dict) -> Dict:
+        """Remove the checkpoint once all boards are synced."""
+        state.get("bookmarks", {}).get(self.tap_stream_id, {}).pop(CHECKPOINT_KEY, None)
+        self.bookmark_value = None
+        return state
+
     def write_bookmark(self, state: Dict, stream: str, key: Any = None, value: Any = None) -> Dict:
         """A wrapper for singer.get_bookmark to deal with compatibility for
         bookmark values or start values."""
@@ -51,13 +126,90 @@ class BoardItems(IncrementalStream):
             if not child.is_selected():
                 continue
 
-            if getattr(child, "replication_method", "").upper() == "FULL_TABLE":
+            if not child.plan.incremental:
                 continue  # Skip full_table children
 
             bookmark_key = f"{self.tap_stream_id}_{self.replication_keys[0]}"
             super().write_bookmark(state, child.tap_stream_id, key=bookmark_key, value=value)
         return state
 
+    def writes_deletions(self) -> bool:
+        """Deleted items are detected with the ``board_items_deletions`` config option."""
+        return bool(self.client.config.get("board_items_deletions")) if self.client else False
+
+    def get_item_ids(self, board_id: Any) -> List[str]:
+        """Return the ids of the items of a board, restarting the enumeration
+        when its cursor expires."""
+        for attempt in range(MAX_CURSOR_RETRIES + 1):
+            try:
+                return list(self._iter_item_ids(board_id))
+            except MondayCursorExpiredError:
+                LOGGER.warning("Cursor expired while listing the item ids of board '%s' (restart %d/%d).",
+                               board_id, attempt + 1, MAX_CURSOR_RETRIES)
+        raise RuntimeError(
+            f"Cursor expired {MAX_CURSOR_RETRIES + 1} times while listing the item ids of board '{board_id}'."
+        )
+
+    def _iter_item_ids(self, board_id: Any):
+        query = ITEM_IDS_QUERY.format(ids=board_id, limit=ITEM_IDS_PAGE_SIZE)
+        while query:
+            response = self.client.make_request(
+                self.http_method, self.url_endpoint, self.params, self.headers,
+                body=codec.dumps({"query": query}), path=self.path
+            )
+            data = (response or {}).get("data") or {}
+            if "next_items_page" in data:
+                items_page = data["next_items_page"] or {}
+            else:
+                boards = data.get("boards") or [{}]
+                items_page = boards[0].get("items_page") or {}
+            for item in items_page.get("items") or []:
+                yield item["id"]
+            cursor = items_page.get("cursor")
+            query = NEXT_ITEM_IDS_QUERY.format(limit=ITEM_IDS_PAGE_SIZE, cursor=cursor) if cursor else None
+
+    def get_item_snapshots(self, state: Dict) -> Dict[str, str]:
+        """Return the id snapshot of each board, loaded on first use."""
+        if self._item_snapshots is None:
+            store = IndexStore.from_config(self.client.config, ITEM_IDS_INDEX)
+            self._item_snapshots = store.load(state, self.tap_stream_id)
+        return self._item_snapshots
+
+    def write_deleted_items(self, state: Dict, board: Dict) -> int:
+        """
+        Write a deletion record for each item of the board's previous id
+        snapshot that is no longer listed, and take a new snapshot. Returns
+        the number of deletion records written.
+        """
+        snapshots = self.get_item_snapshots(state)
+        item_ids = self.get_item_ids(board["id"])
+        try:
+            snapshot = encode_ids(item_ids)
+        except ValueError:
+            LOGGER.warning("Board '%s' has non-numeric item ids; its deleted items are not detected.", board["id"])
+            return 0
+        previous = snapshots.get(str(board["id"]))
+        snapshots[str(board["id"])] = snapshot
+        if previous is None:
+            return 0
+
+        current_ids = {int(item_id) for item_id in item_ids}
+        deleted_at = utils.strftime(utils.now())
+        deleted = 0
+        for item_id in decode_ids(previous):
+            if item_id not in current_ids:
+                write_record(self.tap_stream_id, {"id": str(item_id), "board_id": board["id"], DELETED_AT: deleted_at})
+                deleted += 1
+        return deleted
+
+    def save_change_index(self, state: Dict) -> Dict:
+        """Save the id snapshots of the boards synced."""
+        if self._item_snapshots is not None:
+            IndexStore.from_config(self.client.config, ITEM_IDS_INDEX).save(
+                state, self.tap_stream_id, self._item_snapshots)
+            self._item_snapshots = None
+        return state
+
     def update_data_payload(self, graphql_query: str = None, parent_obj: Dict = None, **kwargs) -> None:
         """
         Update JSON body for GraphQL API. Injects query string if provided.
@@ -88,10 +240,22 @@ class BoardItems(IncrementalStream):
         self.cursor = items_page.get("cursor")
         return items_page.get("items", [])
 
+    def get_stream_page_prefix(self) -> str:
+        """Path of the items page in the response, for streamed parsing."""
+        if self.cursor:
+            return "data.next_items_page"
+        return "data.boards.item.items_page"
+
+    def parse_streamed_page(self, page: Dict) -> None:
+        """Capture the cursor of the next page from a streamed page."""
+        self.cursor = page.get("cursor")
+
     def update_pagination_key(self, raw_records, parent_record, next_page):
         """Updates the pagination key for fetching the next page of results."""
         if not self.pagination_supported or not self.cursor:
             return None
+        if self.on_page_complete:
+            self.on_page_complete()
         next_page += 1
         self.update_data_payload(self._graphql_query, parent_record)
         return next_page
@@ -112,7 +276,20 @@ class BoardItems(IncrementalStream):
         At most ``MAX_CURSOR_RETRIES`` restarts are allowed per board; if the
         limit is exceeded the error is re-raised so the sync does not loop
         indefinitely.
+
+        The progress is checkpointed in state after every page and board,
+        and written at most every ``checkpoint_interval`` seconds: a resumed
+        run skips the boards already completed and syncs the interrupted
+        board again, skipping the items it wrote at the latest ``updated_at``
+        value written.
         """
+        board_id = parent_obj.get("id") if parent_obj else None
+        checkpoint = self.get_checkpoint(state)
+        if board_id in checkpoint.get("completed_boards", []):
+            LOGGER.info("Skipping board %s of stream '%s', completed before the interruption.",
+                        board_id, self.tap_stream_id)
+            return 0, state
+
         bookmark_date = self.get_bookmark(state, self.tap_stream_id)
         current_max_bookmark_date = bookmark_date
         self.url_endpoint = self.get_url_endpoint(parent_obj)
@@ -123,12 +300,28 @@ class BoardItems(IncrementalStream):
         # restart the filter stays inclusive (>=) so that peer records sharing
         # that timestamp are not lost; this set is used to de-duplicate only
         # the records that were already written in a previous attempt.
-        # The set is cleared automatically whenever current_max_bookmark_date
+        # The index is cleared automatically whenever current_max_bookmark_date
         # advances, and is carried across restarts so de-dupe remains accurate
-        # even after multiple consecutive cursor expiries.
-        emitted_ids_at_max: set = set()
+        # even after multiple consecutive cursor expiries.  Its memory is
+        # bounded by the ``dedupe_max_ids`` config option.
+        emitted_ids_at_max = IdIndex(
+            int(self.client.config.get("dedupe_max_ids") or DEFAULT_MAX_IDS),
+            name="{} board {}".format(self.tap_stream_id, parent_obj.get("id") if parent_obj else "unknown"),
+        )
         restart_count = 0
+        # Items are not returned in updated_at order, so the latest updated_at
+        # written before an interruption does not bound the items still to
+        # write: the interrupted board is synced again from the bookmark, and
+        # only the items written at that updated_at are skipped.
+        resumed_at, resumed_ids = None, frozenset()
+        if checkpoint.get("board_id") == board_id and checkpoint.get("updated_at"):
+            resumed_at, resumed_ids = checkpoint["updated_at"], frozenset(checkpoint.get("boundary_ids", []))
+            LOGGER.info("Resuming board %s of stream '%s', skipping %d items written at %s.",
+                        board_id, self.tap_stream_id, len(resumed_ids), resumed_at)
+        self.on_page_complete = lambda: self.write_page_checkpoint(
+            state, board_id, current_max_bookmark_date, emitted_ids_at_max)
 
+        selected = self.is_selected()
         with metrics.record_counter(self.tap_stream_id) as counter:
             while True:
                 try:
@@ -149,14 +342,17 @@ class BoardItems(IncrementalStream):
                             and record["id"] in emitted_ids_at_max
                         ):
                             continue
-                        if self.is_selected():
+                        # Skip the items written before the interruption.
+                        if record_timestamp == resumed_at and record["id"] in resumed_ids:
+                            continue
+                        if selected:
                             write_record(self.tap_stream_id, transformed_record)
                             counter.increment()
                         # Advance the boundary tracker; clear the de-dupe set
                         # whenever we move to a strictly later timestamp.
                         if record_timestamp > current_max_bookmark_date:
                             current_max_bookmark_date = record_timestamp
-                            emitted_ids_at_max = set()
+                            emitted_ids_at_max.clear()
                         if record_timestamp == current_max_bookmark_date:
                             emitted_ids_at_max.add(record["id"])
                         for child in self.child_to_sync:
@@ -212,8 +408,20 @@ class BoardItems(IncrementalStream):
                     self.cursor = None
                     self.update_data_payload(self._graphql_query, parent_obj)
 
+            if selected and self.writes_deletions():
+                counter.increment(self.write_deleted_items(state, parent_obj))
+
+        if restart_count or emitted_ids_at_max.overflowed:
+            tags = {"endpoint": self.tap_stream_id, "board_id": parent_obj.get("id") if parent_obj else None}
+            metrics.log(LOGGER, metrics.Point("counter", "dedupe_index_peak_ids", emitted_ids_at_max.peak_ids, tags))
+            metrics.log(LOGGER, metrics.Point("counter", "dedupe_index_bytes", emitted_ids_at_max.size_bytes, tags))
+            metrics.log(LOGGER, metrics.Point("counter", "dedupe_index_overflowed",
+                                              int(emitted_ids_at_max.overflowed), tags))
+
+        self.on_page_complete = None
         state = self.write_bookmark(
             state, self.tap_stream_id, value=current_max_bookmark_date
         )
+        self.write_board_checkpoint(state, board_id)
         return counter.value, state
 
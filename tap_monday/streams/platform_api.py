@@ -1,10 +1,13 @@
-from typing import Dict, Any
+from typing import Dict, Any, List
 from singer import get_logger
+from tap_monday import codec
 from tap_monday.streams.abstracts import IncrementalStream
 from tap_monday.exceptions import MondayForbiddenError, MondayGraphQLInternalError
 
 LOGGER = get_logger()
 
+DAILY_LIMIT_QUERY = "query { platform_api { daily_limit { total } } }"
+
 
 class PlatformApi(IncrementalStream):
     tap_stream_id = "platform_api"
@@ -25,16 +28,18 @@ class PlatformApi(IncrementalStream):
         the stream-level probe here."""
         return True
 
+    def get_access_probes(self) -> List[str]:
+        return [DAILY_LIMIT_QUERY]
+
     def prune_inaccessible_fields(self, schema: dict, field_metadata: list) -> None:
         """Probe whether daily_limit is accessible for this account's Monday plan.
         If the field is not available (MondayForbiddenError or MondayGraphQLInternalError),
         remove it from the catalog schema and its metadata entry, and log a warning
         so sync can continue without it.
         """
-        import json as _json
         url = self.get_url_endpoint()
         self.update_params()
-        body = _json.dumps({"query": "query { platform_api { daily_limit { total } } }"})
+        body = codec.dumps({"query": DAILY_LIMIT_QUERY})
         try:
             self.client.probe_request(self.http_method, url, self.params, self.headers, body=body)
         except (MondayForbiddenError, MondayGraphQLInternalError):
@@ -1,8 +1,16 @@
 import singer
+from contextlib import ExitStack
 from typing import Dict
+from singer import metadata
 from singer.transform import UNIX_MILLISECONDS_INTEGER_DATETIME_PARSING
 from tap_monday.streams import STREAMS
+from tap_monday import output
+from tap_monday.batch import DEFAULT_BATCH_SIZE, BatchSink
 from tap_monday.client import Client
+from tap_monday.discovery_cache import DiscoveryCache, invalidated_on_auth_error
+from tap_monday.parallel import RecordPipeline
+from tap_monday.plan import SyncPlan
+from tap_monday.transform import CompiledTransformer
 
 LOGGER = singer.get_logger()
 
@@ -15,21 +23,32 @@ def update_currently_syncing(state: Dict, stream_name: str) -> None:
         del state["currently_syncing"]
     else:
         singer.set_currently_syncing(state, stream_name)
-    singer.write_state(state)
+    output.write_state(state)
 
 
-def write_schema(stream, client, streams_to_sync, catalog) -> None:
+def get_pipeline_schemas(catalog: singer.Catalog, streams_to_sync) -> Dict:
     """
-    Write schema for stream and its children
+    Return the schema and metadata of the streams to sync, as the streams
+    read them from the catalog, to register them with the workers.
+    """
+    schemas = {}
+    for stream_name in streams_to_sync:
+        catalog_entry = catalog.get_stream(stream_name)
+        if catalog_entry is not None:
+            schemas[stream_name] = (catalog_entry.schema.to_dict(),
+                                    metadata.to_map(catalog_entry.metadata))
+    return schemas
+
+
+def write_schema(stream) -> None:
+    """
+    Write schema for stream and its children to sync
     """
     if stream.is_selected():
         stream.write_schema()
 
-    for child in stream.children:
-        child_obj = STREAMS[child](client, catalog.get_stream(child))
-        write_schema(child_obj, client, streams_to_sync, catalog)
-        if child in streams_to_sync:
-            stream.child_to_sync.append(child_obj)
+    for child in stream.child_to_sync:
+        write_schema(child)
 
 
 def sync(client: Client, config: Dict, catalog: singer.Catalog, state) -> None:
@@ -37,39 +56,63 @@ def sync(client: Client, config: Dict, catalog: singer.Catalog, state) -> None:
     Sync selected streams from catalog
     """
 
-    streams_to_sync = []
-    for stream in catalog.get_selected_streams(state):
-        streams_to_sync.append(stream.stream)
-    LOGGER.info("selected_streams: {}".format(streams_to_sync))
+    # Resolve the streams to sync, their parents and children, once.
+    plan = SyncPlan(catalog, state, STREAMS)
+    streams_to_sync = plan.streams_to_sync
+    LOGGER.info("selected_streams: {}".format(plan.selected_streams))
 
     last_stream = singer.get_currently_syncing(state)
     LOGGER.info("last/currently syncing stream: {}".format(last_stream))
 
-    # Normalize streams_to_sync by adding any missing parent streams before
-    # deriving root_stream_names.  This must happen before the resume-target
-    # validation so that a valid currently_syncing root stream that was only
-    # implicitly required (because a child was selected) is not mistakenly
-    # treated as stale and cleared.
-    # Walk the list with an explicit index so appended parents are also visited.
-    idx = 0
-    while idx < len(streams_to_sync):
-        name = streams_to_sync[idx]
-        parent = getattr(STREAMS.get(name), "parent", None)
-        if parent and parent not in streams_to_sync:
-            streams_to_sync.append(parent)
-        idx += 1
-
-    # Determine which streams are roots (no parent) so we can validate the
-    # resume target before entering the loop.  A stale currently_syncing value
-    # (child stream name, removed stream, renamed stream, etc.) would never
-    # match any root stream, causing every stream to be skipped and the state
-    # entry to remain set forever — wedging all future runs.
-    root_stream_names = {
-        name for name in streams_to_sync
-        if not getattr(STREAMS.get(name), "parent", None)
-    }
-
-    with singer.Transformer(integer_datetime_fmt=UNIX_MILLISECONDS_INTEGER_DATETIME_PARSING) as transformer:
+    # The resume target is validated against the root streams, which include
+    # the parents that were only implicitly required (because a child was
+    # selected). A stale currently_syncing value (child stream name, removed
+    # stream, renamed stream, etc.) would never match any root stream,
+    # causing every stream to be skipped and the state entry to remain set
+    # forever — wedging all future runs.
+    root_stream_names = set(plan.root_streams)
+
+    transform_workers = int(config.get("transform_workers") or 0)
+    buffer_size = config.get("output_buffer_size")
+    buffer_size = output.DEFAULT_BUFFER_SIZE if buffer_size is None else int(buffer_size)
+
+    with ExitStack() as stack:
+        # Permissions changed: the next discovery must probe them again.
+        stack.enter_context(invalidated_on_auth_error(DiscoveryCache.from_config(config, client.api_version)))
+        transformer = stack.enter_context(
+            CompiledTransformer(integer_datetime_fmt=UNIX_MILLISECONDS_INTEGER_DATETIME_PARSING))
+        # Optionally transform the records of leaf streams in worker processes.
+        pipeline = None
+        if transform_workers > 0:
+            pipeline = stack.enter_context(RecordPipeline(
+                transform_workers, integer_datetime_fmt=UNIX_MILLISECONDS_INTEGER_DATETIME_PARSING,
+                schemas=get_pipeline_schemas(catalog, streams_to_sync)))
+        stack.enter_context(output.buffered(buffer_size))
+        # Optionally write the records to files referenced by BATCH messages:
+        # high-volume streams to Parquet files, the others to JSONL files.
+        record_sink = None
+        if config.get("batch_directory"):
+            record_sink = BatchSink(
+                config["batch_directory"],
+                compression=config.get("batch_compression") or "gzip",
+                batch_size=int(config.get("batch_max_records") or DEFAULT_BATCH_SIZE),
+            )
+        if config.get("parquet_directory"):
+            # Imported here as pyarrow takes a while to import.
+            from tap_monday.parquet import (  # pylint: disable=import-outside-toplevel
+                DEFAULT_PARQUET_COMPRESSION, DEFAULT_ROW_GROUP_SIZE, ParquetSink)
+            record_sink = ParquetSink(
+                config["parquet_directory"],
+                row_group_size=int(config.get("parquet_row_group_size") or DEFAULT_ROW_GROUP_SIZE),
+                compression=config.get("parquet_compression") or DEFAULT_PARQUET_COMPRESSION,
+                fallback=record_sink,
+            )
+        if record_sink is not None:
+            stack.enter_context(output.sink(record_sink))
+        if pipeline is not None:
+            # Child streams hold records back in the pipeline's batches.
+            stack.enter_context(output.deferred(pipeline.flush))
+
         # Resume from the last syncing stream to avoid re-processing already completed streams.
         resume_from = last_stream
         if last_stream and last_stream not in root_stream_names:
@@ -84,19 +127,16 @@ def sync(client: Client, config: Dict, catalog: singer.Catalog, state) -> None:
             update_currently_syncing(state, None)
             resume_from = None
 
-        for stream_name in streams_to_sync:
-            stream = STREAMS[stream_name](client, catalog.get_stream(stream_name))
-            if stream.parent:
-                # Parent streams were already added during pre-processing above;
-                # child streams are driven by their parent's sync, so skip them.
-                continue
-
+        # Child streams are driven by their parent's sync, which the plan
+        # builds them with.
+        for stream_name in plan.root_streams:
             if resume_from and stream_name != resume_from:
                 LOGGER.info("Skipping stream {} (resuming from {})".format(stream_name, resume_from))
                 continue
             resume_from = None
 
-            write_schema(stream, client, streams_to_sync, catalog)
+            stream = plan.build(stream_name, client, pipeline)
+            write_schema(stream)
 
             LOGGER.info("START Syncing: {}".format(stream_name))
             update_currently_syncing(state, stream_name)
@@ -0,0 +1,378 @@
+"""Record transformation compiled from the stream schemas.
+
+``singer.Transformer.transform`` interprets the JSON schema and the stream
+metadata again for every record: it looks up the selection metadata of every
+field, resolves the type list of every schema node and parses every
+date-time with ``dateutil``. ``CompiledTransformer`` performs the same
+transformation with functions built once per schema and metadata:
+
+ - the metadata is reduced to the set of fields to drop,
+ - each schema node becomes a converter trying its types in singer's order,
+ - canonical ISO-8601 UTC date-times are normalized without ``dateutil``.
+
+Records that already are in their transformed form (strings that are
+strings, integers that are integers, canonical date-times, no unknown fields)
+are recognized by a check compiled alongside the converters and returned as
+they are, without building a copy.
+
+The output is identical to ``singer.Transformer``. Whenever a value does not
+match its schema the record is transformed again by ``singer.Transformer``
+itself, so schema mismatches are reported exactly as before.
+"""
+import datetime
+import re
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import singer.metadata
+from singer.transform import (
+    NO_INTEGER_DATETIME_PARSING,
+    VALID_DATETIME_FORMATS,
+    SchemaKey,
+    Transformer,
+    breadcrumb_path,
+)
+
+# Date-times in the shape returned by the API ("2024-01-31T12:00:00Z",
+# optionally with a fraction or a zero UTC offset).
+ISO_UTC_DATETIME = re.compile(
+    r"(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2}):(\d{2})(?:\.(\d{1,6}))?(?:Z|[+-]00:?00)?"
+)
+
+
+class _Mismatch(Exception):
+    """Raised by a compiled converter when a value does not match its schema."""
+
+
+def format_utc_datetime(value: str) -> Optional[str]:
+    """Formats a canonical ISO-8601 UTC date-time string the way
+    ``singer.utils.strftime(strptime_to_utc(value))`` does, or returns None
+    when the string is not in canonical form."""
+    match = ISO_UTC_DATETIME.fullmatch(value)
+    if not match:
+        return None
+    year, month, day, hour, minute, second, fraction = match.groups()
+    if year < "1000":
+        return None
+    try:
+        datetime.datetime(int(year), int(month), int(day), int(hour), int(minute), int(second))
+    except ValueError:
+        return None
+    return f"{year}-{month}-{day}T{hour}:{minute}:{second}.{(fraction or '').ljust(6, '0')}Z"
+
+
+class CompiledTransformer(Transformer):
+    """A ``singer.Transformer`` caching a compiled transformation per schema.
+
+    Compiled converters and field filters are keyed by the identity of the
+    schema and metadata objects, which each stream keeps for the whole sync.
+    """
+
+    def __init__(self, integer_datetime_fmt=NO_INTEGER_DATETIME_PARSING, pre_hook=None):
+        super().__init__(integer_datetime_fmt=integer_datetime_fmt, pre_hook=pre_hook)
+        self._converters = {}
+        self._filters = {}
+
+    def transform(self, data, schema, metadata=None):
+        if self.pre_hook or self.integer_datetime_fmt not in VALID_DATETIME_FORMATS:
+            return super().transform(data, schema, metadata)
+
+        entry = self._converters.get(id(schema))
+        if entry is None or entry[0] is not schema:
+            entry = self._converters[id(schema)] = (schema, self._compile(schema), self._compile_check(schema))
+        _, convert, is_conformant = entry
+
+        drop_plan = None
+        if metadata:
+            entry = self._filters.get(id(metadata))
+            if entry is None or entry[0] is not metadata:
+                entry = self._filters[id(metadata)] = (metadata, self._compile_filter(metadata))
+            drop_plan = entry[1]
+
+        if drop_plan and isinstance(data, (dict, list)):
+            data = self._drop_fields(data, drop_plan, ())
+        if is_conformant(data):
+            return data
+        try:
+            return convert(data, ())
+        except _Mismatch:
+            return super().transform(data, schema, metadata)
+
+    # -- field selection ----------------------------------------------------
+
+    @staticmethod
+    def _compile_filter(metadata) -> Optional[Dict]:
+        """Reduces the metadata to a tree of the fields ``filter_data_by_metadata``
+        removes: each node maps "drop" to the field names dropped at that level,
+        "properties" to the nodes of nested fields and "items" to the node of
+        array elements. Returns None when no field is dropped."""
+        if not metadata:
+            return None
+        root = {}
+        for breadcrumb in metadata:
+            if len(breadcrumb) < 2 or breadcrumb[-2] != "properties":
+                continue
+            # Like filter_data_by_metadata, keep automatic fields and
+            # everything nested within them.
+            if any(singer.metadata.get(metadata, breadcrumb[:end], "inclusion") == "automatic"
+                   for end in range(2, len(breadcrumb) + 1, 2) if breadcrumb[end - 2] == "properties"):
+                continue
+            if not (singer.metadata.get(metadata, breadcrumb, "selected") is False
+                    or singer.metadata.get(metadata, breadcrumb, "inclusion") == "unsupported"):
+                continue
+            node = root
+            parts = list(breadcrumb[:-2])
+            while parts:
+                part = parts.pop(0)
+                if part == "items":
+                    node = node.setdefault("items", {})
+                elif part == "properties" and parts:
+                    node = node.setdefault("properties", {}).setdefault(parts.pop(0), {})
+                else:
+                    node = None
+                    break
+            if node is not None:
+                node.setdefault("drop", set()).add(breadcrumb[-1])
+        return root or None
+
+    def _drop_fields(self, data, node: Dict, breadcrumb: Tuple):
+        """Applies a tree built by ``_compile_filter``; mutates *data* in place
+        like ``filter_data_by_metadata``."""
+        if isinstance(data, dict):
+            drop = node.get("drop", ())
+            for field_name in drop:
+                if field_name in data:
+                    data.pop(field_name)
+                    self.filtered.add(breadcrumb_path(breadcrumb + ("properties", field_name)))
+            for field_name, child in node.get("properties", {}).items():
+                if field_name in data and field_name not in drop:
+                    data[field_name] = self._drop_fields(
+                        data[field_name], child, breadcrumb + ("properties", field_name))
+        elif isinstance(data, list) and "items" in node:
+            breadcrumb = breadcrumb + ("items",)
+            data = [self._drop_fields(row, node["items"], breadcrumb) for row in data]
+        return data
+
+    # -- type conversion ----------------------------------------------------
+
+    def _compile(self, schema: Dict) -> Callable[[Any, Tuple], Any]:
+        """Returns a function converting a value to *schema*, raising
+        ``_Mismatch`` where ``transform_recur`` would fail."""
+        if "anyOf" in schema or SchemaKey.pattern_properties in schema:
+            return self._delegate(schema)
+        if "type" not in schema:
+            return lambda value, path: value
+
+        types = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+        types = [typ for typ in types if typ != "null"] + (["null"] if "null" in types else [])
+        converters = [self._compile_type(typ, schema) for typ in types]
+
+        if len(converters) == 1:
+            return converters[0]
+
+        if len(converters) == 2 and types[1] == "null" and types[0] != "boolean":
+            # None fails every type but boolean, so it always ends up null.
+            convert_value = converters[0]
+
+            def convert_nullable(value, path):
+                if value is None:
+                    return None
+                try:
+                    return convert_value(value, path)
+                except _Mismatch:
+                    if value == "":
+                        return None
+                    raise
+            return convert_nullable
+
+        def convert(value, path):
+            for converter in converters:
+                try:
+                    return converter(value, path)
+                except _Mismatch:
+                    pass
+            raise _Mismatch()
+        return convert
+
+    def _compile_type(self, typ: str, schema: Dict) -> Callable[[Any, Tuple], Any]:
+        # Each converter mirrors the corresponding branch of Transformer._transform.
+        if typ == "null":
+            def convert_null(value, path):
+                if value is None or value == "":
+                    return None
+                raise _Mismatch()
+            return convert_null
+
+        if typ == "string" and schema.get("format") == "date-time":
+            transform_datetime = self._transform_datetime
+            integer_parsing = self.integer_datetime_fmt != NO_INTEGER_DATETIME_PARSING
+
+            def convert_datetime(value, path):
+                if isinstance(value, str) and not (integer_parsing and _is_float(value)):
+                    formatted = format_utc_datetime(value)
+                    if formatted is not None:
+                        return formatted
+                formatted = transform_datetime(value)
+                if formatted is None:
+                    raise _Mismatch()
+                return formatted
+            return convert_datetime
+
+        if typ == "object":
+            return self._compile_object(schema)
+
+        if typ == "array" and "items" in schema:
+            return self._compile_array(schema["items"])
+
+        if typ == "string" and schema.get("format") != "singer.decimal":
+            def convert_string(value, path):
+                if value is None:
+                    raise _Mismatch()
+                return str(value)
+            return convert_string
+
+        if typ in ("integer", "number"):
+            cast = int if typ == "integer" else float
+
+            def convert_numeric(value, path):
+                if isinstance(value, str):
+                    value = value.replace(",", "")
+                try:
+                    return cast(value)
+                except Exception:
+                    raise _Mismatch() from None
+            return convert_numeric
+
+        if typ == "boolean":
+            def convert_boolean(value, path):
+                if isinstance(value, str) and value.lower() == "false":
+                    return False
+                return bool(value)
+            return convert_boolean
+
+        # Other string formats and unknown types keep singer's own handling.
+        transform = self._transform
+
+        def convert_other(value, path):
+            success, result = transform(value, typ, schema, list(path))
+            if not success:
+                raise _Mismatch()
+            return result
+        return convert_other
+
+    def _compile_object(self, schema: Dict) -> Callable[[Any, Tuple], Any]:
+        properties = schema.get("properties", {})
+        if properties == {}:
+            def convert_any_object(value, path):
+                if not isinstance(value, dict):
+                    raise _Mismatch()
+                return value
+            return convert_any_object
+
+        converters = {key: self._compile(sub_schema) for key, sub_schema in properties.items()}
+        removed = self.removed
+
+        def convert_object(value, path):
+            if not isinstance(value, dict):
+                raise _Mismatch()
+            result = {}
+            for key, item in value.items():
+                converter = converters.get(key)
+                if converter is None:
+                    removed.add(".".join(map(str, path + (key,))))
+                else:
+                    result[key] = converter(item, path + (key,))
+            return result
+        return convert_object
+
+    def _compile_array(self, items_schema: Dict) -> Callable[[Any, Tuple], Any]:
+        converter = self._compile(items_schema)
+
+        def convert_array(value, path):
+            if not isinstance(value, list):
+                raise _Mismatch()
+            return [converter(row, path + (i,)) for i, row in enumerate(value)]
+        return convert_array
+
+    # -- conformance checks -------------------------------------------------
+
+    def _compile_check(self, schema: Dict) -> Callable[[Any], bool]:
+        """Returns a predicate telling whether the converter of *schema* would
+        return a value equal to its input, of the same types. It is
+        conservative: values it rejects are simply converted."""
+        if "anyOf" in schema or SchemaKey.pattern_properties in schema:
+            return _never
+        if "type" not in schema:
+            return lambda value: True
+
+        types = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+        nullable = "null" in types
+        types = [typ for typ in types if typ != "null"]
+        if not types:
+            return lambda value: value is None
+        if len(types) > 1:
+            # The converters of the first types may claim the value.
+            return _never
+        check = self._compile_type_check(types[0], schema)
+        if check is None:
+            return _never
+        if nullable and types[0] != "boolean":
+            return lambda value: value is None or check(value)
+        return check
+
+    def _compile_type_check(self, typ: str, schema: Dict) -> Optional[Callable[[Any], bool]]:
+        if typ == "string":
+            if schema.get("format") == "date-time":
+                return lambda value: isinstance(value, str) and format_utc_datetime(value) == value
+            if "format" in schema:
+                return None
+            return lambda value: isinstance(value, str)
+        if typ == "integer":
+            return lambda value: type(value) is int  # pylint: disable=unidiomatic-typecheck
+        if typ == "number":
+            return lambda value: type(value) is float  # pylint: disable=unidiomatic-typecheck
+        if typ == "boolean":
+            return lambda value: type(value) is bool  # pylint: disable=unidiomatic-typecheck
+        if typ == "array" and "items" in schema:
+            check_item = self._compile_check(schema["items"])
+            return lambda value: isinstance(value, list) and all(map(check_item, value))
+        if typ == "object":
+            properties = schema.get("properties", {})
+            if properties == {}:
+                return lambda value: isinstance(value, dict)
+            checks = {key: self._compile_check(sub_schema) for key, sub_schema in properties.items()}
+
+            def check_object(value):
+                if not isinstance(value, dict):
+                    return False
+                for key, item in value.items():
+                    check = checks.get(key)
+                    # Unknown fields are removed by the converter.
+                    if check is None or not check(item):
+                        return False
+                return True
+            return check_object
+        return None
+
+    def _delegate(self, schema: Dict) -> Callable[[Any, Tuple], Any]:
+        """Converter running ``transform_recur`` for schema constructs that are
+        not compiled (``anyOf``, ``patternProperties``)."""
+        def convert(value, path):
+            errors = len(self.errors)
+            success, result = self.transform_recur(value, schema, list(path))
+            if not success:
+                del self.errors[errors:]
+                raise _Mismatch()
+            return result
+        return convert
+
+
+def _never(value) -> bool:
+    return False
+
+
+def _is_float(value: str) -> bool:
+    try:
+        float(value)
+    except ValueError:
+        return False
+    return True
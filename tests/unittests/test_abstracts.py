@@ -1,8 +1,12 @@
+import json
 import unittest
 from unittest.mock import patch, MagicMock, PropertyMock
 from parameterized import parameterized
 
+from tap_monday import metrics
 from tap_monday.streams.abstracts import IncrementalStream, FullTableStream
+from tap_monday.streams.assets import Assets
+from tap_monday.streams.reply import Reply
 from singer import Transformer
 from tap_monday.exceptions import (
     ERROR_CODE_EXCEPTION_MAPPING,
@@ -118,6 +122,80 @@ class TestStreamSync(unittest.TestCase):
             mock_write_bookmark.assert_not_called()
 
 
+class DummyUpdatesStream(FullTableStream):
+    """A parent stream whose records embed the records of derived children."""
+    tap_stream_id = "updates"
+    replication_method = "FULL_TABLE"
+    replication_keys = []
+    key_properties = ("id",)
+    page_size = 2
+
+    def get_records(self, parent_record=None):
+        return [
+            {
+                "id": str(i),
+                "assets": [{"id": "a{}".format(i), "uploaded_by": {"id": "u"}}],
+                "replies": [{"id": "r{}".format(i), "updated_at": "2024-01-0{}T00:00:00Z".format(i + 1)}],
+            }
+            for i in range(5)
+        ]
+
+
+class TestDerivedChildren(unittest.TestCase):
+    """Derived children are synced from whole pages of parent records."""
+
+    def make_stream(self, stream_class, client):
+        stream = stream_class(client=client)
+        stream.metadata = {(): {"selected": True}}
+        return stream
+
+    @patch("tap_monday.streams.abstracts.write_record")
+    @patch("tap_monday.streams.abstracts.metrics.record_counter")
+    def test_pages_of_parent_records(self, mock_counter, mock_write_record):
+        client = MagicMock()
+        client.config = {"start_date": "2024-01-03T00:00:00Z"}
+        parent = self.make_stream(DummyUpdatesStream, client)
+        assets, reply, other = self.make_stream(Assets, client), self.make_stream(Reply, client), MagicMock(derived=False)
+        parent.child_to_sync = [assets, reply, other]
+        transformer = MagicMock(spec=Transformer)
+        transformer.transform.side_effect = lambda record, schema, mdata: record
+        state = {}
+
+        page_sizes = []
+        sync_from_parents = assets.sync_from_parents
+
+        def record_page_size(state, transformer, page):
+            page_sizes.append(len(page))
+            return sync_from_parents(state, transformer, page)
+
+        with patch.object(assets, "sync_from_parents", side_effect=record_page_size):
+            parent.sync(state, transformer)
+
+        self.assertEqual(page_sizes, [2, 2, 1])
+        self.assertEqual(other.sync.call_count, 5)
+        written = [(c.args[0], c.args[1]["id"]) for c in mock_write_record.call_args_list]
+        self.assertEqual([record_id for stream, record_id in written if stream == "assets"],
+                         ["a0", "a1", "a2", "a3", "a4"])
+        self.assertEqual([record_id for stream, record_id in written if stream == "reply"], ["r2", "r3", "r4"])
+        self.assertEqual(state["bookmarks"]["reply"]["updated_at"], "2024-01-05T00:00:00Z")
+        # One counter per stream per page, plus the parent's.
+        self.assertEqual(mock_counter.call_count, 7)
+
+    @patch("tap_monday.streams.abstracts.write_record")
+    def test_single_parent_record(self, mock_write_record):
+        client = MagicMock()
+        client.config = {"start_date": "2024-01-01T00:00:00Z"}
+        assets = self.make_stream(Assets, client)
+        transformer = MagicMock(spec=Transformer)
+        transformer.transform.side_effect = lambda record, schema, mdata: record
+
+        count, _ = assets.sync({}, transformer, parent_obj={
+            "id": "1", "assets": [{"id": "a"}], "replies": [{"assets": [{"id": "b"}]}]})
+
+        self.assertEqual(count, 2)
+        self.assertEqual([c.args[1]["update_id"] for c in mock_write_record.call_args_list], ["1", "1"])
+
+
 class TestPagination(unittest.TestCase):
     """Test suite for validating pagination logic in data streams."""
 
@@ -350,3 +428,48 @@ class TestGraphQLMethods(unittest.TestCase):
         self.assertIn("address {", result)
         self.assertIn("address2", result)
 
+
+
+class TestStreamPlan(unittest.TestCase):
+    """The catalog settings of a stream are resolved once per schema and metadata."""
+
+    SCHEMA = {"properties": {"id": {"type": "string"}, "updated_at": {"type": "string"}}}
+
+    def make_stream(self, selected=True):
+        stream = DummyIncrementalStream()
+        stream.schema = self.SCHEMA
+        stream.metadata = {(): {"selected": selected}}
+        return stream
+
+    def test_plan(self):
+        stream = self.make_stream()
+        plan = stream.plan
+        self.assertIs(stream.plan, plan)
+        self.assertTrue(stream.is_selected())
+        self.assertTrue(plan.incremental)
+        self.assertEqual(plan.replication_key, "updated_at")
+
+        stream.metadata = {(): {"selected": False}}
+        self.assertIsNot(stream.plan, plan)
+        self.assertFalse(stream.is_selected())
+        self.assertFalse(DummyFullTableStream().plan.incremental)
+
+    def test_graphql_selection_is_generated_once(self):
+        stream = self.make_stream()
+        with patch.object(DummyIncrementalStream, "_process_properties",
+                          wraps=stream._process_properties) as mock_process:
+            queries = [stream.get_graphql_query("items (ids: {})".format(i)) for i in range(3)]
+        self.assertEqual(mock_process.call_count, 1)
+        self.assertEqual(queries[2], queries[0].replace("ids: 0", "ids: 2"))
+
+        stream.schema = {"properties": {"id": {"type": "string"}}}
+        self.assertNotIn("updated_at", stream.get_graphql_query("items"))
+
+    def test_record_counter_does_not_reconfigure_logging(self):
+        with patch("singer.metrics.get_logger") as mock_get_logger, \
+                patch.object(metrics.LOGGER, "info") as mock_info:
+            with metrics.record_counter("boards") as counter:
+                counter.increment(3)
+        mock_get_logger.assert_not_called()
+        self.assertEqual(json.loads(mock_info.call_args.args[1]),
+                         {"type": "counter", "metric": "record_count", "value": 3, "tags": {"endpoint": "boards"}})
@@ -0,0 +1,113 @@
+"""Unit tests for the Singer BATCH output (tap_monday.batch)."""
+
+import gzip
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from tap_monday import batch, output
+from tap_monday.batch import BatchSink
+from tap_monday.sync import update_currently_syncing
+
+
+def read_batch_file(uri, compression):
+    path = uri[len("file://"):]
+    with open(path, "rb") as batch_file:
+        data = batch_file.read()
+    if compression == "zstd":
+        data = batch.zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    else:
+        data = gzip.decompress(data)
+    return [json.loads(line) for line in data.decode("utf-8").splitlines()]
+
+
+class TestBatchSink(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def run_sink(self, records, **kwargs):
+        """Writes (stream, record) pairs within a BATCH sink and returns the
+        messages written to stdout."""
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            with output.sink(BatchSink(self.directory, **kwargs)):
+                for stream_name, record in records:
+                    output.write_record(stream_name, record)
+            return [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+    def test_files_rotate_at_batch_size(self):
+        records = [("board_items", {"id": str(i)}) for i in range(5)] + [("updates", {"id": "u"})]
+        messages = self.run_sink(records, batch_size=2)
+
+        self.assertEqual([m["type"] for m in messages], ["BATCH"] * 4)
+        self.assertEqual([m["stream"] for m in messages], ["board_items"] * 3 + ["updates"])
+        written = [read_batch_file(m["manifest"][0], "gzip") for m in messages]
+        self.assertEqual(written, [[{"id": "0"}, {"id": "1"}], [{"id": "2"}, {"id": "3"}], [{"id": "4"}], [{"id": "u"}]])
+        self.assertEqual(messages[0]["encoding"], {"format": "jsonl", "compression": "gzip"})
+        self.assertFalse([name for name in os.listdir(self.directory) if name.endswith(".part")])
+
+    @unittest.skipUnless(batch.zstandard is not None, "zstandard is not installed")
+    def test_zstd(self):
+        messages = self.run_sink([("updates", {"id": "1", "body": "é"})], compression="zstd")
+        self.assertTrue(messages[0]["manifest"][0].endswith(".jsonl.zst"))
+        self.assertEqual(read_batch_file(messages[0]["manifest"][0], "zstd"), [{"id": "1", "body": "é"}])
+
+    def test_unknown_compression(self):
+        with self.assertRaises(ValueError):
+            BatchSink(self.directory, compression="lz4")
+
+    def test_state_follows_complete_files(self):
+        """STATE is only written once the referenced files are complete."""
+        def check_files(state):
+            for name in os.listdir(self.directory):
+                self.assertFalse(name.endswith(".part"))
+            print(json.dumps({"type": "STATE", "value": state}))
+
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout, \
+                patch("singer.write_state", side_effect=check_files) as mock_write_state, \
+                patch("tap_monday.batch.os.fsync", wraps=os.fsync) as mock_fsync:
+            with output.buffered(), output.sink(BatchSink(self.directory)):
+                output.write_record("boards", {"id": "1"})
+                update_currently_syncing({}, "boards")
+                output.write_record_json("boards", '{"id":"2"}')
+            messages = [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+        mock_write_state.assert_called_once()
+        self.assertEqual([m["type"] for m in messages], ["BATCH", "STATE", "BATCH"])
+        self.assertEqual(read_batch_file(messages[2]["manifest"][0], "gzip"), [{"id": "2"}])
+        # The file and the directory are fsynced for each batch.
+        self.assertEqual(mock_fsync.call_count, 4)
+
+    def test_checkpoint_waits_for_open_files(self):
+        """Checkpoints leave the files open and follow the BATCH message of
+        the file holding the records written before them."""
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            with output.sink(BatchSink(self.directory, batch_size=3)):
+                output.write_record("board_items", {"id": "1"})
+                output.write_checkpoint({"page": 1})
+                output.write_record("board_items", {"id": "2"})
+                output.write_checkpoint({"page": 2})
+                self.assertEqual(stdout.getvalue(), "")
+                output.write_record("board_items", {"id": "3"})
+                output.write_record("board_items", {"id": "4"})
+                output.write_checkpoint({"page": 3})
+            messages = [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+        self.assertEqual([(m["type"], m.get("value")) for m in messages],
+                         [("BATCH", None), ("STATE", {"page": 2}), ("BATCH", None), ("STATE", {"page": 3})])
+        self.assertEqual(read_batch_file(messages[0]["manifest"][0], "gzip"),
+                         [{"id": "1"}, {"id": "2"}, {"id": "3"}])
+
+    def test_failed_sync_removes_incomplete_files(self):
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            with self.assertRaises(RuntimeError):
+                with output.sink(BatchSink(self.directory)):
+                    output.write_record("boards", {"id": "1"})
+                    raise RuntimeError("sync failed")
+        self.assertEqual(stdout.getvalue(), "")
+        self.assertEqual(os.listdir(self.directory), [])
@@ -0,0 +1,360 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from parameterized import parameterized
+
+from tap_monday.change_index import (
+    DEFAULT_INDEX_DIR, DELETED_AT, ChangeIndex, IndexStore, decode_ids, encode_ids, record_digest, record_key
+)
+from tap_monday.exceptions import MondayCursorExpiredError
+from tap_monday.streams.abstracts import CollectionChangeMixin, FullTableStream, IncrementalStream
+from tap_monday.streams.board_items import BoardItems
+
+
+class DummyFullTableStream(FullTableStream):
+    tap_stream_id = "full_table"
+    replication_method = "FULL_TABLE"
+    replication_keys = []
+    key_properties = ["id"]
+    records = []
+
+    def get_records(self, parent_record=None):
+        return [dict(record) for record in self.records]
+
+
+class DummyColumns(CollectionChangeMixin, IncrementalStream):
+    tap_stream_id = "columns"
+    replication_method = "INCREMENTAL"
+    replication_keys = ["updated_at"]
+    key_properties = ["id", "board_id"]
+    records = []
+
+    def get_records(self, parent_record=None):
+        self.requests += 1
+        return [dict(record) for record in self.records]
+
+    def update_data_payload(self, graphql_query=None, parent_obj=None, **kwargs):
+        pass
+
+    def modify_object(self, record, parent_record=None):
+        record["board_id"] = parent_record["id"]
+        record["updated_at"] = parent_record["updated_at"]
+        return record
+
+
+def make_stream(records, stream_class=None, **config):
+    catalog = MagicMock()
+    catalog.schema.to_dict.return_value = {"properties": {"id": {"type": "string"}, "name": {"type": "string"}}}
+    catalog.metadata = [{"breadcrumb": [], "metadata": {"selected": True}}]
+    client = MagicMock()
+    client.config = {"start_date": "2024-01-01T00:00:00Z", **config}
+    stream = (stream_class or DummyFullTableStream)(client=client, catalog=catalog)
+    stream.records = records
+    stream.requests = 0
+    return stream
+
+
+def index_dir(test_case):
+    directory = tempfile.TemporaryDirectory()
+    test_case.addCleanup(directory.cleanup)
+    return directory.name
+
+
+class TestChangeIndex(unittest.TestCase):
+    """Digests and keys of records."""
+
+    def test_digest_ignores_key_order(self):
+        self.assertEqual(record_digest({"id": "1", "name": "a"}), record_digest({"name": "a", "id": "1"}))
+        self.assertNotEqual(record_digest({"id": "1", "name": "a"}), record_digest({"id": "1", "name": "b"}))
+        self.assertEqual(len(record_digest({"id": "1"})), 16)
+
+    @parameterized.expand([
+        ("single", ["id"], {"id": 5}, "5"),
+        ("composite", ["id", "board_id"], {"id": "1", "board_id": "2"}, '["1","2"]'),
+        ("missing", ["id"], {"name": "a"}, None),
+    ])
+    def test_record_key(self, name, key_properties, record, expected):
+        self.assertEqual(record_key(record, key_properties), expected)
+
+    def test_changed_unchanged_and_deleted(self):
+        previous = {"1": record_digest({"id": "1", "name": "a"}), "2": record_digest({"id": "2", "name": "b"}),
+                    "3": record_digest({"id": "3"})}
+        index = ChangeIndex(["id"], previous)
+        self.assertFalse(index.is_changed({"id": "1", "name": "a"}))
+        self.assertTrue(index.is_changed({"id": "2", "name": "c"}))
+        self.assertTrue(index.is_changed({"id": "4"}))
+        self.assertTrue(index.is_changed({"name": "no key"}))
+        self.assertEqual(index.unchanged, 1)
+        self.assertEqual(index.deleted_keys(), ["3"])
+        self.assertEqual(set(index.digests), {"1", "2", "4"})
+
+    def test_deletion_record_of_composite_key(self):
+        index = ChangeIndex(["id", "board_id"])
+        key = record_key({"id": "1", "board_id": "2"}, index.key_properties)
+        self.assertEqual(index.deletion_record(key, "2024-01-01T00:00:00.000000Z"),
+                         {"id": "1", "board_id": "2", DELETED_AT: "2024-01-01T00:00:00.000000Z"})
+
+
+class TestIdSnapshots(unittest.TestCase):
+    """Id snapshots are sorted, compact and round-trip."""
+
+    def test_round_trip(self):
+        ids = [str(1000000000 + 3 * i) for i in range(5000)] + ["7", "7"]
+        snapshot = encode_ids(reversed(ids))
+        self.assertEqual(list(decode_ids(snapshot)), sorted({int(record_id) for record_id in ids}))
+        self.assertLess(len(snapshot), 5000)
+
+    def test_empty_and_non_numeric(self):
+        self.assertEqual(list(decode_ids(encode_ids([]))), [])
+        with self.assertRaises(ValueError):
+            encode_ids(["abc"])
+
+
+class TestIndexStore(unittest.TestCase):
+    """Digests are kept in files referenced by the state."""
+
+    def test_digests_stored_in_state_are_moved_to_a_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = IndexStore(directory)
+            state = {"bookmarks": {"users": {IndexStore.STATE_KEY: {"1": "ab"}}}}
+            self.assertEqual(store.load(state, "users"), {"1": "ab"})
+            store.save(state, "users", {"1": "cd"})
+            self.assertEqual(list(state["bookmarks"]["users"]), [IndexStore.FILE_KEY])
+            self.assertEqual(store.load(state, "users"), {"1": "cd"})
+
+    def test_default_directory(self):
+        self.assertEqual(IndexStore.from_config({}).directory, DEFAULT_INDEX_DIR)
+        self.assertEqual(IndexStore.from_config({"change_index_dir": "index"}).directory, "index")
+
+    def test_files_keep_the_previous_one(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store, state = IndexStore(directory), {}
+            names = []
+            for digest in ("a", "b", "c"):
+                old_state = {"bookmarks": {"users": dict(state.get("bookmarks", {}).get("users", {}))}}
+                store.save(state, "users", {"1": digest})
+                names.append(state["bookmarks"]["users"][IndexStore.FILE_KEY])
+                self.assertEqual(store.load(state, "users"), {"1": digest})
+            self.assertNotIn(IndexStore.STATE_KEY, state["bookmarks"]["users"])
+            # A target that did not commit the last state still finds its index.
+            self.assertEqual(store.load(old_state, "users"), {"1": "b"})
+            self.assertEqual(sorted(os.listdir(directory)), sorted(names[1:]))
+
+    def test_kinds_are_kept_apart(self):
+        with tempfile.TemporaryDirectory() as directory:
+            state = {}
+            IndexStore(directory).save(state, "board_items", {"1": "ab"})
+            IndexStore(directory, "item_ids").save(state, "board_items", {"1": "ids"})
+            IndexStore(directory, "item_ids").save(state, "board_items", {"1": "ids2"})
+            self.assertEqual(IndexStore(directory).load(state, "board_items"), {"1": "ab"})
+            self.assertEqual(IndexStore(directory, "item_ids").load(state, "board_items"), {"1": "ids2"})
+            self.assertEqual(len(os.listdir(directory)), 3)
+
+    def test_missing_or_unreadable_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            store = IndexStore(directory)
+            state = {"bookmarks": {"users": {IndexStore.FILE_KEY: "users-1.json"}}}
+            self.assertEqual(store.load(state, "users"), {})
+            with open(os.path.join(directory, "users-1.json"), "w") as index_file:
+                index_file.write("{not json")
+            self.assertEqual(store.load(state, "users"), {})
+
+
+@patch("tap_monday.streams.abstracts.write_record")
+class TestChangeDetectionSync(unittest.TestCase):
+    """Full-table streams only write new and changed records."""
+
+    def setUp(self):
+        self.index_dir = index_dir(self)
+
+    def sync(self, records, state, **config):
+        stream = make_stream(records, change_index_dir=self.index_dir, **config)
+        transformer = MagicMock()
+        transformer.transform.side_effect = lambda record, schema, mdata: record
+        return stream.sync(state, transformer)
+
+    def test_writes_changes_only(self, mock_write_record):
+        state = {}
+        count, state = self.sync([{"id": "1", "name": "a"}, {"id": "2", "name": "b"}], state, change_detection=True)
+        self.assertEqual(count, 2)
+
+        mock_write_record.reset_mock()
+        count, state = self.sync([{"id": "1", "name": "a"}, {"id": "2", "name": "c"}, {"id": "3", "name": "d"}],
+                                 state, change_detection=True)
+        self.assertEqual(count, 2)
+        self.assertEqual([call.args[1]["id"] for call in mock_write_record.call_args_list], ["2", "3"])
+        self.assertEqual(set(IndexStore(self.index_dir).load(state, "full_table")), {"1", "2", "3"})
+        self.assertNotIn(IndexStore.STATE_KEY, state["bookmarks"]["full_table"])
+
+    def test_deletions(self, mock_write_record):
+        state = {}
+        _, state = self.sync([{"id": "1", "name": "a"}, {"id": "2", "name": "b"}], state,
+                             change_detection=True, change_detection_deletions=True)
+        mock_write_record.reset_mock()
+        count, state = self.sync([{"id": "1", "name": "a"}], state,
+                                 change_detection=True, change_detection_deletions=True)
+        self.assertEqual(count, 1)
+        deletion = mock_write_record.call_args.args[1]
+        self.assertEqual(deletion["id"], "2")
+        self.assertIn(DELETED_AT, deletion)
+        self.assertEqual(set(IndexStore(self.index_dir).load(state, "full_table")), {"1"})
+
+    def test_disabled_writes_every_record(self, mock_write_record):
+        state = {}
+        for _ in range(2):
+            count, state = self.sync([{"id": "1", "name": "a"}], state, change_detection=False)
+            self.assertEqual(count, 1)
+        self.assertEqual(state, {})
+
+    def test_schema_has_deleted_at_with_deletions(self, mock_write_record):
+        stream = make_stream([], change_detection=True, change_detection_deletions=True)
+        self.assertIn(DELETED_AT, stream.get_output_schema()["properties"])
+        self.assertNotIn(DELETED_AT, stream.schema["properties"])
+        stream = make_stream([], change_detection=True)
+        self.assertIs(stream.get_output_schema(), stream.schema)
+
+
+@patch("tap_monday.streams.abstracts.write_record")
+class TestCollectionChanges(unittest.TestCase):
+    """Board collections are only written, and requested, when they changed."""
+
+    board = {"id": "1", "name": "Board", "updated_at": "2024-02-01T00:00:00Z", "items_count": 3}
+
+    def setUp(self):
+        self.transformer = MagicMock()
+        self.transformer.transform.side_effect = lambda record, schema, mdata: record
+        self.index_dir = index_dir(self)
+
+    def make_stream(self, records, **config):
+        return make_stream(records, DummyColumns, change_index_dir=self.index_dir, **config)
+
+    def test_unchanged_collection_is_not_written(self, mock_write_record):
+        stream = self.make_stream([{"id": "a", "title": "Status"}], change_detection=True)
+        state = {}
+        self.assertEqual(stream.sync(state, self.transformer, parent_obj=self.board)[0], 1)
+        # An item edit moves the board's updated_at, not its columns.
+        board = dict(self.board, updated_at="2024-03-01T00:00:00Z", items_count=4)
+        self.assertEqual(stream.sync(state, self.transformer, parent_obj=board)[0], 0)
+        stream.records = [{"id": "a", "title": "State"}]
+        self.assertEqual(stream.sync(state, self.transformer, parent_obj=board)[0], 1)
+        self.assertEqual(stream.requests, 3)
+        self.assertEqual(mock_write_record.call_count, 2)
+
+    def test_index_is_saved_with_the_parent(self, mock_write_record):
+        stream = self.make_stream([{"id": "a"}], change_detection=True)
+        state = {}
+        stream.sync(state, self.transformer, parent_obj=self.board)
+        stream.save_change_index(state)
+        self.assertIn("1", IndexStore(self.index_dir).load(state, "columns"))
+
+        # The next sync starts from the saved index.
+        stream = self.make_stream([{"id": "a"}], change_detection=True)
+        self.assertEqual(stream.sync(state, self.transformer, parent_obj=self.board)[0], 0)
+
+    @parameterized.expand([
+        ("volatile_fields", {"updated_at": "2024-03-01T00:00:00Z", "items_count": 4}, 10, 1),
+        ("structural_field", {"name": "Renamed"}, 10, 2),
+        ("max_age_elapsed", {}, -1, 2),
+        ("disabled", {}, 0, 2),
+    ])
+    def test_request_skipped_while_board_is_unchanged(self, mock_write_record, name, changes, max_age, requests):
+        stream = self.make_stream([{"id": "a"}], change_detection=True, collection_max_age=max_age)
+        state = {}
+        stream.sync(state, self.transformer, parent_obj=self.board)
+        stream.sync(state, self.transformer, parent_obj=dict(self.board, **changes))
+        self.assertEqual(stream.requests, requests)
+        self.assertEqual(mock_write_record.call_count, 1)
+
+    def test_without_change_detection(self, mock_write_record):
+        stream = self.make_stream([{"id": "a"}])
+        state = {}
+        for _ in range(2):
+            stream.sync(state, self.transformer, parent_obj=self.board)
+        self.assertEqual(mock_write_record.call_count, 2)
+        self.assertNotIn(IndexStore.FILE_KEY, stream.save_change_index(state)["bookmarks"]["columns"])
+
+
+def item_ids_page(ids, cursor=None, first=True):
+    items_page = {"cursor": cursor, "items": [{"id": item_id} for item_id in ids]}
+    if first:
+        return {"data": {"boards": [{"items_page": items_page}]}}
+    return {"data": {"next_items_page": items_page}}
+
+
+@patch("tap_monday.streams.board_items.write_record")
+class TestItemDeletions(unittest.TestCase):
+    """board_items detects deleted items from id snapshots."""
+
+    board = {"id": "7", "updated_at": "2024-02-01T00:00:00Z"}
+
+    def setUp(self):
+        self.index_dir = index_dir(self)
+
+    def make_stream(self, pages, **config):
+        catalog = MagicMock()
+        catalog.schema.to_dict.return_value = {"properties": {"id": {"type": "string"}}}
+        catalog.metadata = [{"breadcrumb": [], "metadata": {"selected": True}}]
+        client = MagicMock()
+        client.config = {"start_date": "2024-01-01T00:00:00Z", "board_items_deletions": True,
+                         "change_index_dir": self.index_dir, **config}
+        client.make_request.side_effect = pages
+        stream = BoardItems(client=client, catalog=catalog)
+        stream.url_endpoint = "https://api.monday.com/v2"
+        return stream
+
+    def test_item_ids_are_paginated_with_ids_only_queries(self, mock_write_record):
+        stream = self.make_stream([item_ids_page(["1", "2"], "c1"), item_ids_page(["3"], first=False)])
+        self.assertEqual(stream.get_item_ids("7"), ["1", "2", "3"])
+        queries = [json.loads(call.kwargs["body"])["query"] for call in stream.client.make_request.call_args_list]
+        self.assertIn("boards (ids: 7) { items_page(limit: 500) { cursor items { id } } }", queries[0])
+        self.assertIn('next_items_page(limit: 500, cursor: "c1") { cursor items { id } }', queries[1])
+
+    def test_expired_cursor_restarts_the_enumeration(self, mock_write_record):
+        stream = self.make_stream([item_ids_page(["1"], "c1"), MondayCursorExpiredError("expired"),
+                                   item_ids_page(["1", "2"])])
+        self.assertEqual(stream.get_item_ids("7"), ["1", "2"])
+
+    def test_deleted_items_are_written(self, mock_write_record):
+        state = {}
+        stream = self.make_stream([item_ids_page(["1", "2", "3"])])
+        self.assertEqual(stream.write_deleted_items(state, self.board), 0)
+        stream.save_change_index(state)
+        mock_write_record.assert_not_called()
+
+        stream = self.make_stream([item_ids_page(["1", "4"])])
+        self.assertEqual(stream.write_deleted_items(state, self.board), 2)
+        written = [call.args[1] for call in mock_write_record.call_args_list]
+        self.assertEqual([(record["id"], record["board_id"]) for record in written], [("2", "7"), ("3", "7")])
+        self.assertTrue(all(DELETED_AT in record for record in written))
+        stream.save_change_index(state)
+        snapshots = IndexStore(self.index_dir, "item_ids").load(state, "board_items")
+        self.assertEqual(list(decode_ids(snapshots["7"])), [1, 4])
+
+    def test_snapshots_are_not_stored_in_state(self, mock_write_record):
+        state = {"bookmarks": {"board_items": {"item_ids": {"7": encode_ids(["1", "2"])}}}}
+        stream = self.make_stream([item_ids_page(["1"])])
+        stream.write_deleted_items(state, self.board)
+        stream.save_change_index(state)
+        self.assertEqual(list(state["bookmarks"]["board_items"]), ["item_ids_file"])
+        self.assertEqual(os.listdir(self.index_dir), [state["bookmarks"]["board_items"]["item_ids_file"]])
+
+    def test_schema_has_deleted_at(self, mock_write_record):
+        self.assertIn(DELETED_AT, self.make_stream([]).get_output_schema()["properties"])
+        self.assertNotIn(DELETED_AT, self.make_stream([], board_items_deletions=False).get_output_schema()["properties"])
+
+    @patch("tap_monday.streams.board_items.write_checkpoint")
+    def test_sync_writes_deletions_after_the_items(self, mock_write_checkpoint, mock_write_record):
+        state = {"bookmarks": {"board_items": {"item_ids": {"7": encode_ids(["1", "2"])}}}}
+        stream = self.make_stream([item_ids_page(["1"])])
+        transformer = MagicMock()
+        with patch.object(BoardItems, "get_records", return_value=[]):
+            stream.sync(state, transformer, parent_obj=self.board)
+        self.assertEqual(mock_write_record.call_args.args[1]["id"], "2")
+
+        stream = self.make_stream([], board_items_deletions=False)
+        with patch.object(BoardItems, "get_records", return_value=[]):
+            stream.sync(state, transformer, parent_obj=self.board)
+        stream.client.make_request.assert_not_called()
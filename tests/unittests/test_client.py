@@ -1,12 +1,27 @@
+import json
+import socket
+import threading
 import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from parameterized import parameterized
 from unittest.mock import patch, MagicMock
 from requests import Timeout, ConnectionError
 
-from tap_monday.client import Client, raise_for_error, get_retry_after
+from tap_monday.client import (
+    Client,
+    get_keepalive_socket_options,
+    get_response_error,
+    get_retry_after,
+    is_partial_response,
+    raise_for_error,
+)
 from tap_monday.exceptions import (
     ERROR_CODE_EXCEPTION_MAPPING,
+    MondayCursorExpiredError,
     MondayError,
+    MondayForbiddenError,
+    MondayGraphQLInternalError,
+    MondayQueryComplexityError,
     MondayRateLimitError,
     MondayUnauthorizedError
 )
@@ -22,6 +37,10 @@ class MockResponse:
     def json(self):
         return self._json_data
 
+    @property
+    def content(self):
+        return json.dumps(self._json_data).encode()
+
 
 class TestRaiseForError(unittest.TestCase):
     @parameterized.expand([
@@ -202,3 +221,161 @@ class TestGetRetryAfter(unittest.TestCase):
         exc = MondayRateLimitError(response=mock_response)
         self.assertEqual(get_retry_after(exc), 30)
 
+
+
+class _JSONHandler(BaseHTTPRequestHandler):
+    """Answers every POST/HEAD with a small JSON body over a keep-alive connection."""
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self, body=b'{"data": {"result": "ok"}}'):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        return body
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.wfile.write(self._respond())
+
+    def do_HEAD(self):
+        self._respond()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestConnectionPool(unittest.TestCase):
+    """Test pool sizing, keep-alive, warm-up and pool statistics of the Client."""
+
+    def setUp(self):
+        self.config = {
+            "api_token": "dummy_token",
+            "start_date": "2019-01-01T00:00:00Z",
+            "user_agent": "tap-monday test@test.com",
+        }
+
+    def start_server(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _JSONHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    def test_base_url_from_config(self):
+        """Requests without an endpoint are sent to the configured base_url."""
+        url = self.start_server()
+        self.assertEqual(Client(self.config).base_url, "https://api.monday.com/v2")
+        client = Client({**self.config, "base_url": url})
+        self.assertEqual(client.make_request("POST", None, body="{}", path="v2"), {"data": {"result": "ok"}})
+
+    def test_pool_sizes_from_config(self):
+        """pool_connections and pool_maxsize are applied to the mounted adapter."""
+        client = Client({**self.config, "pool_connections": 3, "pool_maxsize": 25})
+        adapter = client._session.get_adapter("https://api.monday.com/v2")
+        self.assertIs(adapter, client._adapter)
+        self.assertEqual(adapter._pool_connections, 3)
+        self.assertEqual(adapter._pool_maxsize, 25)
+
+    def test_keepalive_socket_options(self):
+        """TCP keep-alive is enabled by default and can be switched off."""
+        self.assertIn((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1), get_keepalive_socket_options())
+        self.assertIn((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1), Client(self.config)._adapter.socket_options)
+        self.assertIsNone(Client({**self.config, "tcp_keepalive": False})._adapter.socket_options)
+
+    def test_warm_up_on_enter(self):
+        """warmup_connections HEAD requests are sent when the client is entered."""
+        with patch("requests.Session.request", return_value=MagicMock()) as mock_request:
+            with Client({**self.config, "warmup_connections": 2}):
+                pass
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(mock_request.call_args[0][0], "HEAD")
+
+    def test_no_warm_up_by_default(self):
+        with patch("requests.Session.request") as mock_request:
+            with Client(self.config):
+                pass
+        mock_request.assert_not_called()
+
+    def test_connections_are_reused(self):
+        """Sequential requests share one pooled connection and are counted as reuses."""
+        url = self.start_server()
+        client = Client(self.config)
+        for _ in range(3):
+            self.assertEqual(client.make_request("POST", url, body="{}"), {"data": {"result": "ok"}})
+        self.assertEqual(client.pool_stats(), {"connections_created": 1, "connections_reused": 2, "requests": 3})
+
+    def test_pool_stats_logged_on_exit(self):
+        """Pool statistics are emitted as counter metrics when the client is closed."""
+        with patch("tap_monday.client.metrics.log") as mock_log:
+            with Client(self.config):
+                pass
+        metric_names = [call.args[1].metric for call in mock_log.call_args_list]
+        self.assertEqual(metric_names, ["http_connections_created", "http_connections_reused"])
+
+
+class TestResponseClassification(unittest.TestCase):
+    """Error classification operates on the decoded body, decoded only once."""
+
+    @parameterized.expand([
+        ("cursor expired", "CursorException", MondayCursorExpiredError),
+        ("unauthorized", "UserUnauthorizedException", MondayForbiddenError),
+        ("graphql internal error", "INTERNAL_SERVER_ERROR", MondayGraphQLInternalError),
+        ("complexity budget exhausted", "ComplexityException", MondayRateLimitError),
+        ("query too complex", "maxComplexityExceeded", MondayQueryComplexityError),
+        ("unknown code", "SomethingElse", MondayError),
+    ])
+    def test_graphql_error_codes(self, name, code, expected_exception):
+        body = {"errors": [{"message": name, "extensions": {"code": code, "retry_in_seconds": 7}}]}
+        error = get_response_error(MockResponse(200, body), body)
+        self.assertIs(type(error), expected_exception)
+        self.assertIs(error.response_json, body)
+
+    def test_rate_limit_uses_decoded_body(self):
+        """retry_in_seconds is read from the decoded body without decoding again."""
+        body = {"errors": [{"message": "Budget", "extensions": {"code": "ComplexityException", "retry_in_seconds": 7}}]}
+        response = MagicMock(spec=["status_code"], status_code=200)
+        with self.assertRaises(MondayRateLimitError) as ctx:
+            raise_for_error(response, body)
+        self.assertEqual(ctx.exception.retry_after, 7)
+
+    def test_successful_response_has_no_error(self):
+        self.assertIsNone(get_response_error(MockResponse(200, {"data": {}}), {"data": {}}))
+
+
+class TestPartialData(unittest.TestCase):
+    """Responses with both data and errors can be returned to the caller."""
+
+    PARTIAL = {
+        "data": {"boards": [{"id": "1", "owners": None}]},
+        "errors": [{"message": "Permission denied", "path": ["boards", 0, "owners"],
+                    "extensions": {"code": "UserUnauthorizedException"}}],
+    }
+
+    def setUp(self):
+        self.client = Client({"api_token": "dummy_token"})
+
+    def request(self, body, allow_partial):
+        with patch("requests.Session.request", return_value=MockResponse(200, body)), \
+                patch("time.sleep", return_value=None):
+            return self.client.make_request("POST", "/dummy", body="{}", allow_partial=allow_partial)
+
+    def test_partial_data_returned_when_allowed(self):
+        self.assertEqual(self.request(self.PARTIAL, allow_partial=True), self.PARTIAL)
+
+    def test_partial_data_raises_by_default(self):
+        with self.assertRaises(MondayForbiddenError):
+            self.request(self.PARTIAL, allow_partial=False)
+
+    def test_errors_without_data_raise(self):
+        body = {"data": None, "errors": self.PARTIAL["errors"]}
+        with self.assertRaises(MondayForbiddenError):
+            self.request(body, allow_partial=True)
+
+    def test_whole_response_errors_raise(self):
+        """Cursor expiry is never treated as partial data."""
+        body = {"data": {"boards": []}, "errors": [{"message": "expired", "extensions": {"code": "CursorException"}}]}
+        self.assertFalse(is_partial_response(MockResponse(200, body), body, get_response_error(MockResponse(200, body), body)))
+        with self.assertRaises(MondayCursorExpiredError):
+            self.request(body, allow_partial=True)
@@ -0,0 +1,176 @@
+"""Unit tests for tap_monday.codec and the codec-based Singer output writer."""
+
+import io
+import json
+import unittest
+from decimal import Decimal
+from unittest.mock import patch
+
+import singer
+from singer.messages import RecordMessage
+
+from tap_monday import codec, output
+from tap_monday.client import Client
+
+
+class MockResponse:
+    """Minimal stand-in for ``requests.Response``."""
+
+    def __init__(self, status_code=200, json_data=None):
+        self.status_code = status_code
+        self.content = json.dumps(json_data or {}).encode()
+
+
+RECORD = {"id": "1", "name": "Item é", "updated_at": "2024-01-01T00:00:00.000000Z",
+          "column_values": [{"id": "status", "value": None, "number": 1.5}], "archived": False}
+
+
+class TestCodec(unittest.TestCase):
+
+    def test_round_trip(self):
+        self.assertEqual(codec.loads(codec.dumps(RECORD)), RECORD)
+        self.assertEqual(codec.loads(codec.dumps(RECORD).encode()), RECORD)
+
+    def test_decimal_is_encoded_exactly(self):
+        """Values orjson cannot encode fall back to simplejson with decimals."""
+        self.assertEqual(codec.dumps({"value": Decimal("1.10")}), '{"value":1.10}')
+
+    def test_stdlib_backend(self):
+        """Without orjson the standard library produces the same documents."""
+        with patch.object(codec, "orjson", None):
+            encoded = codec.dumps(RECORD)
+            self.assertEqual(codec.loads(encoded), RECORD)
+            self.assertEqual(codec.dumps({"value": Decimal("2.5")}), '{"value":2.5}')
+
+
+class TestOutput(unittest.TestCase):
+
+    def test_record_message_matches_singer(self):
+        """The written message decodes to the same document singer would write."""
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            output.write_record("board_items", RECORD)
+        line = stdout.getvalue()
+        self.assertTrue(line.endswith("\n"))
+        self.assertEqual(line.count("\n"), 1)
+        expected = singer.format_message(RecordMessage(stream="board_items", record=RECORD))
+        self.assertEqual(json.loads(line), json.loads(expected))
+
+    def test_stream_alias(self):
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            output.write_record("board_items", {"id": "1"}, stream_alias="items")
+        self.assertEqual(json.loads(stdout.getvalue())["stream"], "items")
+
+
+class TestClientDecodesOnce(unittest.TestCase):
+
+    def test_response_decoded_once(self):
+        """A successful response body is decoded exactly once per request."""
+        client = Client({"api_token": "dummy_token"})
+        response = MockResponse(200, {"data": {"boards": [{"id": "1"}]}})
+        with patch("requests.Session.request", return_value=response), \
+                patch("tap_monday.client.codec.loads", wraps=codec.loads) as mock_loads:
+            result = client.make_request("POST", "/dummy", body="{}")
+        self.assertEqual(result, {"data": {"boards": [{"id": "1"}]}})
+        self.assertEqual(mock_loads.call_count, 1)
+
+
+class TestBufferedOutput(unittest.TestCase):
+
+    def test_messages_written_in_chunks(self):
+        """Buffered messages are written in one chunk when the block exits."""
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            with output.buffered(buffer_size=1024 * 1024):
+                for i in range(3):
+                    output.write_record("board_items", {"id": str(i)})
+                self.assertEqual(stdout.getvalue(), "")
+            lines = stdout.getvalue().splitlines()
+        self.assertEqual([json.loads(line)["record"]["id"] for line in lines], ["0", "1", "2"])
+
+    def test_flush_on_size(self):
+        line = codec.dumps({"type": "RECORD", "stream": "s", "record": {"id": "x"}})
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout, \
+                patch.object(output._output, "flushes", 0):
+            with output.buffered(buffer_size=3 * (len(line) + 1)):
+                for _ in range(7):
+                    output.write_line(line)
+                self.assertEqual(stdout.getvalue().count("\n"), 6)
+                self.assertEqual(output._output.flushes, 2)
+            self.assertEqual(stdout.getvalue().count("\n"), 7)
+
+    def test_flush_on_interval(self):
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout, \
+                patch("tap_monday.output.time.monotonic", side_effect=[0.0, 0.5, 2.0, 2.0, 2.0]):
+            with output.buffered(buffer_size=1024 * 1024, flush_interval=1.0):
+                output.write_line("first")
+                self.assertEqual(stdout.getvalue(), "")
+                output.write_line("second")
+                self.assertEqual(stdout.getvalue(), "first\nsecond\n")
+
+    def test_flush_before_request(self):
+        """Messages older than the flush interval are written before a request."""
+        client = Client({"api_token": "dummy_token"})
+        response = MockResponse(200, {"data": {}})
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout, \
+                patch("requests.Session.request", return_value=response), \
+                patch("tap_monday.output.time.monotonic", side_effect=[0.0, 0.5, 0.5, 2.0, 2.0]):
+            with output.buffered(buffer_size=1024 * 1024, flush_interval=1.0):
+                output.write_line("first")
+                client.make_request("POST", "/dummy", body="{}")
+                self.assertEqual(stdout.getvalue(), "")
+                client.make_request("POST", "/dummy", body="{}")
+                self.assertEqual(stdout.getvalue(), "first\n")
+
+    def test_binary_stdout(self):
+        """The buffer is written as UTF-8 bytes when stdout has a binary buffer."""
+        stdout = io.TextIOWrapper(io.BytesIO(), encoding="ascii")
+        with patch("sys.stdout", stdout), patch.object(output._output, "bytes_written", 0):
+            with output.buffered():
+                output.write_line("é")
+            self.assertEqual(stdout.buffer.getvalue(), "é\n".encode("utf-8"))
+            self.assertEqual(output._output.bytes_written, 3)
+
+    def test_records_flushed_before_state(self):
+        """STATE messages written by singer follow the buffered records."""
+        from tap_monday.sync import update_currently_syncing
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            with output.buffered():
+                output.write_record("boards", {"id": "1"})
+                update_currently_syncing({}, "boards")
+                output.write_record("boards", {"id": "2"})
+            types = [json.loads(line)["type"] for line in stdout.getvalue().splitlines()]
+        self.assertEqual(types, ["RECORD", "STATE", "RECORD"])
+
+    def test_deferred_records_before_state(self):
+        """Records held back within deferred() are written before STATE
+        messages and when the block exits."""
+        from tap_monday.sync import update_currently_syncing
+        held_back = [{"id": "1"}]
+
+        def write_records():
+            while held_back:
+                output.write_record("column_values", held_back.pop())
+
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            with output.buffered(), output.deferred(write_records):
+                update_currently_syncing({}, "boards")
+                held_back.append({"id": "2"})
+            messages = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual([(m["type"], m.get("record")) for m in messages],
+                         [("RECORD", {"id": "1"}), ("STATE", None), ("RECORD", {"id": "2"})])
+
+    def test_metrics_and_unbuffered_default(self):
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout, \
+                patch("tap_monday.output.metrics.log") as mock_log:
+            with output.buffered():
+                output.write_line("é")
+            output.write_line("after")
+            self.assertEqual(stdout.getvalue(), "é\nafter\n")
+        points = {call.args[1].metric: call.args[1].value for call in mock_log.call_args_list}
+        self.assertEqual(points, {"output_bytes_written": 3, "output_flushes": 1})
+
+    def test_record_json_matches_record_message(self):
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            output.write_record_json("board_items", codec.dumps(RECORD))
+            output.write_record("board_items", RECORD)
+        first, second = stdout.getvalue().splitlines()
+        self.assertEqual(first, second)
@@ -0,0 +1,134 @@
+"""Unit tests for tap_monday.complexity — offline query complexity estimation."""
+
+import io
+import unittest
+from unittest.mock import MagicMock, patch
+
+from parameterized import parameterized
+
+from tap_monday.complexity import (
+    MAX_QUERY_COMPLEXITY,
+    build_stream_query,
+    complexity_report,
+    estimate_query_complexity,
+    estimate_stream_complexity,
+    get_list_sizes,
+    largest_safe_page_size,
+    parse_query,
+)
+from tap_monday.complexity_report import main
+from tap_monday.streams.board_items import BoardItems
+from tap_monday.streams.boards import Boards
+from tap_monday.streams.column_values import ColumnValues
+from tap_monday.streams.tags import Tags
+
+
+def make_stream(stream_cls, properties, config=None):
+    """Return *stream_cls* wired with a mocked client and a flat schema."""
+    client = MagicMock()
+    client.config = {"start_date": "2024-01-01T00:00:00Z", **(config or {})}
+    client.base_url = "https://api.monday.com/v2"
+    catalog = MagicMock()
+    catalog.schema.to_dict.return_value = {"type": "object", "properties": properties}
+    catalog.metadata = []
+    return stream_cls(client=client, catalog=catalog)
+
+
+STRING = {"type": ["null", "string"]}
+LIST_OF_OBJECTS = {"type": ["null", "array"], "items": {"type": ["null", "object"], "properties": {"id": STRING}}}
+
+
+class TestParseQuery(unittest.TestCase):
+
+    def test_nested_fields_and_arguments(self):
+        """Field names, arguments and nesting are captured."""
+        fields = parse_query('query { boards(limit: 10, ids: [1, 2]) { id items_page(cursor: "abc") { items { id } } } }')
+        self.assertEqual(len(fields), 1)
+        boards = fields[0]
+        self.assertEqual(boards.name, "boards")
+        self.assertEqual(boards.arguments, {"limit": 10, "ids": ["1", "2"]})
+        self.assertEqual([child.name for child in boards.children], ["id", "items_page"])
+        self.assertEqual(boards.children[1].arguments, {"cursor": "abc"})
+
+    def test_unclosed_selection_sets_are_tolerated(self):
+        """Open selection sets left at the end of the root field are closed implicitly."""
+        fields = parse_query("query { boards (ids: 1) { items_page(limit: 20) {cursor items { id }")
+        self.assertEqual(fields[0].children[0].children[1].children[0].name, "id")
+
+
+class TestEstimateQueryComplexity(unittest.TestCase):
+
+    @parameterized.expand([
+        ("scalar fields", "query { me { id name } }", {}, 3),
+        ("limit multiplies the selection", "query { boards(limit: 10) { id name } }", {}, 21),
+        ("ids multiply the selection", "query { items(ids: [1, 2, 3]) { id } }", {}, 4),
+        ("nested lists multiply", "query { boards(limit: 2) { id tags { id } } }", {"tags": 5}, 15),
+    ])
+    def test_estimate(self, name, query, list_sizes, expected):
+        self.assertEqual(estimate_query_complexity(query, list_sizes), expected)
+
+    def test_list_sizes_from_schema(self):
+        """Only arrays of objects are reported as nested lists."""
+        schema = {"properties": {
+            "id": STRING,
+            "subscribers": LIST_OF_OBJECTS,
+            "column_values": LIST_OF_OBJECTS,
+            "description": {"type": ["null", "object"], "properties": {"blocks": LIST_OF_OBJECTS}},
+        }}
+        self.assertEqual(get_list_sizes(schema, 10), {"subscribers": 10, "column_values": 50, "blocks": 10})
+
+
+class TestStreamComplexity(unittest.TestCase):
+
+    def test_board_items_query_uses_page_size(self):
+        """The stream query is built from the root field with the given page size."""
+        stream = make_stream(BoardItems, {"id": STRING, "name": STRING})
+        query = build_stream_query(stream, page_size=7)
+        self.assertIn("items_page(limit: 7)", query)
+        self.assertLess(
+            estimate_stream_complexity(stream, page_size=7),
+            estimate_stream_complexity(stream, page_size=70))
+
+    def test_child_collection_is_sized_as_list(self):
+        """Unbounded record collections of child streams count as lists."""
+        stream = make_stream(ColumnValues, {"id": STRING, "text": STRING})
+        # items(ids: [1]) -> column_values (50 records) -> 2 fields
+        self.assertEqual(estimate_stream_complexity(stream), 1 + (1 + 50 * 2))
+        self.assertEqual(estimate_stream_complexity(stream, batch_size=4), 1 + 4 * (1 + 50 * 2))
+
+    def test_largest_safe_page_size(self):
+        """The largest page size within the budget is returned."""
+        stream = make_stream(Boards, {"id": STRING, "name": STRING, "tags": LIST_OF_OBJECTS})
+        safe = largest_safe_page_size(stream, 200, budget=1000)
+        self.assertLessEqual(estimate_stream_complexity(stream, page_size=safe), 1000)
+        self.assertGreater(estimate_stream_complexity(stream, page_size=safe + 1), 1000)
+        self.assertEqual(largest_safe_page_size(stream, 200), 200)
+
+    def test_largest_safe_page_size_without_limit(self):
+        """Streams without a limit argument keep their page size."""
+        stream = make_stream(Tags, {"id": STRING})
+        self.assertEqual(largest_safe_page_size(stream, 100, budget=1), 100)
+
+    def test_stream_page_size_clamped_to_budget(self):
+        """BaseStream reduces the configured page size to fit max_query_complexity."""
+        properties = {"id": STRING, "name": STRING, "tags": LIST_OF_OBJECTS}
+        stream = make_stream(Boards, properties, {"max_query_complexity": 1000})
+        self.assertEqual(stream.page_size, largest_safe_page_size(stream, 200, budget=1000))
+        self.assertEqual(make_stream(Boards, properties).page_size, 200)
+
+
+class TestComplexityReport(unittest.TestCase):
+
+    def test_report_rows(self):
+        # boards(limit: 200) -> id, creator { id }, top_group { id }
+        stream = make_stream(Boards, {"id": STRING})
+        rows = complexity_report({"boards": stream}, budget=MAX_QUERY_COMPLEXITY)
+        self.assertEqual(rows, [{"stream": "boards", "page_size": 200, "complexity": 1 + 200 * 5, "safe_page_size": 200}])
+
+    def test_cli_lists_every_stream(self):
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            main(["--budget", "1000"])
+        output = stdout.getvalue()
+        self.assertIn("safe_page_size", output)
+        self.assertIn("board_items", output)
+        self.assertIn("workspaces", output)
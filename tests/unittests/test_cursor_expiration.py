@@ -12,6 +12,7 @@ the next page is fetched the API returns HTTP 200 with ``errors[].extensions.cod
      the restart (they fall below the updated ``bookmark_date``).
 """
 
+import json
 import unittest
 from unittest.mock import MagicMock, patch, PropertyMock
 
@@ -36,6 +37,10 @@ class MockResponse:
     def json(self):
         return self._json_data
 
+    @property
+    def content(self):
+        return json.dumps(self._json_data).encode()
+
 
 CURSOR_EXPIRED_RESPONSE = MockResponse(
     status_code=200,
@@ -268,6 +273,26 @@ class TestBoardItemsSyncCursorExpiration(unittest.TestCase):
         self.assertEqual(written_ids.count("1"), 1, "Record id=1 should not be duplicated")
         self.assertIn("2", written_ids)
 
+    def test_sync_never_loses_records_when_dedupe_index_overflows(self):
+        """Beyond ``dedupe_max_ids`` ids at the boundary timestamp, records may be
+        written twice on a restart but none is lost."""
+        peers = [
+            {"id": str(i), "board_id": "board_1", "updated_at": "2024-02-01T00:00:00Z", "name": "A"}
+            for i in range(1, 6)
+        ]
+        for max_ids, expected_duplicates in ((10, 0), (2, 3)):
+            with self.subTest(max_ids=max_ids):
+                batches = [peers[:3], MondayCursorExpiredError, peers]
+                stream = self._make_stream_with_records(batches)
+                stream.client.config["dedupe_max_ids"] = max_ids
+                stream.child_to_sync = []
+
+                _, _, mock_write_record = self._run_sync(stream)
+
+                written_ids = [call_args[0][1]["id"] for call_args in mock_write_record.call_args_list]
+                self.assertEqual(set(written_ids), {peer["id"] for peer in peers})
+                self.assertEqual(len(written_ids) - len(peers), expected_duplicates)
+
     def test_sync_handles_multiple_cursor_expirations(self):
         """Sync should survive more than one cursor expiration per board."""
         page1 = [
@@ -495,3 +520,151 @@ class TestBoardItemsSyncNoExpiration(unittest.TestCase):
 
 if __name__ == "__main__":
     unittest.main()
+
+
+# ---------------------------------------------------------------------------
+# Test: BoardItems.sync checkpoints its progress in state
+# ---------------------------------------------------------------------------
+
+class TestBoardItemsCheckpoint(unittest.TestCase):
+    """Verify that an interrupted board_items sync resumes from its checkpoint."""
+
+    def _make_stream(self, pages, checkpoint_interval=0):
+        """Return a stream paginating over *pages* with a cursor, like the API."""
+        stream = make_board_items_stream()
+        stream.client.config["checkpoint_interval"] = checkpoint_interval
+        stream.child_to_sync = []
+
+        def fake_get_records(parent_record=None):
+            for number, page in enumerate(pages, 1):
+                stream.cursor = "cursor" if number < len(pages) else None
+                for record in page:
+                    yield {"creator": None, "group": None, "parent_item": None, **record}
+                stream.update_pagination_key(page, parent_record, number)
+
+        stream.get_records = fake_get_records
+        stream.update_data_payload = MagicMock()
+        return stream
+
+    def _run_sync(self, stream, state, board_id="board_1"):
+        transformer = MagicMock(spec=Transformer)
+        transformer.transform.side_effect = lambda r, s, m: r
+        checkpoints = []
+
+        def write_state(value):
+            checkpoints.append(json.loads(json.dumps(value["bookmarks"]["board_items"]["checkpoint"])))
+
+        with patch("tap_monday.streams.board_items.write_record") as mock_write_record, \
+                patch("singer.write_state", side_effect=write_state):
+            stream.sync(state=state, transformer=transformer, parent_obj={"id": board_id})
+        return [c.args[1]["id"] for c in mock_write_record.call_args_list], checkpoints
+
+    def test_checkpoint_after_each_page_and_board(self):
+        stream = self._make_stream([
+            [{"id": "1", "updated_at": "2024-02-01T00:00:00Z"}, {"id": "2", "updated_at": "2024-02-01T00:00:00Z"}],
+            [{"id": "3", "updated_at": "2024-03-01T00:00:00Z"}],
+        ])
+        state = {}
+        written, checkpoints = self._run_sync(stream, state)
+
+        self.assertEqual(written, ["1", "2", "3"])
+        self.assertEqual(checkpoints, [
+            {"start_bookmark": "2024-01-01T00:00:00Z", "completed_boards": [], "board_id": "board_1",
+             "updated_at": "2024-02-01T00:00:00Z", "boundary_ids": ["1", "2"]},
+            {"start_bookmark": "2024-01-01T00:00:00Z", "completed_boards": ["board_1"], "board_id": None,
+             "updated_at": None, "boundary_ids": []},
+        ])
+        self.assertEqual(state["bookmarks"]["board_items"]["updated_at"], "2024-03-01T00:00:00Z")
+
+    def test_checkpoint_interval(self):
+        """Checkpoints are written at most once per interval; the state still
+        holds the latest progress."""
+        stream = self._make_stream([[{"id": str(i), "updated_at": "2024-02-0%dT00:00:00Z" % i}] for i in range(1, 5)],
+                                   checkpoint_interval=60)
+        state = {}
+        with patch("tap_monday.streams.board_items.time.monotonic", side_effect=[0.0, 30.0, 70.0, 100.0]):
+            written, checkpoints = self._run_sync(stream, state)
+
+        self.assertEqual(written, ["1", "2", "3", "4"])
+        self.assertEqual([c["updated_at"] for c in checkpoints], ["2024-02-01T00:00:00Z", "2024-02-03T00:00:00Z"])
+        self.assertEqual(state["bookmarks"]["board_items"]["checkpoint"]["completed_boards"], ["board_1"])
+
+    def test_resume_interrupted_run(self):
+        state = {"bookmarks": {"board_items": {
+            # Advanced by boards completed before the interruption.
+            "updated_at": "2024-05-01T00:00:00Z",
+            "checkpoint": {
+                "start_bookmark": "2024-01-01T00:00:00Z",
+                "completed_boards": ["board_0"],
+                "board_id": "board_1",
+                "updated_at": "2024-02-01T00:00:00Z",
+                "boundary_ids": ["1"],
+            },
+        }}}
+        completed = self._make_stream([[{"id": "x", "updated_at": "2024-06-01T00:00:00Z"}]])
+        written, checkpoints = self._run_sync(completed, state, board_id="board_0")
+        self.assertEqual((written, checkpoints), ([], []))
+
+        stream = self._make_stream([[
+            {"id": "0", "updated_at": "2024-01-15T00:00:00Z"},
+            {"id": "1", "updated_at": "2024-02-01T00:00:00Z"},
+            {"id": "2", "updated_at": "2024-02-01T00:00:00Z"},
+            {"id": "3", "updated_at": "2024-03-01T00:00:00Z"},
+        ]])
+        written, checkpoints = self._run_sync(stream, state)
+        # Only the item written at the checkpoint's updated_at is skipped.
+        self.assertEqual(written, ["0", "2", "3"])
+        self.assertEqual(checkpoints[-1]["completed_boards"], ["board_0", "board_1"])
+
+        # The next board starts from the bookmark of the interrupted run.
+        stream = self._make_stream([[{"id": "4", "updated_at": "2024-01-10T00:00:00Z"}]])
+        written, _ = self._run_sync(stream, state, board_id="board_2")
+        self.assertEqual(written, ["4"])
+
+    def test_resume_out_of_order_pages(self):
+        """Items older than the checkpoint's updated_at that were not written
+        before the interruption are written on resume."""
+        pages = [
+            [{"id": "1", "updated_at": "2024-03-01T00:00:00Z"}],
+            [{"id": "2", "updated_at": "2024-02-01T00:00:00Z"}, {"id": "3", "updated_at": "2024-03-01T00:00:00Z"}],
+        ]
+        stream = self._make_stream(pages)
+        state = {}
+
+        def interrupt_after_first_page(raw_records, parent_record, next_page):
+            stream.on_page_complete()
+            raise RuntimeError("interrupted")
+
+        stream.update_pagination_key = interrupt_after_first_page
+        with self.assertRaises(RuntimeError):
+            self._run_sync(stream, state)
+        self.assertEqual(state["bookmarks"]["board_items"]["checkpoint"]["updated_at"], "2024-03-01T00:00:00Z")
+
+        written, checkpoints = self._run_sync(self._make_stream(pages), state)
+        self.assertEqual(written, ["2", "3"])
+        self.assertEqual(checkpoints[-1]["completed_boards"], ["board_1"])
+
+    def test_first_checkpoint_written(self):
+        """The first checkpoint is written at once, later ones once per interval."""
+        stream = self._make_stream([[{"id": "1", "updated_at": "2024-02-01T00:00:00Z"}]], checkpoint_interval=60)
+        with patch("tap_monday.streams.board_items.time.monotonic", return_value=0.0):
+            _, checkpoints = self._run_sync(stream, {})
+        self.assertEqual([c["completed_boards"] for c in checkpoints], [["board_1"]])
+
+    def test_parent_completion_clears_checkpoint(self):
+        from tap_monday.streams.boards import Boards
+
+        client = MagicMock()
+        client.config = {"start_date": "2024-01-01T00:00:00Z"}
+        boards = Boards(client=client)
+        boards.metadata = {(): {"selected": True}}
+        board_items = make_board_items_stream(client=client)
+        board_items.bookmark_value = "2024-01-01T00:00:00Z"
+        boards.child_to_sync = [board_items]
+        state = {"bookmarks": {"board_items": {"updated_at": "2024-03-01T00:00:00Z",
+                                               "checkpoint": {"completed_boards": ["board_1"]}}}}
+
+        boards.write_bookmark(state, "boards", value="2024-03-01T00:00:00Z")
+
+        self.assertNotIn("checkpoint", state["bookmarks"]["board_items"])
+        self.assertIsNone(board_items.bookmark_value)
@@ -0,0 +1,60 @@
+"""Unit tests for the memory-bounded id index (tap_monday.dedupe)."""
+
+import random
+import unittest
+
+from parameterized import parameterized
+
+from tap_monday.dedupe import MIN_TAIL, IdIndex
+
+
+class TestIdIndex(unittest.TestCase):
+
+    def test_membership_across_merges(self):
+        rng = random.Random(0)
+        ids = [str(rng.randrange(10 ** 12)) for _ in range(MIN_TAIL * 20)]
+        index = IdIndex()
+        for record_id in ids:
+            index.add(record_id)
+
+        self.assertLess(len(index._tail), len(index._ids))
+        self.assertTrue(all(record_id in index for record_id in ids))
+        absent = [str(rng.randrange(10 ** 12)) for _ in range(1000)]
+        self.assertEqual([record_id in index for record_id in absent],
+                         [record_id in set(ids) for record_id in absent])
+
+    @parameterized.expand([
+        ("leading_zero", "007", "7"),
+        ("non_numeric", "abc", "ab"),
+        ("too_large", str(2 ** 64), str(2 ** 63)),
+        ("negative", "-5", "5"),
+    ])
+    def test_ids_stored_exactly(self, _, record_id, other_id):
+        index = IdIndex()
+        index.add(record_id)
+        self.assertIn(record_id, index)
+        self.assertNotIn(other_id, index)
+
+    def test_overflow_never_skips(self):
+        index = IdIndex(max_ids=3)
+        for record_id in ["1", "2", "3"]:
+            index.add(record_id)
+        self.assertFalse(index.overflowed)
+        self.assertIn("3", index)
+
+        with self.assertLogs(level="WARNING"):
+            index.add("4")
+        self.assertTrue(index.overflowed)
+        self.assertNotIn("1", index)
+        self.assertEqual((len(index), index.peak_ids), (0, 3))
+
+        index.clear()
+        index.add("5")
+        self.assertIn("5", index)
+        self.assertFalse(index.overflowed)
+
+    def test_size_is_compact(self):
+        index = IdIndex()
+        for i in range(MIN_TAIL * 16):
+            index.add(str(10 ** 10 + i))
+        self.assertLess(index.size_bytes / len(index), 20)
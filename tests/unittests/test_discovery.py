@@ -17,18 +17,25 @@ Covers:
   11. Access checks: inaccessible streams excluded from catalog.
   12. Access checks: child streams removed when parent is excluded.
   13. Access checks: MondayForbiddenError raised when all parent streams blocked.
+  14. Access checks: the probes are sent as a single aliased request.
+  15. The precompiled schema bundle matches the schema files; stream classes
+      are imported on first use.
 """
 
 import json
 import os
+import re
+import subprocess
+import sys
 import unittest
 from unittest.mock import MagicMock, patch
 
 from singer.catalog import Catalog
 
+from tap_monday.client import Client
 from tap_monday.discover import discover, _apply_access_checks, _prune_inaccessible_children
 from tap_monday.exceptions import MondayForbiddenError, MondayGraphQLInternalError
-from tap_monday.schema import get_schemas, get_abs_path
+from tap_monday.schema import compile_schemas, get_schemas, get_abs_path
 from tap_monday.streams import STREAMS
 
 SCHEMAS_DIR = get_abs_path("schemas")
@@ -633,3 +640,114 @@ def _make_forbidden_stream_cls(name, original_cls):
     _Forbidden.tap_stream_id = original_cls.tap_stream_id
     _Forbidden.__name__ = original_cls.__name__
     return _Forbidden
+
+
+# ---------------------------------------------------------------------------
+# 14 – Access probes combined into a single aliased request
+# ---------------------------------------------------------------------------
+
+class _ProbeResponse:
+    def __init__(self, body, status_code=200):
+        self.status_code = status_code
+        self.content = json.dumps(body).encode()
+
+
+class TestCombinedAccessProbes(unittest.TestCase):
+    """The probes of all streams are sent as one aliased GraphQL request."""
+
+    # Root fields denied by the fake API, by GraphQL error code.
+    DENIED = {"account": "UserUnauthorizedException", "platform_api": "INTERNAL_SERVER_ERROR"}
+
+    def setUp(self):
+        self.client = Client({"api_token": "dummy_token", "start_date": "2024-01-01T00:00:00Z"})
+        self.queries = []
+
+    def fake_request(self, method, url, data=None, **kwargs):
+        """Answers probe queries, aliased or not, denying the DENIED root fields."""
+        query = json.loads(data)["query"]
+        self.queries.append(query)
+        fields = re.findall(r"(probe_\d+): (\w+)", query) or [(None, query.split()[2])]
+        response = {"data": {}, "errors": []}
+        for alias, root_field in fields:
+            key = alias or root_field
+            if root_field in self.DENIED:
+                response["data"][key] = None
+                response["errors"].append({"message": "denied", "path": [key],
+                                           "extensions": {"code": self.DENIED[root_field]}})
+            else:
+                response["data"][key] = {"__typename": "Query"}
+        if not response["errors"]:
+            del response["errors"]
+        return _ProbeResponse(response)
+
+    def apply_access_checks(self, side_effect):
+        schemas, field_metadata = get_schemas()
+        with patch("requests.Session.request", side_effect=side_effect):
+            _apply_access_checks(self.client, schemas, field_metadata)
+        return schemas
+
+    def test_single_request_with_errors_attributed_per_alias(self):
+        schemas = self.apply_access_checks(self.fake_request)
+
+        self.assertEqual(len(self.queries), 1)
+        self.assertNotIn("account", schemas)
+        self.assertIn("boards", schemas)
+        self.assertNotIn("daily_limit", schemas["platform_api"]["properties"])
+        self.assertEqual(self.client._probe_outcomes, {})
+
+    def test_falls_back_to_separate_probes(self):
+        """An error without a path fails the combined request; each probe is then sent alone."""
+        def side_effect(method, url, data=None, **kwargs):
+            if "probe_0" in data:
+                self.queries.append(json.loads(data)["query"])
+                return _ProbeResponse({"errors": [{"message": "Parse error",
+                                                   "extensions": {"code": "GRAPHQL_VALIDATION_FAILED"}}]})
+            return self.fake_request(method, url, data)
+
+        schemas = self.apply_access_checks(side_effect)
+
+        probed_streams = [name for name in get_schemas()[0] if STREAMS[name]().get_access_probes()]
+        self.assertEqual(len(self.queries), 1 + len(probed_streams))
+        self.assertNotIn("account", schemas)
+        self.assertIn("boards", schemas)
+        self.assertNotIn("daily_limit", schemas["platform_api"]["properties"])
+
+
+# ---------------------------------------------------------------------------
+# 15 – Precompiled schema bundle and lazy stream classes
+# ---------------------------------------------------------------------------
+
+class TestSchemaBundle(unittest.TestCase):
+
+    def test_bundle_is_up_to_date(self):
+        """Run `python -m tap_monday.schema` after changing a schema file or a stream's keys."""
+        self.assertEqual(get_schemas(), compile_schemas())
+
+    def test_each_call_returns_a_copy(self):
+        schemas, field_metadata = get_schemas()
+        schemas.pop("boards")
+        field_metadata["tags"].clear()
+        schemas, field_metadata = get_schemas()
+        self.assertIn("boards", schemas)
+        self.assertTrue(field_metadata["tags"])
+
+    def test_schema_files_are_used_without_bundle(self):
+        with patch("tap_monday.schema.read_schema_bundle", return_value=None), \
+                patch("tap_monday.schema.compile_schemas", wraps=compile_schemas) as mock_compile:
+            self.assertEqual(get_schemas(), compile_schemas())
+        mock_compile.assert_called()
+
+    def test_stream_classes_are_imported_on_first_use(self):
+        code = ("import sys, tap_monday; from tap_monday.streams import STREAMS; STREAMS['tags']; "
+                "print(sorted(m for m in sys.modules if m.startswith('tap_monday.streams.')))")
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), str(["tap_monday.streams.abstracts", "tap_monday.streams.tags"]))
+
+    def test_stream_registry(self):
+        from tap_monday.streams import Tags
+        self.assertIs(STREAMS["tags"], Tags)
+        self.assertIn("tags", STREAMS)
+        self.assertNotIn("unknown", STREAMS)
+        self.assertIsNone(STREAMS.get("unknown"))
+        with self.assertRaises(KeyError):
+            STREAMS["unknown"]
@@ -0,0 +1,91 @@
+"""Unit tests for the discovery cache (tap_monday.discovery_cache)."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from tap_monday.discover import discover
+from tap_monday.discovery_cache import DiscoveryCache, get_cache_key, invalidated_on_auth_error
+from tap_monday.exceptions import MondayError, MondayForbiddenError, MondayUnauthorizedError
+
+
+def deny_account(client, schemas, field_metadata):
+    """Access checks excluding account and platform_api's daily_limit."""
+    schemas.pop("account")
+    field_metadata.pop("account")
+    schemas["platform_api"]["properties"].pop("daily_limit")
+    field_metadata["platform_api"] = [entry for entry in field_metadata["platform_api"]
+                                      if tuple(entry["breadcrumb"]) != ("properties", "daily_limit")]
+
+
+class TestDiscoveryCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.client = MagicMock(api_version="2025-07")
+        self.client.config = {"api_token": "token", "start_date": "2024-01-01T00:00:00Z",
+                              "discovery_cache_dir": self.directory}
+
+    def discover(self, now=1000.0):
+        with patch("tap_monday.discover._apply_access_checks", side_effect=deny_account) as mock_checks, \
+                patch("time.time", return_value=now):
+            catalog = discover(self.client)
+        return catalog, mock_checks.call_count
+
+    def test_cached_access_checks_are_reused(self):
+        first, checks = self.discover()
+        self.assertEqual(checks, 1)
+        second, checks = self.discover(now=2000.0)
+        self.assertEqual(checks, 0)
+
+        self.assertEqual(second.to_dict(), first.to_dict())
+        self.assertIsNone(second.get_stream("account"))
+        platform_api = second.get_stream("platform_api")
+        self.assertNotIn("daily_limit", platform_api.schema.properties)
+        self.assertNotIn(("properties", "daily_limit"),
+                         [tuple(entry["breadcrumb"]) for entry in platform_api.metadata])
+
+    def test_expired_entry_is_probed_again(self):
+        self.discover()
+        self.client.config["discovery_cache_ttl"] = 60
+        self.assertEqual(self.discover(now=1059.0)[1], 0)
+        self.assertEqual(self.discover(now=1061.0)[1], 1)
+
+    def test_entry_is_keyed_on_the_token(self):
+        self.discover()
+        self.client.config["api_token"] = "other token"
+        self.assertEqual(self.discover()[1], 1)
+        self.assertEqual(len(os.listdir(self.directory)), 2)
+        for name in os.listdir(self.directory):
+            with open(os.path.join(self.directory, name)) as cache_file:
+                self.assertNotIn("token", cache_file.read().replace('"key"', ""))
+
+    def test_cache_key(self):
+        self.assertEqual(get_cache_key("a", "2025-07"), get_cache_key("a", "2025-07"))
+        self.assertNotEqual(get_cache_key("a", "2025-07"), get_cache_key("a", "2025-10"))
+        with patch("tap_monday.discovery_cache.get_tap_version", return_value="9.9.9"):
+            self.assertNotEqual(get_cache_key("a", "2025-07"), get_cache_key("b", "2025-07"))
+
+    def test_unreadable_entry_is_ignored(self):
+        cache = DiscoveryCache(self.directory, get_cache_key("token", "2025-07"))
+        with open(cache.path, "w") as cache_file:
+            cache_file.write("{")
+        self.assertIsNone(cache.load())
+        self.assertEqual(self.discover()[1], 1)
+
+    def test_disabled_without_directory(self):
+        self.assertIsNone(DiscoveryCache.from_config({"api_token": "token"}, "2025-07"))
+
+    def test_invalidated_on_auth_error(self):
+        for error, removed in ((MondayUnauthorizedError, True), (MondayForbiddenError, True),
+                               (MondayError, False)):
+            with self.subTest(error=error.__name__):
+                self.discover()
+                cache = DiscoveryCache.from_config(self.client.config, "2025-07")
+                with self.assertRaises(error):
+                    with invalidated_on_auth_error(cache):
+                        raise error("denied")
+                self.assertEqual(os.path.exists(cache.path), not removed)
@@ -0,0 +1,171 @@
+"""Unit tests for the optional HTTP/2 transport (tap_monday.http2).
+
+A small HTTP/2 stand-in server (cleartext, prior knowledge) built on the
+``h2`` library answers every GraphQL POST, so the tests can verify that the
+client talks HTTP/2 and that concurrent requests share one connection.
+"""
+
+import importlib
+import json
+import socket
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from requests.exceptions import ConnectionError
+
+from tap_monday import http2
+from tap_monday.client import Client
+from tap_monday.exceptions import MondayRateLimitError
+
+if http2.is_available():
+    import h2.config
+    import h2.connection
+    import h2.events
+
+
+class Http2StandInServer:
+    """Threaded h2c server echoing the received GraphQL query back as JSON.
+
+    Requests whose query contains ``rate_limited`` are answered with a 429.
+    """
+
+    def __init__(self):
+        self.sock = socket.socket()
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen()
+        self.connections = 0
+        self.requests = []
+        self.url = "http://127.0.0.1:{}/v2".format(self.sock.getsockname()[1])
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        h2_conn = h2.connection.H2Connection(config=h2.config.H2Configuration(client_side=False))
+        h2_conn.initiate_connection()
+        conn.sendall(h2_conn.data_to_send())
+        bodies, methods = {}, {}
+        while True:
+            try:
+                data = conn.recv(65535)
+            except OSError:
+                return
+            if not data:
+                return
+            for event in h2_conn.receive_data(data):
+                if isinstance(event, h2.events.RequestReceived):
+                    bodies[event.stream_id] = b""
+                    methods[event.stream_id] = dict(event.headers).get(b":method")
+                elif isinstance(event, h2.events.DataReceived):
+                    bodies[event.stream_id] += event.data
+                    h2_conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                elif isinstance(event, h2.events.StreamEnded):
+                    self._respond(h2_conn, event.stream_id, bodies.pop(event.stream_id),
+                                  methods.pop(event.stream_id) == b"HEAD")
+            conn.sendall(h2_conn.data_to_send())
+
+    def _respond(self, h2_conn, stream_id, body, head=False):
+        if head:
+            h2_conn.send_headers(stream_id, [(":status", "200")], end_stream=True)
+            return
+        query = json.loads(body or b"{}").get("query", "")
+        self.requests.append(query)
+        if "rate_limited" in query:
+            status, payload = "429", {"errors": [{"message": "Rate limit", "extensions": {"retry_in_seconds": 0}}]}
+        else:
+            status, payload = "200", {"data": {"query": query}}
+        data = json.dumps(payload).encode()
+        h2_conn.send_headers(stream_id, [
+            (":status", status),
+            ("content-type", "application/json"),
+            ("content-length", str(len(data))),
+        ])
+        h2_conn.send_data(stream_id, data, end_stream=True)
+
+    def close(self):
+        self.sock.close()
+
+
+@unittest.skipUnless(http2.is_available(), "httpx[http2] is not installed")
+class TestHttp2Transport(unittest.TestCase):
+
+    def setUp(self):
+        self.server = Http2StandInServer()
+        self.addCleanup(self.server.close)
+        self.client = Client({"api_token": "dummy_token", "start_date": "2019-01-01T00:00:00Z", "http2": True})
+        # The stand-in server speaks cleartext HTTP/2 with prior knowledge.
+        self.client._session = http2.Http2Session(http1=False)
+        self.addCleanup(self.client._session.close)
+
+    def test_client_uses_http2_session(self):
+        client = Client({"api_token": "dummy_token", "http2": True})
+        self.assertIsInstance(client._session, http2.Http2Session)
+
+    def test_make_request_over_http2(self):
+        """make_request returns the parsed body of an HTTP/2 response."""
+        result = self.client.make_request("POST", self.server.url, body=json.dumps({"query": "query { me { id } }"}))
+        self.assertEqual(result, {"data": {"query": "query { me { id } }"}})
+
+    def test_concurrent_requests_share_one_connection(self):
+        """Concurrent POSTs are multiplexed over a single HTTP/2 connection."""
+        def post(i):
+            body = json.dumps({"query": "query { boards(ids: %d) { id } }" % i})
+            return self.client.make_request("POST", self.server.url, body=body)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(post, range(32)))
+
+        self.assertEqual(len(results), 32)
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(len(self.server.requests), 32)
+        self.assertEqual(self.client.pool_stats(), {"connections_created": 1, "connections_reused": 31, "requests": 32})
+
+    def test_warm_up_opens_one_connection(self):
+        """Concurrent warm-up requests wait for the first connection and share it."""
+        self.client.base_url = self.server.url
+        self.client.warm_up(4)
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(self.client.pool_stats(), {"connections_created": 1, "connections_reused": 3, "requests": 4})
+
+    def test_import_leaves_httpx_logger_alone(self):
+        """The httpx logger is only quieted when an HTTP/2 session is created."""
+        with patch("logging.getLogger") as get_logger:
+            importlib.reload(http2)
+        get_logger.assert_not_called()
+
+    def test_error_responses_are_mapped(self):
+        """HTTP/2 error responses go through the same error handling and retries."""
+        with patch("time.sleep", return_value=None):
+            with self.assertRaises(MondayRateLimitError):
+                self.client.make_request("POST", self.server.url, body=json.dumps({"query": "rate_limited"}))
+        self.assertEqual(len(self.server.requests), 5)
+
+    def test_transport_errors_are_requests_exceptions(self):
+        """Connection failures surface as requests.ConnectionError for backoff."""
+        unused = socket.socket()
+        unused.bind(("127.0.0.1", 0))
+        port = unused.getsockname()[1]
+        unused.close()
+        session = http2.Http2Session(http1=False)
+        self.addCleanup(session.close)
+        with self.assertRaises(ConnectionError):
+            session.request("POST", "http://127.0.0.1:{}/v2".format(port), data="{}", timeout=1)
+
+
+class TestHttp2Fallback(unittest.TestCase):
+
+    def test_falls_back_to_http1_without_dependencies(self):
+        """Without httpx[http2] the client keeps the requests session."""
+        with patch("tap_monday.client.http2.is_available", return_value=False):
+            client = Client({"api_token": "dummy_token", "http2": True})
+        self.assertIsNotNone(client._adapter)
+        self.assertNotIsInstance(client._session, getattr(http2, "Http2Session"))
@@ -0,0 +1,167 @@
+"""Unit tests for record transformation in worker processes (tap_monday.parallel)."""
+
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+from singer.transform import UNIX_MILLISECONDS_INTEGER_DATETIME_PARSING, SchemaMismatch
+
+from tap_monday.parallel import RecordPipeline, transform_batch
+from tap_monday.streams.abstracts import FullTableStream, IncrementalStream
+from tap_monday.streams.reply import Reply
+from tap_monday.transform import CompiledTransformer
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "id": {"type": ["null", "string"]},
+        "count": {"type": ["null", "integer"]},
+        "updated_at": {"type": ["null", "string"], "format": "date-time"},
+    },
+}
+METADATA = {(): {"selected": True}, ("properties", "count"): {"selected": False}}
+
+RECORDS = [
+    {"id": i, "count": "1,000", "updated_at": "2024-01-%02dT00:00:00Z" % (1 + i % 28)}
+    for i in range(60)
+]
+
+
+class DummyIncrementalStream(IncrementalStream):
+    tap_stream_id = "dummy_incremental"
+    replication_method = "INCREMENTAL"
+    replication_keys = ["updated_at"]
+    key_properties = ("id",)
+
+    def get_records(self, parent_record=None):
+        return [dict(record) for record in RECORDS]
+
+
+class DummyFullTableStream(FullTableStream):
+    tap_stream_id = "dummy_full_table"
+    replication_method = "FULL_TABLE"
+    replication_keys = []
+    key_properties = ("id",)
+
+    def get_records(self, parent_record=None):
+        return [dict(record) for record in RECORDS]
+
+
+class DummyChildStream(DummyIncrementalStream):
+    tap_stream_id = "dummy_child"
+    parent = "dummy_incremental"
+
+    def get_records(self, parent_record=None):
+        return [dict(record) for record in RECORDS[parent_record["index"]::6]]
+
+
+def make_stream(stream_class, pipeline):
+    client = MagicMock()
+    client.config = {"start_date": "2024-01-20T00:00:00Z"}
+    stream = stream_class(client=client)
+    stream.schema = SCHEMA
+    stream.metadata = METADATA
+    stream.pipeline = pipeline
+    return stream
+
+
+class TestRecordPipeline(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pipeline = RecordPipeline(
+            2, integer_datetime_fmt=UNIX_MILLISECONDS_INTEGER_DATETIME_PARSING, batch_size=7)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pipeline.close()
+
+    def expected_records(self, records, replication_key=None):
+        transformer = CompiledTransformer(integer_datetime_fmt=UNIX_MILLISECONDS_INTEGER_DATETIME_PARSING)
+        return transform_batch(transformer, SCHEMA, METADATA, [dict(r) for r in records], replication_key)
+
+    def test_matches_in_process_transform_in_order(self):
+        results = list(self.pipeline.transform("dummy", SCHEMA, METADATA, iter(RECORDS), "updated_at"))
+        self.assertEqual(results, self.expected_records(RECORDS, "updated_at"))
+        self.assertEqual([json.loads(record)["id"] for record, _ in results], [str(i) for i in range(60)])
+
+    def test_registered_schemas_are_not_sent(self):
+        """Batches of the streams registered with the workers only carry the stream name."""
+        with RecordPipeline(1, integer_datetime_fmt=UNIX_MILLISECONDS_INTEGER_DATETIME_PARSING, batch_size=7,
+                            schemas={"dummy": (SCHEMA, METADATA)}) as pipeline:
+            with patch.object(pipeline._executor, "submit", wraps=pipeline._executor.submit) as mock_submit:
+                results = list(pipeline.transform("dummy", SCHEMA, METADATA, iter(RECORDS), "updated_at"))
+        self.assertEqual(results, self.expected_records(RECORDS, "updated_at"))
+        self.assertTrue(all(c.args[2:4] == (None, None) for c in mock_submit.call_args_list))
+
+    def test_schema_mismatch_is_raised_in_main_process(self):
+        records = RECORDS[:10] + [{"id": "bad", "count": "not a number"}]
+        with self.assertRaises(SchemaMismatch):
+            list(self.pipeline.transform("dummy", SCHEMA, {}, iter(records)))
+
+    @patch("tap_monday.streams.abstracts.write_record_json")
+    @patch("tap_monday.streams.abstracts.write_bookmark", side_effect=lambda state, *args: state)
+    def test_incremental_stream_filters_bookmark(self, mock_write_bookmark, mock_write_record_json):
+        stream = make_stream(DummyIncrementalStream, self.pipeline)
+        transformer = MagicMock()
+
+        count, _ = stream.sync({}, transformer)
+
+        expected = [(record, value) for record, value in self.expected_records(RECORDS, "updated_at")
+                    if value >= "2024-01-20T00:00:00Z"]
+        self.assertEqual(count, len(expected))
+        self.assertEqual([c.args[1] for c in mock_write_record_json.call_args_list], [record for record, _ in expected])
+        self.assertEqual(mock_write_bookmark.call_args.args[3], max(value for _, value in expected))
+        transformer.transform.assert_not_called()
+
+    @patch("tap_monday.streams.abstracts.write_record_json")
+    def test_full_table_stream(self, mock_write_record_json):
+        stream = make_stream(DummyFullTableStream, self.pipeline)
+        count, _ = stream.sync({}, MagicMock())
+        self.assertEqual(count, len(RECORDS))
+        self.assertEqual([c.args[1] for c in mock_write_record_json.call_args_list],
+                         [record for record, _ in self.expected_records(RECORDS)])
+
+    @patch("tap_monday.streams.abstracts.write_record")
+    def test_streams_with_children_transform_in_process(self, mock_write_record):
+        stream = make_stream(DummyFullTableStream, self.pipeline)
+        stream.child_to_sync = [MagicMock()]
+        stream.sync({}, CompiledTransformer())
+        self.assertEqual(mock_write_record.call_count, len(RECORDS))
+
+    @patch("tap_monday.streams.abstracts.write_record_json")
+    @patch("tap_monday.streams.abstracts.write_bookmark", side_effect=lambda state, *args: state)
+    def test_derived_stream_page(self, mock_write_bookmark, mock_write_record_json):
+        stream = make_stream(Reply, self.pipeline)
+        parents = [{"id": str(i), "replies": [dict(record) for record in RECORDS[i::6]]} for i in range(6)]
+
+        count, _ = stream.sync_from_parents({}, MagicMock(), parents)
+
+        replies = [stream.modify_object(dict(record), parent) for parent in parents for record in parent["replies"]]
+        expected = [(record, value) for record, value in self.expected_records(replies, "updated_at")
+                    if value >= "2024-01-20T00:00:00Z"]
+        self.assertEqual(count, len(expected))
+        self.assertEqual([c.args[1] for c in mock_write_record_json.call_args_list], [record for record, _ in expected])
+        self.assertEqual(mock_write_bookmark.call_args.args[3], max(value for _, value in expected))
+
+    @patch("tap_monday.streams.abstracts.metrics.record_counter")
+    @patch("tap_monday.streams.abstracts.write_record_json")
+    @patch("tap_monday.streams.abstracts.write_bookmark", side_effect=lambda state, *args: state)
+    def test_child_records_batched_across_parents(self, mock_write_bookmark, mock_write_record_json,
+                                                  mock_record_counter):
+        """The records of a child stream fill batches spanning parent records
+        and are written, counted and bookmarked once the pipeline is flushed."""
+        stream = make_stream(DummyChildStream, self.pipeline)
+        parents = [{"index": i} for i in range(6)]
+        with patch.object(self.pipeline._executor, "submit", wraps=self.pipeline._executor.submit) as mock_submit:
+            counts = [stream.sync({}, MagicMock(), parent_obj=parent)[0] for parent in parents]
+            self.pipeline.flush()
+
+        records = [dict(record) for parent in parents for record in RECORDS[parent["index"]::6]]
+        expected = [(record, value) for record, value in self.expected_records(records, "updated_at")
+                    if value >= "2024-01-20T00:00:00Z"]
+        self.assertEqual(counts, [0] * 6)
+        self.assertEqual(mock_submit.call_count, 9)
+        self.assertEqual([c.args[1] for c in mock_write_record_json.call_args_list], [record for record, _ in expected])
+        mock_record_counter.return_value.__enter__.return_value.increment.assert_called_once_with(len(expected))
+        self.assertEqual(mock_write_bookmark.call_args.args[3], max(value for _, value in expected))
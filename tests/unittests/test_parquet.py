@@ -0,0 +1,174 @@
+"""Unit tests for the Parquet output (tap_monday.parquet)."""
+
+import datetime
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from tap_monday import output, parquet
+from tap_monday.batch import BatchSink
+from tap_monday.change_index import DELETED_AT, DELETED_AT_SCHEMA
+from tap_monday.sync import update_currently_syncing
+
+if parquet.is_available():
+    import pyarrow
+    import pyarrow.parquet
+
+SCHEMAS = {
+    "board_items": {
+        "type": "object",
+        "properties": {
+            "id": {"type": ["null", "string"]},
+            "board_id": {"type": ["null", "string"]},
+            "updated_at": {"type": ["null", "string"], "format": "date-time"},
+            "subscribers": {
+                "type": ["null", "array"],
+                "items": {"type": ["null", "object"], "properties": {"id": {"type": ["null", "string"]}}},
+            },
+            "column": {
+                "type": ["null", "object"],
+                "properties": {"id": {"type": ["null", "string"]}},
+                "additionalProperties": True,
+            },
+        },
+    },
+    "updates": {
+        "type": "object",
+        "properties": {"id": {"type": ["null", "string"]}, "count": {"type": ["null", "integer"]}},
+    },
+}
+
+
+def item(item_id, board_id, **extra):
+    record = {"id": item_id, "board_id": board_id, "updated_at": "2024-01-31T12:00:00.000000Z"}
+    record.update(extra)
+    return record
+
+
+@unittest.skipUnless(parquet.is_available(), "pyarrow is not installed")
+class TestParquetSink(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def run_sink(self, records, **kwargs):
+        """Writes (stream, record) pairs within a Parquet sink and returns the
+        messages written to stdout."""
+        kwargs.setdefault("schemas", SCHEMAS)
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            with output.sink(parquet.ParquetSink(self.directory, **kwargs)):
+                for stream_name, record in records:
+                    output.write_record(stream_name, record)
+            return [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+    def read(self, message):
+        return pyarrow.parquet.ParquetFile(message["manifest"][0][len("file://"):])
+
+    def test_files_are_partitioned_by_board(self):
+        records = [("board_items", item("1", "10")), ("board_items", item("2", "10")),
+                   ("board_items", item("3", "20")), ("updates", {"id": "u", "count": 1})]
+        messages = self.run_sink(records)
+
+        self.assertEqual([m["stream"] for m in messages], ["board_items", "board_items", "updates"])
+        self.assertEqual(messages[0]["encoding"], {"format": "parquet", "compression": "snappy"})
+        paths = [os.path.relpath(m["manifest"][0][len("file://"):], self.directory) for m in messages]
+        self.assertEqual([os.path.dirname(path) for path in paths],
+                         ["board_items/board_id=10", "board_items/board_id=20",
+                          "updates/board_id=__HIVE_DEFAULT_PARTITION__"])
+        self.assertEqual(self.read(messages[0]).read().column("id").to_pylist(), ["1", "2"])
+        self.assertEqual(self.read(messages[2]).read().to_pylist(), [{"id": "u", "count": 1}])
+
+    def test_schema_and_values(self):
+        record = item("1", "10", subscribers=[{"id": "5"}], column={"id": "c", "title": "Status"})
+        table = self.read(self.run_sink([("board_items", record), ("board_items", item("2", "10"))])[0]).read()
+
+        self.assertEqual(table.schema.field("updated_at").type, pyarrow.timestamp("us", tz="UTC"))
+        self.assertEqual(table.schema.field("subscribers").type,
+                         pyarrow.list_(pyarrow.struct([pyarrow.field("id", pyarrow.string())])))
+        self.assertEqual(table.schema.field("column").type, pyarrow.string())
+        rows = table.to_pylist()
+        self.assertEqual(rows[0]["updated_at"], datetime.datetime(2024, 1, 31, 12, tzinfo=datetime.timezone.utc))
+        self.assertEqual(rows[0]["subscribers"], [{"id": "5"}])
+        self.assertEqual(json.loads(rows[0]["column"]), {"id": "c", "title": "Status"})
+        self.assertEqual((rows[1]["subscribers"], rows[1]["column"]), (None, None))
+
+    def test_row_group_size(self):
+        messages = self.run_sink([("board_items", item(str(i), "10")) for i in range(5)], row_group_size=2)
+        metadata = self.read(messages[0]).metadata
+        self.assertEqual(metadata.num_rows, 5)
+        self.assertEqual([metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)], [2, 2, 1])
+
+    def test_other_streams(self):
+        messages = self.run_sink([("boards", {"id": "1"})])
+        self.assertEqual(messages, [{"type": "RECORD", "stream": "boards", "record": {"id": "1"}}])
+
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            with output.sink(parquet.ParquetSink(self.directory, schemas=SCHEMAS,
+                                                 fallback=BatchSink(self.directory))):
+                output.write_record("boards", {"id": "1"})
+                output.write_record_json("updates", '{"id":"2","count":null}')
+            messages = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual(sorted((m["stream"], m["encoding"]["format"]) for m in messages),
+                         [("boards", "jsonl"), ("updates", "parquet")])
+
+    def test_schema_message_schema(self):
+        """Files use the schema of the SCHEMA message, e.g. to keep the
+        ``_sdc_deleted_at`` of deletion records."""
+        schema = dict(SCHEMAS["board_items"])
+        schema["properties"] = {**schema["properties"], DELETED_AT: DELETED_AT_SCHEMA}
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            with output.sink(parquet.ParquetSink(self.directory, schemas=SCHEMAS,
+                                                 fallback=BatchSink(self.directory))):
+                output.write_schema("boards", {"type": "object", "properties": {}}, ["id"])
+                output.write_schema("board_items", schema, ["id", "board_id"])
+                output.write_record("board_items", {"id": "1", "board_id": "10",
+                                                    DELETED_AT: "2024-02-01T00:00:00.000000Z"})
+            messages = [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+        self.assertEqual([m["type"] for m in messages], ["SCHEMA", "SCHEMA", "BATCH"])
+        rows = self.read(messages[2]).read().to_pylist()
+        self.assertEqual(rows[0][DELETED_AT], datetime.datetime(2024, 2, 1, tzinfo=datetime.timezone.utc))
+
+    def test_state_follows_complete_files(self):
+        """STATE is only written once the referenced files are complete, and
+        every flush starts new files."""
+        def check_files(state):
+            for _, _, names in os.walk(self.directory):
+                self.assertFalse([name for name in names if name.endswith(".part")])
+            print(json.dumps({"type": "STATE", "value": state}))
+
+        with patch("sys.stdout", new_callable=io.StringIO) as stdout, \
+                patch("singer.write_state", side_effect=check_files):
+            with output.buffered(), output.sink(parquet.ParquetSink(self.directory, schemas=SCHEMAS)):
+                output.write_record("board_items", item("1", "10"))
+                update_currently_syncing({}, "board_items")
+                output.write_record("board_items", item("2", "10"))
+            messages = [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+        self.assertEqual([m["type"] for m in messages], ["BATCH", "STATE", "BATCH"])
+        self.assertNotEqual(messages[0]["manifest"], messages[2]["manifest"])
+        self.assertEqual(self.read(messages[2]).read().column("id").to_pylist(), ["2"])
+
+    def test_failed_sync_removes_incomplete_files(self):
+        with self.assertRaises(RuntimeError):
+            with output.sink(parquet.ParquetSink(self.directory, schemas=SCHEMAS)):
+                output.write_record("board_items", item("1", "10"))
+                raise RuntimeError("sync failed")
+        self.assertEqual([names for _, _, names in os.walk(self.directory) if names], [])
+
+    def test_stream_schemas(self):
+        """The Arrow schema of every Parquet stream derives from its JSON schema."""
+        sink = parquet.ParquetSink(self.directory)
+        self.addCleanup(sink.close)
+        for stream_name in parquet.PARQUET_STREAMS:
+            schema, _ = parquet.arrow_schema(sink.schemas[stream_name])
+            self.assertEqual(schema.names, list(sink.schemas[stream_name]["properties"]))
+
+    def test_unknown_compression(self):
+        with self.assertRaises(ValueError):
+            parquet.ParquetSink(self.directory, compression="lzma", schemas=SCHEMAS)
@@ -0,0 +1,177 @@
+"""Unit tests for incremental parsing of paginated responses (tap_monday.streaming)."""
+
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+from tap_monday import streaming
+from tap_monday.client import Client
+from tap_monday.exceptions import MondayCursorExpiredError, MondayRateLimitError
+from tap_monday.streams.board_items import BoardItems
+
+ITEMS = [
+    {"id": str(i), "name": f"Item {i} é", "updated_at": "2024-01-01T00:00:00Z",
+     "group": {"id": "topics"}, "column_values": [{"id": "numbers", "number": 1.5, "value": None}]}
+    for i in range(1, 4)
+]
+
+
+def board_page(items, cursor):
+    return {"data": {"boards": [{"items_page": {"cursor": cursor, "items": items}}]}}
+
+
+def chunked(document, size=7):
+    body = json.dumps(document).encode()
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+def collect(generator):
+    """Runs a generator to completion, returning its items and return value."""
+    items = []
+    while True:
+        try:
+            items.append(next(generator))
+        except StopIteration as stop:
+            return items, stop.value
+
+
+class MockStreamedResponse:
+    """Minimal stand-in for a ``requests.Response`` opened with stream=True."""
+
+    def __init__(self, status_code=200, json_data=None):
+        self.status_code = status_code
+        self.content = json.dumps(json_data or {}).encode()
+        self.closed = False
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.content), 5):
+            yield self.content[i:i + 5]
+
+    def close(self):
+        self.closed = True
+
+
+class TestIterPageItems(unittest.TestCase):
+
+    def parse(self, document, prefix="data.boards.item.items_page"):
+        return collect(streaming.iter_page_items(chunked(document), prefix))
+
+    @unittest.skipUnless(streaming.is_available(), "ijson is not installed")
+    def test_streamed_matches_decoded(self):
+        """Streamed parsing gives the same items and page fields as decoding the body."""
+        document = board_page(ITEMS, "abc")
+        streamed = self.parse(document)
+        with patch.object(streaming, "ijson", None):
+            decoded = self.parse(document)
+        self.assertEqual(streamed, decoded)
+        self.assertEqual(streamed, (ITEMS, ({"cursor": "abc"}, None)))
+
+    @unittest.skipUnless(streaming.is_available(), "ijson is not installed")
+    def test_items_yielded_before_body_is_read(self):
+        """The first item is available before the rest of the body was downloaded."""
+        chunks = chunked(board_page(ITEMS, None), size=16)
+        consumed = []
+
+        def source():
+            for chunk in chunks:
+                consumed.append(chunk)
+                yield chunk
+
+        items = streaming.iter_page_items(source(), "data.boards.item.items_page")
+        self.assertEqual(next(items), ITEMS[0])
+        self.assertLess(len(consumed), len(chunks))
+
+    def test_pagination_page_and_errors(self):
+        document = {
+            "data": {"next_items_page": {"cursor": None, "items": ITEMS[:1]}},
+            "errors": [{"message": "denied", "path": ["next_items_page", "items", 0, "owner"]}],
+        }
+        items, (page, errors) = self.parse(document, "data.next_items_page")
+        self.assertEqual(items, ITEMS[:1])
+        self.assertEqual(page, {"cursor": None})
+        self.assertEqual(errors, document["errors"])
+
+    def test_missing_page(self):
+        items, (page, errors) = self.parse({"data": None, "errors": [{"message": "boom"}]})
+        self.assertEqual((items, page), ([], {}))
+        self.assertEqual(errors, [{"message": "boom"}])
+
+
+class TestStreamRequest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Client({"api_token": "dummy_token"})
+
+    def stream(self, responses, allow_partial=False):
+        with patch("requests.Session.request", side_effect=responses) as mock_request, \
+                patch("time.sleep", return_value=None):
+            result = collect(self.client.stream_request(
+                "POST", "/dummy", body="{}", page_prefix="data.boards.item.items_page",
+                allow_partial=allow_partial))
+        self.assertTrue(all(call.kwargs["stream"] for call in mock_request.call_args_list))
+        return result, mock_request
+
+    def test_items_and_cursor(self):
+        response = MockStreamedResponse(200, board_page(ITEMS, "next"))
+        (items, (page, errors)), _ = self.stream([response])
+        self.assertEqual(items, ITEMS)
+        self.assertEqual(page["cursor"], "next")
+        self.assertIsNone(errors)
+        self.assertTrue(response.closed)
+
+    def test_rate_limit_before_items_is_retried(self):
+        limited = {"errors": [{"message": "budget", "extensions": {"code": "ComplexityException", "retry_in_seconds": 1}}]}
+        (items, _), mock_request = self.stream(
+            [MockStreamedResponse(200, limited), MockStreamedResponse(200, board_page(ITEMS, None))])
+        self.assertEqual(items, ITEMS)
+        self.assertEqual(mock_request.call_count, 2)
+
+    def test_http_errors_are_retried(self):
+        (items, _), mock_request = self.stream(
+            [MockStreamedResponse(500, {}), MockStreamedResponse(200, board_page(ITEMS, None))])
+        self.assertEqual(items, ITEMS)
+        self.assertEqual(mock_request.call_count, 2)
+
+    def test_partial_errors(self):
+        document = board_page(ITEMS, None)
+        document["errors"] = [{"message": "denied", "extensions": {"code": "UserUnauthorizedException"}}]
+        (items, (_, errors)), _ = self.stream([MockStreamedResponse(200, document)], allow_partial=True)
+        self.assertEqual(items, ITEMS)
+        self.assertEqual(errors, document["errors"])
+
+    def test_cursor_expired_raises(self):
+        expired = {"errors": [{"message": "expired", "extensions": {"code": "CursorException"}}]}
+        with self.assertRaises(MondayCursorExpiredError):
+            self.stream([MockStreamedResponse(200, expired)])
+
+    def test_rate_limit_after_items_raises(self):
+        """Items already yielded cannot be taken back, so the error is raised."""
+        document = board_page(ITEMS, None)
+        document["errors"] = [{"message": "budget", "extensions": {"code": "ComplexityException"}}]
+        with self.assertRaises(MondayRateLimitError):
+            self.stream([MockStreamedResponse(200, document)])
+
+
+class TestBoardItemsStreamed(unittest.TestCase):
+
+    def test_get_records_follows_cursor(self):
+        client = MagicMock()
+        client.config = {"stream_responses": True}
+        pages = [(ITEMS[:2], "cursor-1"), (ITEMS[2:], None)]
+        prefixes = []
+
+        def stream_request(*args, page_prefix=None, **kwargs):
+            prefixes.append(page_prefix)
+            items, cursor = pages.pop(0)
+            yield from items
+            return {"cursor": cursor}, None
+
+        client.stream_request.side_effect = stream_request
+        stream = BoardItems(client=client)
+        stream.url_endpoint = "https://api.monday.com/v2"
+        stream.update_data_payload(parent_obj={"id": "42"})
+
+        self.assertEqual(list(stream.get_records({"id": "42"})), ITEMS)
+        self.assertEqual(prefixes, ["data.boards.item.items_page", "data.next_items_page"])
+        self.assertIn('cursor: "cursor-1"', stream.data_payload["query"])
+        client.make_request.assert_not_called()
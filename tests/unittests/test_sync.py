@@ -17,6 +17,9 @@ stale-``currently_syncing`` clearing were added:
    name, every root stream that precedes it in the queue is skipped; the
    named stream, plus any subsequent streams, are then synced normally; and
    the ``currently_syncing`` entry is absent from the state when the run ends.
+
+The ``SyncPlan`` resolving the streams to sync and their children is tested
+directly as well.
 """
 
 import sys
@@ -24,6 +27,7 @@ import unittest
 from unittest.mock import MagicMock, patch
 
 import singer
+from tap_monday.plan import SyncPlan
 from tap_monday.sync import sync, update_currently_syncing
 
 # tap_monday/__init__.py does `from tap_monday.sync import sync`, which shadows
@@ -384,5 +388,39 @@ class TestResumeBehaviour(unittest.TestCase):
         self.assertEqual(self.synced, ["stream_three"])
 
 
+
+# ---------------------------------------------------------------------------
+# 4. Sync plan
+# ---------------------------------------------------------------------------
+
+class TestSyncPlan(unittest.TestCase):
+    """The plan resolves the streams to sync and their children once."""
+
+    def setUp(self):
+        self.fake_streams = _build_fake_streams(
+            ("root_b", "", ["child_of_b", "other_child"]),
+            ("child_of_b", "root_b", ["grandchild"]),
+            ("other_child", "root_b"),
+            ("grandchild", "child_of_b"),
+            synced_list=[],
+        )
+
+    def test_topology(self):
+        plan = SyncPlan(_make_catalog(["grandchild"]), {}, self.fake_streams)
+        self.assertEqual(plan.streams_to_sync, ["grandchild", "child_of_b", "root_b"])
+        self.assertEqual(plan.root_streams, ["root_b"])
+        self.assertEqual(plan.children, {"grandchild": [], "child_of_b": ["grandchild"], "root_b": ["child_of_b"]})
+
+    def test_build_only_children_to_sync(self):
+        catalog = _make_catalog(["grandchild"])
+        pipeline = MagicMock()
+        stream = SyncPlan(catalog, {}, self.fake_streams).build("root_b", _make_client(), pipeline)
+        self.assertEqual([child.tap_stream_id for child in stream.child_to_sync], ["child_of_b"])
+        grandchildren = stream.child_to_sync[0].child_to_sync
+        self.assertEqual([child.tap_stream_id for child in grandchildren], ["grandchild"])
+        self.assertIs(grandchildren[0].pipeline, pipeline)
+        self.assertEqual(catalog.get_stream.call_count, 3)
+
+
 if __name__ == "__main__":
     unittest.main()
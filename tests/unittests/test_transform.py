@@ -0,0 +1,216 @@
+"""Conformance tests for tap_monday.transform.CompiledTransformer.
+
+Records are generated from the schema of every stream, with valid values,
+values needing coercion and values that do not match the schema, and the
+compiled transformer must behave exactly like ``singer.Transformer``: same
+output (compared as serialized JSON), same error, same bookkeeping of
+removed and filtered fields and the same in-place filtering of the input.
+"""
+
+import copy
+import json
+import random
+import unittest
+
+from parameterized import parameterized
+from singer import metadata
+from singer.transform import (
+    NO_INTEGER_DATETIME_PARSING,
+    UNIX_MILLISECONDS_INTEGER_DATETIME_PARSING,
+    SchemaMismatch,
+    Transformer,
+)
+
+from tap_monday.schema import get_schemas
+from tap_monday.transform import CompiledTransformer, format_utc_datetime
+
+SCHEMAS, FIELD_METADATA = get_schemas()
+
+SAMPLE_VALUES = {
+    "date-time": [
+        "2024-01-31T12:00:00Z", "2024-01-31T12:00:00.5Z", "2024-01-31T12:00:00.123456Z",
+        "2024-01-31 12:00:00", "2024-01-31T12:00:00+00:00", "2024-01-31T12:00:00-00:00",
+        "2024-01-31T14:30:00+02:30", "2024-01-31", "1706702400000", 1706702400000, 1706702400000.5,
+        "", None,
+    ],
+    "string": ["text", "2024-01-31", 5, 1.5, True, "", None, {"nested": 1}, [1]],
+    "integer": [1, "1,000", 1.9, "7", True, "", None],
+    "number": [1, 2.5, "1,000.5", "3", "", None],
+    "boolean": [True, False, "false", "False", "true", 0, 1, "", None],
+}
+
+INVALID_VALUES = {
+    "date-time": ["not a date", "2024-02-30T00:00:00Z", {"a": 1}],
+    "integer": ["1.5", "abc", [1]],
+    "number": ["abc", {"a": 1}],
+    "object": ["text", 5, [1]],
+    "array": ["text", {"a": 1}],
+}
+
+
+def value_type(schema):
+    types = schema.get("type", [])
+    types = [typ for typ in (types if isinstance(types, list) else [types]) if typ != "null"]
+    typ = types[0] if types else None
+    if typ == "string" and schema.get("format") == "date-time":
+        return "date-time"
+    return typ
+
+
+def generate(schema, rng, invalid_rate=0.0):
+    """Generates a value for *schema*, sometimes null, coerced or invalid."""
+    typ = value_type(schema)
+    if invalid_rate and typ in INVALID_VALUES and rng.random() < invalid_rate:
+        return rng.choice(INVALID_VALUES[typ])
+    if typ == "object":
+        if rng.random() < 0.05:
+            return None
+        record = {key: generate(sub_schema, rng, invalid_rate)
+                  for key, sub_schema in schema.get("properties", {}).items() if rng.random() < 0.9}
+        if rng.random() < 0.2:
+            record["field_not_in_schema"] = "x"
+        return record
+    if typ == "array":
+        if rng.random() < 0.05:
+            return None
+        return [generate(schema.get("items", {}), rng, invalid_rate) for _ in range(rng.randint(0, 3))]
+    if typ in SAMPLE_VALUES:
+        return rng.choice(SAMPLE_VALUES[typ])
+    return rng.choice(["text", 1, None])
+
+
+def deselect_fields(mdata, schema, rng):
+    """Deselects random top-level and nested fields (automatic ones stay)."""
+    mdata = copy.deepcopy(mdata)
+
+    def walk(properties, breadcrumb):
+        for key, sub_schema in properties.items():
+            field = breadcrumb + ("properties", key)
+            if rng.random() < 0.25:
+                metadata.write(mdata, field, "selected", False)
+            if rng.random() < 0.05:
+                metadata.write(mdata, field, "inclusion", "unsupported")
+            if "properties" in sub_schema:
+                walk(sub_schema["properties"], field)
+            elif "properties" in sub_schema.get("items", {}):
+                walk(sub_schema["items"]["properties"], field + ("items",))
+
+    walk(schema.get("properties", {}), ())
+    return mdata
+
+
+class TestCompiledTransformerConformance(unittest.TestCase):
+
+    def assert_conforms(self, record, schema, mdata, integer_datetime_fmt):
+        expected_transformer = Transformer(integer_datetime_fmt=integer_datetime_fmt)
+        compiled_transformer = CompiledTransformer(integer_datetime_fmt=integer_datetime_fmt)
+        expected_input, compiled_input = copy.deepcopy(record), copy.deepcopy(record)
+
+        expected = compiled = None
+        try:
+            expected = expected_transformer.transform(expected_input, copy.deepcopy(schema), mdata)
+        except SchemaMismatch as err:
+            expected = ("SchemaMismatch", str(err))
+        try:
+            compiled = compiled_transformer.transform(compiled_input, schema, mdata)
+        except SchemaMismatch as err:
+            compiled = ("SchemaMismatch", str(err))
+
+        self.assertEqual(json.dumps(compiled, sort_keys=True), json.dumps(expected, sort_keys=True))
+        self.assertEqual(compiled_input, expected_input)
+        self.assertEqual(compiled_transformer.removed, expected_transformer.removed)
+        self.assertEqual(compiled_transformer.filtered, expected_transformer.filtered)
+
+    @parameterized.expand(sorted(SCHEMAS))
+    def test_stream_records(self, stream_name):
+        """Random records of the stream transform exactly like singer.Transformer."""
+        rng = random.Random(stream_name)
+        schema = SCHEMAS[stream_name]
+        base_mdata = metadata.to_map(FIELD_METADATA[stream_name])
+        for i in range(150):
+            mdata = deselect_fields(base_mdata, schema, rng) if i % 3 else base_mdata
+            record = generate(schema, rng, invalid_rate=0.02 if i % 5 == 0 else 0.0) or {}
+            for fmt in (NO_INTEGER_DATETIME_PARSING, UNIX_MILLISECONDS_INTEGER_DATETIME_PARSING):
+                with self.subTest(record=i, integer_datetime_fmt=fmt):
+                    self.assert_conforms(record, schema, mdata, fmt)
+
+    def test_schema_constructs(self):
+        """anyOf, patternProperties, untyped and empty object schemas."""
+        schema = {"type": "object", "properties": {
+            "any": {"anyOf": [{"type": "integer"}, {"type": "string", "format": "date-time"}]},
+            "pattern": {"type": "object", "patternProperties": {"^n_": {"type": "integer"}}},
+            "untyped": {},
+            "free": {"type": ["null", "object"]},
+            "decimal": {"type": ["null", "string"], "format": "singer.decimal"},
+        }}
+        records = [
+            {"any": "5", "pattern": {"n_a": "1,000", "other": 1}, "untyped": [1], "free": {"a": 1}, "decimal": 1.10},
+            {"any": "2024-01-31T12:00:00Z", "pattern": {}, "free": None, "decimal": None},
+            {"any": "not a date", "pattern": {"n_a": "x"}},
+        ]
+        for record in records:
+            with self.subTest(record=record):
+                self.assert_conforms(record, schema, {}, NO_INTEGER_DATETIME_PARSING)
+
+    @parameterized.expand(sorted(SCHEMAS))
+    def test_conformant_records_pass_through(self, stream_name):
+        """Records already in transformed form are returned without a copy."""
+        rng = random.Random(stream_name)
+        schema = SCHEMAS[stream_name]
+        fmt = UNIX_MILLISECONDS_INTEGER_DATETIME_PARSING
+        transformer = CompiledTransformer(integer_datetime_fmt=fmt)
+        passed_through = 0
+        for i in range(50):
+            record = Transformer(integer_datetime_fmt=fmt).transform(generate(schema, rng) or {}, schema)
+            result = transformer.transform(record, schema)
+            with self.subTest(record=i):
+                self.assertEqual(result, Transformer(integer_datetime_fmt=fmt).transform(copy.deepcopy(record), schema))
+            passed_through += result is record
+        self.assertGreater(passed_through, 0)
+
+    @parameterized.expand([
+        ("integer_in_number", {"type": ["null", "number"]}, 1),
+        ("bool_in_integer", {"type": ["null", "integer"]}, True),
+        ("empty_string_in_integer", {"type": ["null", "integer"]}, ""),
+        ("null_boolean", {"type": ["null", "boolean"]}, None),
+        ("non_canonical_datetime", {"type": ["null", "string"], "format": "date-time"}, "2024-01-31T12:00:00Z"),
+        ("number_in_string", {"type": ["null", "string"]}, 5),
+        ("multiple_types", {"type": ["null", "integer", "string"]}, "5"),
+    ])
+    def test_values_needing_coercion_are_converted(self, _, field_schema, value):
+        schema = {"type": "object", "properties": {"field": field_schema}}
+        record = {"field": value}
+        result = CompiledTransformer().transform(record, schema)
+        self.assertIsNot(result, record)
+        self.assertEqual(result, Transformer().transform({"field": value}, schema))
+
+    def test_unknown_fields_are_removed(self):
+        schema = {"type": "object", "properties": {"id": {"type": "string"}}}
+        transformer = CompiledTransformer()
+        self.assertEqual(transformer.transform({"id": "1", "extra": 2}, schema), {"id": "1"})
+        self.assertEqual(transformer.removed, {"extra"})
+
+    def test_compiled_once_per_schema(self):
+        schema = SCHEMAS["board_items"]
+        mdata = metadata.to_map(FIELD_METADATA["board_items"])
+        transformer = CompiledTransformer()
+        for _ in range(3):
+            transformer.transform({"id": 1}, schema, mdata)
+        transformer.transform({"id": 1}, SCHEMAS["boards"], mdata)
+        self.assertEqual(len(transformer._converters), 2)
+        self.assertEqual(len(transformer._filters), 1)
+
+
+class TestFormatUtcDatetime(unittest.TestCase):
+
+    @parameterized.expand([
+        ("2024-01-31T12:00:00Z", "2024-01-31T12:00:00.000000Z"),
+        ("2024-01-31T12:00:00.12Z", "2024-01-31T12:00:00.120000Z"),
+        ("2024-01-31 12:00:00", "2024-01-31T12:00:00.000000Z"),
+        ("2024-01-31T12:00:00+0000", "2024-01-31T12:00:00.000000Z"),
+        ("2024-01-31T12:00:00+02:00", None),
+        ("2024-02-30T12:00:00Z", None),
+        ("0999-01-01T00:00:00Z", None),
+    ])
+    def test_format(self, value, expected):
+        self.assertEqual(format_utc_datetime(value), expected)